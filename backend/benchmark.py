@@ -0,0 +1,233 @@
+import argparse
+import gc
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Any
+
+from backend.enhanced_tracker import AppSession, EnhancedDataManager, EnhancedUsageAnalyzer
+
+# Realistic app names per category, matching AppSession._categorize_app
+CATEGORY_APPS = {
+    'development': ['code.exe', 'devenv.exe', 'sublime_text.exe', 'pycharm64.exe', 'notepad++.exe'],
+    'browser': ['chrome.exe', 'firefox.exe', 'msedge.exe', 'brave.exe'],
+    'communication': ['teams.exe', 'slack.exe', 'discord.exe', 'zoom.exe'],
+    'media': ['vlc.exe', 'spotify.exe', 'photoshop.exe', 'gimp.exe'],
+    'office': ['winword.exe', 'excel.exe', 'powerpoint.exe', 'outlook.exe'],
+    'gaming': ['steam.exe', 'epicgameslauncher.exe', 'roblox.exe'],
+    'system': ['explorer.exe', 'taskmgr.exe', 'cmd.exe', 'powershell.exe'],
+    'utilities': ['calculator.exe', 'notepad.exe', 'mspaint.exe']
+}
+
+PRESETS = {
+    "day": {"days": 1},
+    "week": {"days": 7},
+    "month": {"days": 30},
+    "year": {"days": 365},
+    "5years": {"days": 5 * 365}
+}
+
+
+class SyntheticWorkload:
+    """Seeded generator of realistic session histories."""
+
+    def __init__(self, seed: int = 42, days: int = 7, apps: int = 20, categories: Optional[List[str]] = None,
+                 switches_per_hour: float = 30, active_hours: float = 8, title_cardinality: int = 50,
+                 idle_ratio: float = 0.05, end_date: Optional[datetime] = None):
+        self.seed = seed
+        self.days = days
+        self.apps = apps
+        self.categories = categories or list(CATEGORY_APPS.keys())
+        self.switches_per_hour = switches_per_hour
+        self.active_hours = active_hours
+        self.title_cardinality = title_cardinality
+        self.idle_ratio = idle_ratio
+        self.end_date = (end_date or datetime(2024, 1, 1)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "seed": self.seed,
+            "days": self.days,
+            "apps": self.apps,
+            "categories": self.categories,
+            "switches_per_hour": self.switches_per_hour,
+            "active_hours": self.active_hours,
+            "title_cardinality": self.title_cardinality,
+            "idle_ratio": self.idle_ratio
+        }
+
+    def _app_names(self, rng: random.Random) -> List[str]:
+        names = []
+        pool = [app for category in self.categories for app in CATEGORY_APPS.get(category, [])]
+        rng.shuffle(pool)
+        names.extend(pool[:self.apps])
+        # Pad with uncategorised apps when more are requested than we know about
+        for i in range(len(names), self.apps):
+            names.append(f"app{i:04d}.exe")
+        return names
+
+    def generate(self) -> Dict[str, List[AppSession]]:
+        """Build the session history, identical for identical parameters."""
+        rng = random.Random(self.seed)
+        app_names = self._app_names(rng)
+        # Zipf-like popularity so a few apps dominate, as in real usage
+        weights = [1.0 / (rank + 1) for rank in range(len(app_names))]
+        titles = [f"Document {i} - Window" for i in range(max(self.title_cardinality, 1))]
+        mean_session = 3600.0 / max(self.switches_per_hour, 0.01)
+
+        data: Dict[str, List[AppSession]] = {}
+        start_day = self.end_date - timedelta(days=self.days)
+
+        for day in range(self.days):
+            day_start = start_day + timedelta(days=day, hours=rng.uniform(7, 10))
+            day_end = day_start + timedelta(hours=self.active_hours * rng.uniform(0.6, 1.2))
+            current = day_start
+
+            while current < day_end:
+                app_name = rng.choices(app_names, weights)[0]
+                duration = max(int(rng.expovariate(1.0 / mean_session)), 3)
+                end_time = current + timedelta(seconds=duration)
+                idle = int(duration * self.idle_ratio * rng.random() * 2) if rng.random() < 0.3 else 0
+
+                session = AppSession(
+                    app_name=app_name,
+                    start_time=current,
+                    end_time=end_time,
+                    duration_seconds=duration,
+                    window_title=rng.choice(titles),
+                    pid=rng.randint(1000, 65000),
+                    session_id=f"{app_name}_{int(current.timestamp())}_{rng.getrandbits(24):06x}",
+                    idle_time=min(idle, duration),
+                    switch_count=rng.randint(0, 5)
+                )
+                data.setdefault(app_name, []).append(session)
+                current = end_time + timedelta(seconds=rng.randint(0, 5))
+
+        return data
+
+
+def _measure(func: Callable[[], Any], repeat: int, track_memory: bool) -> Dict[str, Any]:
+    """Time func over several runs and optionally record its peak allocation."""
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    result = {
+        "runs": repeat,
+        "mean_s": round(statistics.mean(timings), 6),
+        "min_s": round(min(timings), 6),
+        "max_s": round(max(timings), 6),
+        "stdev_s": round(statistics.stdev(timings), 6) if len(timings) > 1 else 0.0
+    }
+
+    if track_memory:
+        # Separate run so tracemalloc overhead does not skew the timings
+        gc.collect()
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["peak_bytes"] = peak
+
+    return result
+
+
+def run_benchmarks(workload: SyntheticWorkload, repeat: int = 3, track_memory: bool = True,
+                   work_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Benchmark persistence, analyzer queries and report generation on a workload."""
+    data = workload.generate()
+    total_sessions = sum(len(sessions) for sessions in data.values())
+
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp:
+        manager = EnhancedDataManager(str(Path(tmp) / "bench_log.json"))
+        analyzer = EnhancedUsageAnalyzer(data)
+        query_date = workload.end_date - timedelta(days=1)
+
+        results = {"save_data": _measure(lambda: manager.save_data(data), repeat, track_memory)}
+        log_size = manager.log_file.stat().st_size
+        results["load_data"] = _measure(manager.load_data, repeat, track_memory)
+        results["get_daily_usage"] = _measure(lambda: analyzer.get_daily_usage(query_date), repeat, track_memory)
+        results["get_top_apps"] = _measure(lambda: analyzer.get_top_apps(10), repeat, track_memory)
+        results["get_category_analysis"] = _measure(analyzer.get_category_analysis, repeat, track_memory)
+        results["generate_enhanced_report"] = _measure(analyzer.generate_enhanced_report, repeat, track_memory)
+
+    return {
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "workload": workload.describe(),
+        "total_sessions": total_sessions,
+        "log_size_bytes": log_size,
+        "results": results
+    }
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Per-benchmark ratio of current to baseline mean time (>1 is slower)."""
+    rows = []
+    for name, result in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base or not base["mean_s"]:
+            continue
+        rows.append({
+            "benchmark": name,
+            "baseline_s": base["mean_s"],
+            "current_s": result["mean_s"],
+            "ratio": round(result["mean_s"] / base["mean_s"], 3)
+        })
+    return rows
+
+
+def main():
+    """Run the benchmark suite from the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark the tracker data layer on synthetic history.")
+    parser.add_argument("--preset", choices=sorted(PRESETS), help="history length preset")
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--apps", type=int, default=20)
+    parser.add_argument("--categories", nargs="*", help="restrict apps to these categories")
+    parser.add_argument("--switches-per-hour", type=float, default=30)
+    parser.add_argument("--active-hours", type=float, default=8)
+    parser.add_argument("--title-cardinality", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="skip peak memory measurement")
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--compare", help="baseline JSON results to compare against")
+    args = parser.parse_args()
+
+    days = PRESETS[args.preset]["days"] if args.preset else args.days
+    workload = SyntheticWorkload(
+        seed=args.seed,
+        days=days,
+        apps=args.apps,
+        categories=args.categories,
+        switches_per_hour=args.switches_per_hour,
+        active_hours=args.active_hours,
+        title_cardinality=args.title_cardinality
+    )
+
+    results = run_benchmarks(workload, repeat=args.repeat, track_memory=not args.no_memory)
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            results["comparison"] = compare_results(json.load(f), results)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+import math
+import tkinter as tk
+from typing import List, Optional, Sequence, Tuple
+
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+
+class ChartPanel:
+    """A matplotlib figure and Tk canvas created once and updated in place.
+
+    Figures are built with matplotlib.figure.Figure rather than pyplot, so
+    nothing is registered globally and memory stays flat however long the
+    GUI runs. Redraws update existing artists when the chart's structure
+    is unchanged; bar heights and line data are blitted over a cached
+    background when the axes limits stay the same, and everything else
+    goes through draw_idle().
+    """
+
+    def __init__(self, parent, figsize: Tuple[float, float] = (6, 4)):
+        self.figure = Figure(figsize=figsize)
+        self.ax = self.figure.add_subplot(111)
+        self.canvas = FigureCanvasTkAgg(self.figure, parent)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+        self._kind = None
+        self._key = None
+        self._data = None
+        self._artists = []
+        self._texts = []
+        self._background = None
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def _on_draw(self, event):
+        """Cache the static background after every full draw."""
+        if self.canvas.supports_blit:
+            self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        for artist in self._artists:
+            if artist.get_animated():
+                self.ax.draw_artist(artist)
+
+    def _reset(self, kind: str, key):
+        """Start a new chart structure on the reused axes."""
+        self.ax.cla()
+        self._kind = kind
+        self._key = key
+        self._data = None
+        self._artists = []
+        self._texts = []
+        self._background = None
+
+    def _blit(self) -> bool:
+        """Redraw animated artists over the cached background."""
+        if self._background is None:
+            return False
+        self.canvas.restore_region(self._background)
+        for artist in self._artists:
+            self.ax.draw_artist(artist)
+        self.canvas.blit(self.figure.bbox)
+        return True
+
+    def show_message(self, text: str, title: str):
+        """Show a centred message instead of a chart."""
+        if self._kind == "message" and self._key == (text, title):
+            return
+        self._reset("message", (text, title))
+        self.ax.text(0.5, 0.5, text, ha='center', va='center')
+        self.ax.set_title(title)
+        self.canvas.draw_idle()
+
+    def pie(self, labels: Sequence[str], values: Sequence[float], title: str):
+        """Show a pie chart, moving existing wedges when the labels are unchanged."""
+        labels, values = list(labels), list(values)
+        if self._kind == "pie" and self._key == (tuple(labels), title):
+            if values == self._data:
+                return
+            self._move_wedges(values)
+        else:
+            self._reset("pie", (tuple(labels), title))
+            wedges, texts, autotexts = self.ax.pie(values, labels=labels, autopct='%1.1f%%', startangle=90)
+            self._artists = list(wedges)
+            self._texts = list(zip(texts, autotexts))
+            self.ax.set_title(title)
+        self._data = values
+        self.canvas.draw_idle()
+
+    def _move_wedges(self, values: List[float]):
+        total = float(sum(values)) or 1.0
+        theta = 90.0
+        for wedge, (label, pct), value in zip(self._artists, self._texts, values):
+            fraction = value / total
+            theta2 = theta + 360.0 * fraction
+            wedge.set_theta1(theta)
+            wedge.set_theta2(theta2)
+
+            # Same placement rules as Axes.pie (labeldistance 1.1, pctdistance 0.6)
+            middle = math.radians((theta + theta2) / 2)
+            x, y = math.cos(middle), math.sin(middle)
+            label.set_position((1.1 * x, 1.1 * y))
+            label.set_horizontalalignment('left' if x > 0 else 'right')
+            pct.set_position((0.6 * x, 0.6 * y))
+            pct.set_text(f"{fraction * 100:.1f}%")
+            theta = theta2
+
+    def bar(self, labels: Sequence, values: Sequence[float], title: str, ylabel: str, color: str,
+            xlabel: Optional[str] = None, rotation: int = 0, xticks: Optional[Sequence] = None):
+        """Show a bar chart, updating bar heights in place when the labels are unchanged."""
+        labels, values = list(labels), list(values)
+        key = (tuple(labels), title)
+
+        if self._kind == "bar" and self._key == key:
+            if values == self._data:
+                return
+            for rect, value in zip(self._artists, values):
+                rect.set_height(value)
+            self._data = values
+            if self._fits_ylim(values):
+                if not self._blit():
+                    self.canvas.draw_idle()
+                return
+            self.ax.set_ylim(0, self._ylim_for(values))
+            self.canvas.draw_idle()
+            return
+
+        self._reset("bar", key)
+        bars = self.ax.bar(labels, values, color=color, animated=True)
+        self._artists = list(bars)
+        self.ax.set_ylim(0, self._ylim_for(values))
+        self.ax.set_title(title)
+        self.ax.set_ylabel(ylabel)
+        if xlabel:
+            self.ax.set_xlabel(xlabel)
+        if xticks is not None:
+            self.ax.set_xticks(xticks)
+        if rotation:
+            self.ax.tick_params(axis='x', rotation=rotation)
+        self.figure.tight_layout()
+        self._data = values
+        self.canvas.draw_idle()
+
+    def line(self, labels: Sequence, values: Sequence[float], title: str, ylabel: str, color: str,
+             ylim: Tuple[float, float], rotation: int = 0):
+        """Show a line chart with fixed y limits, blitting data-only updates."""
+        labels, values = list(labels), list(values)
+        key = (tuple(labels), title)
+
+        if self._kind == "line" and self._key == key:
+            if values == self._data:
+                return
+            self._artists[0].set_ydata(values)
+            self._data = values
+            if not self._blit():
+                self.canvas.draw_idle()
+            return
+
+        self._reset("line", key)
+        line, = self.ax.plot(labels, values, marker='o', color=color, linewidth=2, animated=True)
+        self._artists = [line]
+        self.ax.set_title(title)
+        self.ax.set_ylabel(ylabel)
+        self.ax.set_ylim(*ylim)
+        if rotation:
+            self.ax.tick_params(axis='x', rotation=rotation)
+        self.figure.tight_layout()
+        self._data = values
+        self.canvas.draw_idle()
+
+    def _fits_ylim(self, values: List[float]) -> bool:
+        """True if the current y range still suits the data (no rescale needed)."""
+        top = self.ax.get_ylim()[1]
+        peak = max(values) if values else 0
+        return peak <= top and peak >= top * 0.5
+
+    @staticmethod
+    def _ylim_for(values: List[float]) -> float:
+        peak = max(values) if values else 0
+        return peak * 1.1 if peak > 0 else 1
@@ -0,0 +1,265 @@
+import importlib.util
+import json
+import struct
+import zlib
+from array import array
+from datetime import datetime
+from itertools import groupby
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from backend.export import iter_sessions
+
+COLUMNAR_FORMATS = ("auto", "parquet", "arrow", "tcol")
+
+SESSION_SCHEMA = [
+    ("month", "string"), ("session_id", "string"), ("app_name", "string"), ("category", "string"),
+    ("start", "timestamp"), ("end", "timestamp"), ("duration_seconds", "int64"), ("active_seconds", "int64"),
+    ("idle_time", "int64"), ("window_title", "string"), ("pid", "int64"), ("productivity_score", "float64"),
+    ("switch_count", "int64"), ("hour", "int64"), ("day_of_week", "string"), ("is_weekend", "bool")
+]
+DAILY_SCHEMA = [
+    ("month", "string"), ("date", "string"), ("app_name", "string"), ("category", "string"),
+    ("sessions", "int64"), ("duration_seconds", "int64"), ("active_seconds", "int64"), ("idle_time", "int64")
+]
+HOURLY_SCHEMA = [
+    ("month", "string"), ("date", "string"), ("hour", "int64"), ("app_name", "string"), ("category", "string"),
+    ("sessions", "int64"), ("active_seconds", "int64")
+]
+
+_TCOL_MAGIC = b"TCOL1"
+
+
+def _session_rows(sessions: Iterable) -> Iterator[Dict[str, Any]]:
+    for session in sessions:
+        yield {
+            "month": session.start_time.strftime("%Y-%m"),
+            "session_id": session.session_id,
+            "app_name": session.app_name,
+            "category": session.category,
+            "start": session.start_time,
+            "end": session.end_time,
+            "duration_seconds": session.duration_seconds,
+            "active_seconds": session.active_seconds,
+            "idle_time": session.idle_time,
+            "window_title": session.window_title,
+            "pid": session.pid,
+            "productivity_score": session.productivity_score,
+            "switch_count": session.switch_count,
+            "hour": session.start_time.hour,
+            "day_of_week": session.start_time.strftime("%A"),
+            "is_weekend": session.start_time.weekday() >= 5
+        }
+
+
+def _rollup_rows(sessions: Iterable, hourly: bool) -> Iterator[Dict[str, Any]]:
+    """Daily or hourly per-app totals, flushed as each day ends."""
+    for day, day_sessions in groupby(sessions, key=lambda s: s.start_time.date()):
+        totals: Dict[Tuple, Dict[str, Any]] = {}
+        for session in day_sessions:
+            key = (session.start_time.hour, session.app_name) if hourly else (0, session.app_name)
+            row = totals.get(key)
+            if row is None:
+                row = totals[key] = {
+                    "month": day.strftime("%Y-%m"), "date": day.strftime("%Y-%m-%d"),
+                    "app_name": session.app_name, "category": session.category,
+                    "sessions": 0, "active_seconds": 0
+                }
+                if hourly:
+                    row["hour"] = key[0]
+                else:
+                    row["duration_seconds"] = row["idle_time"] = 0
+            row["sessions"] += 1
+            row["active_seconds"] += session.active_seconds
+            if not hourly:
+                row["duration_seconds"] += session.duration_seconds
+                row["idle_time"] += session.idle_time
+        for key in sorted(totals):
+            yield totals[key]
+
+
+def _month_columns(rows: Iterable[Dict[str, Any]], schema: List[Tuple[str, str]]) -> Iterator[Tuple[str, Dict[str, list]]]:
+    """Group time-ordered rows by month into column lists."""
+    for month, month_rows in groupby(rows, key=lambda row: row["month"]):
+        columns: Dict[str, list] = {name: [] for name, _ in schema}
+        for row in month_rows:
+            for name, _ in schema:
+                columns[name].append(row[name])
+        yield month, columns
+
+
+def _encode_column(values: list, kind: str) -> bytes:
+    if kind == "string":
+        encoded = [("" if value is None else str(value)).encode("utf-8") for value in values]
+        offsets = array('q', [0])
+        for item in encoded:
+            offsets.append(offsets[-1] + len(item))
+        raw = offsets.tobytes() + b"".join(encoded)
+    elif kind == "timestamp":
+        raw = array('d', [value.timestamp() if value else float("nan") for value in values]).tobytes()
+    elif kind == "float64":
+        raw = array('d', [float("nan") if value is None else float(value) for value in values]).tobytes()
+    elif kind == "bool":
+        raw = array('b', [1 if value else 0 for value in values]).tobytes()
+    else:
+        raw = array('q', [int(value or 0) for value in values]).tobytes()
+    return zlib.compress(raw, 6)
+
+
+def _decode_column(data: bytes, kind: str, rows: int) -> list:
+    raw = zlib.decompress(data)
+    if kind == "string":
+        offsets = array('q')
+        offsets.frombytes(raw[:8 * (rows + 1)])
+        body = raw[8 * (rows + 1):]
+        return [body[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(rows)]
+    if kind == "bool":
+        values = array('b')
+        values.frombytes(raw)
+        return [bool(value) for value in values]
+    values = array('q' if kind == "int64" else 'd')
+    values.frombytes(raw)
+    if kind == "timestamp":
+        return [None if value != value else datetime.fromtimestamp(value) for value in values]
+    if kind == "float64":
+        return [None if value != value else value for value in values]
+    return list(values)
+
+
+class _TcolWriter:
+    """Built-in columnar file: zlib-compressed column chunks per monthly row group.
+
+    Layout: magic, column chunks, JSON footer (schema and, per row group,
+    its month, row count and each column's offset and length), footer
+    length (8 bytes), magic. Readers seek straight to the chunks they need.
+    """
+
+    def __init__(self, path: Path, schema: List[Tuple[str, str]]):
+        self.schema = schema
+        self._file = open(path, 'wb')
+        self._file.write(_TCOL_MAGIC)
+        self._row_groups = []
+
+    def write(self, month: str, columns: Dict[str, list]):
+        rows = len(next(iter(columns.values())))
+        chunks = {}
+        for name, kind in self.schema:
+            data = _encode_column(columns[name], kind)
+            chunks[name] = [self._file.tell(), len(data)]
+            self._file.write(data)
+        self._row_groups.append({"month": month, "rows": rows, "columns": chunks})
+
+    def close(self):
+        footer = json.dumps({"schema": self.schema, "row_groups": self._row_groups}).encode("utf-8")
+        self._file.write(footer)
+        self._file.write(struct.pack("<Q", len(footer)))
+        self._file.write(_TCOL_MAGIC)
+        self._file.close()
+
+
+class _ArrowWriter:
+    """Parquet or Arrow IPC file with one row group / record batch per month."""
+
+    TYPES = {"string": "string", "int64": "int64", "float64": "float64", "bool": "bool_"}
+
+    def __init__(self, path: Path, schema: List[Tuple[str, str]], format_type: str):
+        # pyarrow takes seconds to import, so only Parquet and Arrow exports load it
+        import pyarrow as pa
+        import pyarrow.ipc
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        fields = []
+        for name, kind in schema:
+            arrow_type = pa.timestamp("s") if kind == "timestamp" else getattr(pa, self.TYPES[kind])()
+            fields.append(pa.field(name, arrow_type))
+        self.schema = pa.schema(fields)
+        if format_type == "parquet":
+            self._writer = pq.ParquetWriter(str(path), self.schema, compression="zstd")
+        else:
+            self._writer = pa.ipc.new_file(str(path), self.schema)
+        self.format_type = format_type
+
+    def write(self, month: str, columns: Dict[str, list]):
+        table = self._pa.table(columns, schema=self.schema)
+        if self.format_type == "parquet":
+            self._writer.write_table(table, row_group_size=max(table.num_rows, 1))
+        else:
+            self._writer.write_table(table, max_chunksize=max(table.num_rows, 1))
+
+    def close(self):
+        self._writer.close()
+
+
+def _has_pyarrow() -> bool:
+    """Whether pyarrow is installed; finds the package without importing it."""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def resolve_format(format_type: str = "auto") -> str:
+    """Pick the concrete format; parquet and arrow need pyarrow (optional, the .tcol format is built in)."""
+    if format_type not in COLUMNAR_FORMATS:
+        raise ValueError(f"Unsupported columnar format: {format_type}")
+    if format_type == "auto":
+        return "parquet" if _has_pyarrow() else "tcol"
+    if format_type in ("parquet", "arrow") and not _has_pyarrow():
+        raise ImportError("pyarrow is required for Parquet and Arrow IPC export")
+    return format_type
+
+
+def export_columnar(data: Mapping[str, Sequence], output_dir: str, format_type: str = "auto",
+                    **filters) -> Dict[str, Path]:
+    """Write the session table and daily/hourly rollups, one row group per month.
+
+    Filters are those of export.iter_sessions (start, end, apps,
+    categories). Returns the path of each table written.
+    """
+    format_type = resolve_format(format_type)
+    suffix = {"parquet": ".parquet", "arrow": ".arrow", "tcol": ".tcol"}[format_type]
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+
+    tables = {
+        "sessions": (SESSION_SCHEMA, lambda sessions: _session_rows(sessions)),
+        "daily_rollup": (DAILY_SCHEMA, lambda sessions: _rollup_rows(sessions, hourly=False)),
+        "hourly_rollup": (HOURLY_SCHEMA, lambda sessions: _rollup_rows(sessions, hourly=True))
+    }
+
+    paths = {}
+    for name, (schema, build_rows) in tables.items():
+        path = output / f"{name}{suffix}"
+        writer = _TcolWriter(path, schema) if format_type == "tcol" else _ArrowWriter(path, schema, format_type)
+        try:
+            for month, columns in _month_columns(build_rows(iter_sessions(data, **filters)), schema):
+                writer.write(month, columns)
+        finally:
+            writer.close()
+        paths[name] = path
+    return paths
+
+
+def read_tcol(path: str, columns: Optional[List[str]] = None,
+              months: Optional[List[str]] = None) -> Dict[str, list]:
+    """Read selected columns and months of a .tcol file into column lists.
+
+    The result loads directly with pandas.DataFrame(result).
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(_TCOL_MAGIC)) != _TCOL_MAGIC:
+            raise ValueError(f"Not a columnar export: {path}")
+        f.seek(-(8 + len(_TCOL_MAGIC)), 2)
+        footer_length = struct.unpack("<Q", f.read(8))[0]
+        f.seek(-(8 + len(_TCOL_MAGIC) + footer_length), 2)
+        footer = json.loads(f.read(footer_length))
+
+        kinds = dict((name, kind) for name, kind in footer["schema"])
+        wanted = columns or [name for name, _ in footer["schema"]]
+        result: Dict[str, list] = {name: [] for name in wanted}
+        for group in footer["row_groups"]:
+            if months and group["month"] not in months:
+                continue
+            for name in wanted:
+                offset, length = group["columns"][name]
+                f.seek(offset)
+                result[name].extend(_decode_column(f.read(length), kinds[name], group["rows"]))
+        return result
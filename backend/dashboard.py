@@ -0,0 +1,206 @@
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # Optional; gzip siblings are always written
+    brotli = None
+
+PRODUCTIVE_CATEGORIES = ('development', 'office', 'utilities')
+
+# A productive stretch this long counts as a focus session
+FOCUS_SESSION_SECONDS = 25 * 60
+
+
+def _compact(payload: Dict[str, Any]) -> bytes:
+    return json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def atomic_write(path: Path, data: bytes):
+    """Replace a file's contents so readers see either the old or the new bytes."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def productivity_metrics(sessions: List) -> Dict[str, Any]:
+    """Productivity figures for a time-ordered list of sessions.
+
+    A focus session is a run of consecutive productive sessions with at
+    least FOCUS_SESSION_SECONDS of active time; an interruption is a
+    switch from a productive app to any other.
+    """
+    total_time = productive_time = 0
+    focus_sessions = interruptions = 0
+    run = 0
+    previous_productive = False
+
+    for session in sessions:
+        active = session.active_seconds
+        productive = session.category in PRODUCTIVE_CATEGORIES
+        total_time += active
+
+        if productive:
+            productive_time += active
+            run += active
+        else:
+            if previous_productive:
+                interruptions += 1
+            if run >= FOCUS_SESSION_SECONDS:
+                focus_sessions += 1
+            run = 0
+        previous_productive = productive
+
+    if run >= FOCUS_SESSION_SECONDS:
+        focus_sessions += 1
+
+    return {
+        "total_time": total_time,
+        "productive_time": productive_time,
+        "productivity_percentage": round(productive_time / total_time * 100, 2) if total_time > 0 else 0,
+        "distraction_time": total_time - productive_time,
+        "focus_sessions": focus_sessions,
+        "interruptions": interruptions
+    }
+
+
+class DashboardPublisher:
+    """Materializes compact dashboard payloads as static, precompressed files.
+
+    Each payload is written atomically as name.json with a name.json.gz
+    sibling (and name.json.br when brotli is installed), followed by a
+    manifest.json holding the data version and a content hash per file,
+    so a server can hand the files out as-is.
+    """
+
+    PAYLOADS = ("today", "week", "top_apps", "categories", "productivity")
+
+    def __init__(self, output_dir: str, category_score: Optional[Callable[[str], Optional[int]]] = None):
+        self.output_dir = Path(output_dir)
+        self.category_score = category_score or (lambda category: None)
+        self._hashes: Dict[str, str] = {}
+
+    @staticmethod
+    def window(now: datetime) -> Tuple[datetime, datetime]:
+        """[start, end) of the sessions the payloads cover: the seven days up to the end of today."""
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        return today - timedelta(days=6), today + timedelta(days=1)
+
+    def build(self, sessions: List, app_stats: Dict[str, Dict[str, Any]],
+              now: Optional[datetime] = None) -> Dict[str, Dict[str, Any]]:
+        """Compute every payload from the sessions in window(now), oldest first, and per-app totals."""
+        now = now or datetime.now()
+        week_start, week_end = self.window(now)
+        today = week_end - timedelta(days=1)
+        week_sessions = [session for session in sessions if week_start <= session.start_time < week_end]
+        today_sessions = [session for session in week_sessions if session.start_time >= today]
+
+        return {
+            "today": self._day(today, today_sessions),
+            "week": self._week(week_start, week_sessions),
+            "top_apps": self._top_apps(app_stats),
+            "categories": self._categories(app_stats),
+            "productivity": productivity_metrics(today_sessions)
+        }
+
+    def _day(self, day: datetime, sessions: List) -> Dict[str, Any]:
+        apps: Dict[str, Dict[str, Any]] = {}
+        hourly = [0] * 24
+        for session in sessions:
+            entry = apps.setdefault(session.app_name, {"name": session.app_name, "category": session.category,
+                                                       "duration": 0, "sessions": 0})
+            entry["duration"] += session.active_seconds
+            entry["sessions"] += 1
+            hourly[session.start_time.hour] += session.active_seconds
+
+        return {
+            "date": day.strftime("%Y-%m-%d"),
+            "total_time": sum(hourly),
+            "sessions": len(sessions),
+            "apps": sorted(apps.values(), key=lambda entry: entry["duration"], reverse=True),
+            "hourly": hourly
+        }
+
+    def _week(self, week_start: datetime, sessions: List) -> Dict[str, Any]:
+        days = [{"date": (week_start + timedelta(days=i)).strftime("%Y-%m-%d"), "total_time": 0, "productive_time": 0}
+                for i in range(7)]
+        for session in sessions:
+            day = days[(session.start_time - week_start).days]
+            day["total_time"] += session.active_seconds
+            if session.category in PRODUCTIVE_CATEGORIES:
+                day["productive_time"] += session.active_seconds
+
+        return {
+            "days": days,
+            "total_time": sum(day["total_time"] for day in days),
+            "productive_time": sum(day["productive_time"] for day in days)
+        }
+
+    @staticmethod
+    def _top_apps(app_stats: Dict[str, Dict[str, Any]], limit: int = 10) -> Dict[str, Any]:
+        ranked = sorted(app_stats.items(), key=lambda item: item[1]["total_time"], reverse=True)[:limit]
+        return {"apps": [
+            {"name": name, "duration": stats["total_time"], "category": stats["category"],
+             "sessions": stats["session_count"]}
+            for name, stats in ranked
+        ]}
+
+    def _categories(self, app_stats: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        categories: Dict[str, Dict[str, Any]] = {}
+        for stats in app_stats.values():
+            entry = categories.get(stats["category"])
+            if entry is None:
+                entry = categories[stats["category"]] = {
+                    "total_duration": 0,
+                    "total_sessions": 0,
+                    "app_count": 0,
+                    "productivity_score": self.category_score(stats["category"])
+                }
+            entry["total_duration"] += stats["total_time"]
+            entry["total_sessions"] += stats["session_count"]
+            entry["app_count"] += 1
+        return categories
+
+    def publish(self, sessions: List, app_stats: Dict[str, Dict[str, Any]], version: int,
+                now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Write every payload that changed, then the manifest; returns the manifest.
+
+        The inputs must not change while this runs: the caller passes a
+        snapshot taken where sessions are recorded.
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        now = now or datetime.now()
+        files = {}
+
+        for name, payload in self.build(sessions, app_stats, now).items():
+            body = _compact(payload)
+            digest = hashlib.sha1(body).hexdigest()[:16]
+            path = self.output_dir / f"{name}.json"
+
+            # Unchanged payloads keep their files (and mtimes) as they are
+            if self._hashes.get(name) != digest or not path.exists():
+                atomic_write(path.with_name(path.name + ".gz"), gzip.compress(body, compresslevel=9, mtime=0))
+                br_path = path.with_name(path.name + ".br")
+                if brotli is not None:
+                    atomic_write(br_path, brotli.compress(body))
+                elif br_path.exists():
+                    br_path.unlink()  # Left by a run with brotli; it would be served stale
+                atomic_write(path, body)
+                self._hashes[name] = digest
+
+            files[name] = {"etag": digest, "bytes": len(body)}
+
+        manifest = {
+            "version": version,
+            "generated_at": now.strftime("%Y-%m-%d %H:%M:%S"),
+            "encodings": ["gzip", "br"] if brotli is not None else ["gzip"],
+            "files": files
+        }
+        atomic_write(self.output_dir / "manifest.json", _compact(manifest))
+        return manifest
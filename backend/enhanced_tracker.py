@@ -1,13 +1,41 @@
+import atexit
+import getpass
+import io
 import json
 import os
+import queue
 import sys
+import threading
 import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional, Any
+from dataclasses import dataclass, field
 from pathlib import Path
 import psutil
 import logging
+from logging.handlers import QueueListener
+
+from backend.columnar import export_columnar
+from backend.dashboard import PRODUCTIVE_CATEGORIES, DashboardPublisher
+from backend.export import SessionExporter
+from backend.history import SessionIndex
+from backend.idle import IdleMonitor, create_idle_source
+from backend.logs import (
+    ConsoleHandler, DroppingQueueHandler, RateLimiter, SizedTimedRotatingFileHandler
+)
+from backend.metrics import TrackerMetrics
+from backend.profiling import PROFILING_MODES, LoopProfiler
+from backend.resources import ResourceSampler
+from backend.runtime import AsyncTrackerRuntime
+from backend.scheduler import AdaptivePollingScheduler
+from backend.store import SessionStore, StoreSnapshot
+
+if TYPE_CHECKING:
+    # Imported where used: these only run when a port, URL or merge asks for them
+    from backend.events import EventStreamServer
+    from backend.ingest import IngestClient
+    from backend.query_api import TrackerQueryAPI
 
 try:
     import win32gui
@@ -15,6 +43,32 @@ try:
 except ImportError:
     raise ImportError("Please install pywin32 using: pip install pywin32")
 
+# Built-in app categories; the "app_categories" setting adds to or overrides them
+DEFAULT_APP_CATEGORIES = {
+    'development': ['code.exe', 'devenv.exe', 'sublime_text.exe', 'atom.exe', 'notepad++.exe', 'pycharm64.exe', 'intellij.exe'],
+    'browser': ['chrome.exe', 'firefox.exe', 'msedge.exe', 'opera.exe', 'safari.exe', 'brave.exe'],
+    'communication': ['teams.exe', 'slack.exe', 'discord.exe', 'zoom.exe', 'skype.exe', 'whatsapp.exe'],
+    'media': ['vlc.exe', 'spotify.exe', 'itunes.exe', 'photoshop.exe', 'premiere.exe', 'gimp.exe'],
+    'office': ['winword.exe', 'excel.exe', 'powerpoint.exe', 'outlook.exe', 'onenote.exe'],
+    'gaming': ['steam.exe', 'epicgameslauncher.exe', 'origin.exe', 'battle.net.exe', 'roblox.exe'],
+    'system': ['explorer.exe', 'taskmgr.exe', 'cmd.exe', 'powershell.exe', 'services.exe'],
+    'utilities': ['calculator.exe', 'notepad.exe', 'mspaint.exe', 'snipping.exe', 'winrar.exe']
+}
+
+_category_lookup: Dict[str, str] = {}
+
+def set_app_categories(overrides: Optional[Dict[str, List[str]]] = None):
+    """Rebuild the app -> category lookup from the built-in and configured categories."""
+    global _category_lookup
+    lookup = {app: category for category, apps in DEFAULT_APP_CATEGORIES.items() for app in apps}
+    for category, apps in (overrides or {}).items():
+        for app in apps:
+            lookup[app.lower()] = category
+    # Swapped in whole, so sessions categorized concurrently see the old or new rules
+    _category_lookup = lookup
+
+set_app_categories()
+
 @dataclass
 class AppSession:
     """Enhanced application session with detailed metadata."""
@@ -29,6 +83,7 @@ class AppSession:
     productivity_score: Optional[int] = None
     idle_time: int = 0
     switch_count: int = 0
+    resource_stats: Dict[str, Any] = field(default_factory=dict)
     
     def __post_init__(self):
         """Generate session ID and categorize app."""
@@ -40,22 +95,12 @@ class AppSession:
     
     def _categorize_app(self) -> str:
         """Categorize application based on name."""
-        categories = {
-            'development': ['code.exe', 'devenv.exe', 'sublime_text.exe', 'atom.exe', 'notepad++.exe', 'pycharm64.exe', 'intellij.exe'],
-            'browser': ['chrome.exe', 'firefox.exe', 'msedge.exe', 'opera.exe', 'safari.exe', 'brave.exe'],
-            'communication': ['teams.exe', 'slack.exe', 'discord.exe', 'zoom.exe', 'skype.exe', 'whatsapp.exe'],
-            'media': ['vlc.exe', 'spotify.exe', 'itunes.exe', 'photoshop.exe', 'premiere.exe', 'gimp.exe'],
-            'office': ['winword.exe', 'excel.exe', 'powerpoint.exe', 'outlook.exe', 'onenote.exe'],
-            'gaming': ['steam.exe', 'epicgameslauncher.exe', 'origin.exe', 'battle.net.exe', 'roblox.exe'],
-            'system': ['explorer.exe', 'taskmgr.exe', 'cmd.exe', 'powershell.exe', 'services.exe'],
-            'utilities': ['calculator.exe', 'notepad.exe', 'mspaint.exe', 'snipping.exe', 'winrar.exe']
-        }
-        
-        app_lower = self.app_name.lower()
-        for category, apps in categories.items():
-            if app_lower in apps:
-                return category
-        return 'unknown'
+        return _category_lookup.get(self.app_name.lower(), 'unknown')
+    
+    @property
+    def active_seconds(self) -> int:
+        """Session duration excluding time the user was idle."""
+        return max(self.duration_seconds - self.idle_time, 0)
     
     def to_dict(self) -> Dict[str, Any]:
         """Enhanced dictionary representation."""
@@ -70,6 +115,7 @@ class AppSession:
             "productivity_score": self.productivity_score,
             "idle_time": self.idle_time,
             "switch_count": self.switch_count,
+            "resources": self.resource_stats,
             "metadata": {
                 "day_of_week": self.start_time.strftime("%A"),
                 "hour": self.start_time.hour,
@@ -107,14 +153,44 @@ class AppSession:
             category=data.get("category", "unknown"),
             productivity_score=data.get("productivity_score"),
             idle_time=data.get("idle_time", 0),
-            switch_count=data.get("switch_count", 0)
+            switch_count=data.get("switch_count", 0),
+            resource_stats=data.get("resources", {})
         )
 
 class AppUsageConfig:
     """Configuration management for the app tracker."""
     
+    # Settings read once at startup; changing them takes a restart
+    RESTART_KEYS = (
+        "log_file", "process_cache_size", "resource_raw_samples", "resource_minute_buckets",
+        "resource_hour_buckets", "enable_metrics", "metrics_port", "query_api_port", "dashboard_dir",
+        "event_stream_port", "event_stream_path", "event_queue_size", "ingest_url", "ingest_user",
+        "ingest_team", "ingest_batch_size", "ingest_flush_interval", "log_max_bytes", "log_backup_count",
+        "log_rotate_when", "enable_idle_detection", "profiling_mode"
+    )
+    
+    # Allowed values of enumerated settings, compared case-insensitively
+    CHOICES = {
+        "profiling_mode": PROFILING_MODES,
+        "log_level": ("debug", "info", "warning", "error", "critical"),
+        "log_rotate_when": ("s", "m", "h", "d", "midnight", "w0", "w1", "w2", "w3", "w4", "w5", "w6")
+    }
+    
+    # Lower bounds of numeric settings
+    MINIMUMS = {
+        "check_interval": 0.1, "min_check_interval": 0.1, "max_check_interval": 0.1, "polling_backoff_factor": 1,
+        "switch_window_seconds": 0, "idle_threshold": 0, "min_session_duration": 0, "heartbeat_interval": 0,
+        "metrics_dump_interval": 0, "config_check_interval": 0, "log_rate_limit": 0
+    }
+    
     def __init__(self, config_path: str = "config.json"):
         self.config_path = Path(config_path)
+        self._version = 0
+        self._stamp = None
+        self._next_check = 0.0
+        self._apply_lock = threading.Lock()
+        # Restart-only settings changed since startup; saved, not applied
+        self._pending_restart: Dict[str, Any] = {}
         self._load_config()
     
     def _load_config(self):
@@ -122,39 +198,277 @@ class AppUsageConfig:
         default_config = {
             "log_file": "app_usage_log.json",
             "check_interval": 5,
+            "adaptive_polling": True,
+            "min_check_interval": 1,
+            "max_check_interval": 30,
+            "polling_backoff_factor": 1.5,
+            "switch_window_seconds": 60,
+            "process_cache_size": 256,
+            "enable_idle_detection": True,
+            "idle_threshold": 300,
+            "enable_resource_sampling": True,
+            "resource_raw_samples": 720,
+            "resource_minute_buckets": 1440,
+            "resource_hour_buckets": 720,
+            "enable_metrics": True,
+            "metrics_file": "tracker_metrics.prom",
+            "metrics_dump_interval": 60,
+            "metrics_port": 0,
+            "query_api_port": 8731,
+            "enable_dashboard_snapshots": True,
+            "dashboard_dir": "dashboard",
+            "event_stream_port": 0,
+            "event_stream_path": "",
+            "event_queue_size": 100,
+            "heartbeat_interval": 5,
+            "ingest_url": "",
+            "ingest_user": "",
+            "ingest_team": "",
+            "ingest_batch_size": 100,
+            "ingest_flush_interval": 30,
+            "profiling_mode": "off",
+            "profiling_duration": 60,
+            "slow_iteration_threshold_ms": 200,
+            "profiling_top_n": 25,
             "min_session_duration": 3,
             "excluded_apps": ["dwm.exe", "winlogon.exe", "csrss.exe", "searchhost.exe"],
             "enable_logging": True,
             "log_level": "INFO",
+            "log_max_bytes": 5 * 1024 * 1024,
+            "log_backup_count": 5,
+            "log_rotate_when": "midnight",
+            "log_rate_limit": 1.0,
             "enable_productivity_tracking": True,
-            "enable_detailed_tracking": True
+            "enable_detailed_tracking": True,
+            "app_categories": {},
+            "config_check_interval": 2
         }
+        self._defaults = dict(default_config)
         
         if self.config_path.exists():
             try:
-                with open(self.config_path, 'r') as f:
-                    user_config = json.load(f)
-                    default_config.update(user_config)
-            except (json.JSONDecodeError, IOError) as e:
+                self._stamp = self._file_stamp()
+                user_config = self._read_file()
+                # Invalid settings fall back to their defaults
+                for key, error in self.validate(user_config, base=default_config).items():
+                    print(f"Invalid config setting {error}. Using the default.")
+                    user_config.pop(key, None)
+                default_config.update(user_config)
+            except (json.JSONDecodeError, IOError, ValueError) as e:
                 print(f"Could not load config: {e}. Using defaults.")
         
         for key, value in default_config.items():
             setattr(self, key, value)
     
+    @property
+    def version(self) -> int:
+        """Bumped each time new settings are swapped in."""
+        return self._version
+    
+    def _file_stamp(self):
+        stat = self.config_path.stat()
+        return stat.st_mtime_ns, stat.st_size
+    
+    def _read_file(self) -> Dict[str, Any]:
+        with open(self.config_path, 'r') as f:
+            user_config = json.load(f)
+        if not isinstance(user_config, dict):
+            raise ValueError("config must be a JSON object")
+        return user_config
+    
+    def validate(self, values: Dict[str, Any], base: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
+        """Check settings against the types of their defaults; returns an error per bad key.
+        
+        Settings that depend on each other are checked as they would be
+        once `values` is merged into `base` (default: the current settings).
+        """
+        errors = {}
+        for key, value in values.items():
+            default = self._defaults.get(key)
+            if key not in self._defaults or default is None:
+                continue
+            if isinstance(default, bool):
+                valid = isinstance(value, bool)
+            elif isinstance(default, (int, float)):
+                valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+                if valid and value < self.MINIMUMS.get(key, value):
+                    errors[key] = f"{key}: must be at least {self.MINIMUMS[key]}"
+                    continue
+            elif isinstance(default, list):
+                valid = isinstance(value, list) and all(isinstance(item, str) for item in value)
+            elif isinstance(default, dict):
+                valid = isinstance(value, dict) and all(
+                    isinstance(items, list) and all(isinstance(item, str) for item in items)
+                    for items in value.values()
+                )
+            else:
+                valid = isinstance(value, type(default))
+                if valid and key in self.CHOICES and value.lower() not in self.CHOICES[key]:
+                    errors[key] = f"{key}: must be one of {', '.join(self.CHOICES[key])}"
+                    continue
+            if not valid:
+                errors[key] = f"{key}: expected {type(default).__name__}, got {type(value).__name__}"
+        
+        merged = {**(base if base is not None else self.__dict__), **values}
+        minimum = merged.get("min_check_interval", self._defaults["min_check_interval"])
+        maximum = merged.get("max_check_interval", self._defaults["max_check_interval"])
+        if not errors and minimum > maximum:
+            errors["max_check_interval"] = "max_check_interval: must not be below min_check_interval"
+        return errors
+    
+    def _apply(self, values: Dict[str, Any]):
+        """Swap in validated settings in one step and bump the version."""
+        with self._apply_lock:
+            self.__dict__.update(values)
+            self._version += 1
+    
+    def _defer_restart_keys(self, changes: Dict[str, Any]) -> Dict[str, Any]:
+        """Hold back restart-only settings from `changes`, reporting them; returns the rest."""
+        live = {}
+        for key, value in changes.items():
+            if key not in self.RESTART_KEYS:
+                live[key] = value
+            elif getattr(self, key, None) == value:
+                self._pending_restart.pop(key, None)
+            else:
+                self._pending_restart[key] = value
+        restart = sorted(key for key in changes if key in self._pending_restart)
+        if restart:
+            print(f"Config changes to {', '.join(restart)} take effect after a restart.")
+        return live
+    
+    def update(self, changes: Dict[str, Any]):
+        """Validate, apply and save changed settings; raises ValueError if any is invalid.
+        
+        Restart-only settings are saved but keep their current values
+        until the next start.
+        """
+        errors = self.validate(changes)
+        if errors:
+            raise ValueError("; ".join(errors.values()))
+        live = self._defer_restart_keys(changes)
+        if live:
+            self._apply(live)
+        self.save_config()
+    
+    def reload_if_changed(self) -> bool:
+        """Apply the config file if it changed since it was last read.
+        
+        The file is stat'ed at most every config_check_interval seconds, so
+        calling this on every sample costs a clock read. A file that fails
+        validation is reported once and the current settings are kept.
+        """
+        now = time.monotonic()
+        if now < self._next_check:
+            return False
+        self._next_check = now + self.config_check_interval
+        
+        try:
+            stamp = self._file_stamp()
+        except OSError:
+            return False
+        if stamp == self._stamp:
+            return False
+        self._stamp = stamp
+        
+        try:
+            user_config = self._read_file()
+        except (json.JSONDecodeError, IOError, ValueError) as e:
+            print(f"Could not reload config: {e}. Keeping current settings.")
+            return False
+        merged = {**self._defaults, **user_config}
+        errors = self.validate(merged, base=merged)
+        if errors:
+            print(f"Could not reload config: {'; '.join(errors.values())}. Keeping current settings.")
+            return False
+        
+        # Restart-only settings are compared afresh, so reverting one in the file cancels it
+        self._pending_restart = {}
+        changes = self._defer_restart_keys(
+            {key: value for key, value in merged.items() if getattr(self, key, None) != value}
+        )
+        if not changes:
+            return False
+        self._apply(changes)
+        return True
+    
     def save_config(self):
         """Save current configuration to file."""
         config_dict = {k: v for k, v in self.__dict__.items() if not k.startswith('_')}
         config_dict.pop('config_path', None)
+        config_dict.update(self._pending_restart)
         
         with open(self.config_path, 'w') as f:
             json.dump(config_dict, f, indent=4)
+        # Our own write is not an external change to reload
+        self._stamp = self._file_stamp()
+
+class ProcessCache:
+    """Bounded PID-keyed cache of psutil handles and static process attributes."""
+    
+    def __init__(self, max_size: int = 256, prune_every: int = 500):
+        self.max_size = max_size
+        self.prune_every = prune_every
+        self._entries: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._lookups = 0
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, pid: int) -> Dict[str, Any]:
+        """Get the cache entry for a PID, creating it on a miss.
+        
+        Hits are not re-checked for liveness; callers evict a PID whose
+        handle raises psutil.NoSuchProcess, and prune() drops exited
+        processes now and then. A new entry is flagged "cpu_primed": its
+        CPU counter starts now, so the first reading comes from the next poll.
+        Raises psutil.NoSuchProcess if the process has exited.
+        """
+        self._lookups += 1
+        if self._lookups % self.prune_every == 0:
+            self.prune()
+        
+        entry = self._entries.get(pid)
+        if entry is not None:
+            self._entries.move_to_end(pid)
+            self.hits += 1
+            return entry
+        
+        self.misses += 1
+        proc = psutil.Process(pid)
+        with proc.oneshot():
+            entry = {
+                "process": proc,
+                "name": proc.name(),
+                "create_time": datetime.fromtimestamp(proc.create_time()),
+                "cpu_primed": True
+            }
+            # Prime the CPU counter; the next call returns a real percentage
+            proc.cpu_percent(None)
+        
+        self._entries[pid] = entry
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return entry
+    
+    def evict(self, pid: int):
+        """Drop a PID from the cache."""
+        self._entries.pop(pid, None)
+    
+    def prune(self):
+        """Evict entries for processes that have exited."""
+        for pid in [pid for pid, entry in self._entries.items() if not entry["process"].is_running()]:
+            del self._entries[pid]
+    
+    def __len__(self) -> int:
+        return len(self._entries)
 
 class EnhancedWindowsAppDetector:
     """Enhanced Windows app detector with more details."""
     
-    def __init__(self):
+    def __init__(self, process_cache_size: int = 256):
         self.switch_count = 0
         self.last_app = None
+        self.process_cache = ProcessCache(max_size=process_cache_size)
     
     def get_active_app_info(self) -> Optional[Dict[str, Any]]:
         """Get detailed information about the currently active application."""
@@ -167,28 +481,30 @@ class EnhancedWindowsAppDetector:
             _, pid = win32process.GetWindowThreadProcessId(hwnd)
             
             try:
-                proc = psutil.Process(pid)
+                entry, cpu_percent, memory_mb = self._sample_process(pid)
+                app_name = entry["name"]
                 
                 # Get additional process info
                 process_info = {
-                    "name": proc.name(),
+                    "name": app_name,
                     "title": window_title,
                     "pid": pid,
-                    "cpu_percent": proc.cpu_percent(),
-                    "memory_mb": round(proc.memory_info().rss / 1024 / 1024, 2),
-                    "create_time": datetime.fromtimestamp(proc.create_time()),
+                    "cpu_percent": cpu_percent,
+                    "memory_mb": memory_mb,
+                    "create_time": entry["create_time"],
                     "window_handle": hwnd
                 }
                 
                 # Track app switches
-                if self.last_app != proc.name():
+                if self.last_app != app_name:
                     self.switch_count += 1
-                    self.last_app = proc.name()
+                    self.last_app = app_name
                     process_info["switch_count"] = self.switch_count
                 
                 return process_info
                 
             except psutil.NoSuchProcess:
+                self.process_cache.evict(pid)
                 return {
                     "name": "Unknown Process",
                     "title": window_title,
@@ -203,6 +519,31 @@ class EnhancedWindowsAppDetector:
             print(f"Error getting active app: {e}")
             return None
     
+    def _sample_process(self, pid: int):
+        """Cache entry, CPU percent and RSS in MB of a PID.
+        
+        CPU is None for a process first seen on this poll. A cached handle
+        whose process has exited is dropped and the PID looked up once more;
+        raises psutil.NoSuchProcess if that fails too.
+        """
+        entry = self.process_cache.get(pid)
+        try:
+            return entry, *self._read_usage(entry)
+        except psutil.NoSuchProcess:
+            self.process_cache.evict(pid)
+            if entry.get("cpu_primed"):
+                raise
+        entry = self.process_cache.get(pid)
+        return entry, *self._read_usage(entry)
+    
+    @staticmethod
+    def _read_usage(entry: Dict[str, Any]):
+        proc = entry["process"]
+        memory_mb = round(proc.memory_info().rss / 1024 / 1024, 2)
+        if entry.pop("cpu_primed", False):
+            return None, memory_mb
+        return proc.cpu_percent(None), memory_mb
+    
     def _get_desktop_info(self) -> Dict[str, Any]:
         """Get desktop information."""
         return {
@@ -218,9 +559,10 @@ class EnhancedWindowsAppDetector:
 class EnhancedDataManager:
     """Enhanced data manager with detailed tracking."""
     
-    def __init__(self, log_file: str):
+    def __init__(self, log_file: str, metrics: Optional[TrackerMetrics] = None):
         self.log_file = Path(log_file)
         self.stats_file = Path(log_file).with_suffix('.stats.json')
+        self.metrics = metrics or TrackerMetrics(enabled=False)
         self._ensure_log_directory()
     
     def _ensure_log_directory(self):
@@ -236,23 +578,13 @@ class EnhancedDataManager:
             with open(self.log_file, 'r') as f:
                 raw_data = json.load(f)
             
+            from backend.merge import iter_log_records
+            
             # Handle both old and new formats
-            if "applications" in raw_data:  # New format
-                data = {}
-                for app_name, app_data in raw_data["applications"].items():
-                    data[app_name] = [
-                        AppSession.from_dict(app_name, session_data)
-                        for session_data in app_data["sessions"]
-                    ]
-                return data
-            else:  # Old format
-                data = {}
-                for app_name, sessions in raw_data.items():
-                    data[app_name] = [
-                        AppSession.from_dict(app_name, session_data)
-                        for session_data in sessions
-                    ]
-                return data
+            data = {}
+            for app_name, session_data in iter_log_records(raw_data):
+                data.setdefault(app_name, []).append(AppSession.from_dict(app_name, session_data))
+            return data
             
         except (json.JSONDecodeError, IOError) as e:
             print(f"Error loading data: {e}")
@@ -261,38 +593,8 @@ class EnhancedDataManager:
     def save_data(self, data: Dict[str, List[AppSession]]):
         """Save enhanced data with statistics."""
         try:
-            # Convert to enhanced format
-            enhanced_data = {
-                "metadata": {
-                    "version": "2.0",
-                    "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    "total_sessions": sum(len(sessions) for sessions in data.values()),
-                    "total_apps": len(data),
-                    "tracking_period": self._get_tracking_period(data)
-                },
-                "applications": {}
-            }
-            
-            # Process each application
-            for app_name, sessions in data.items():
-                if sessions:  # Only process if there are sessions
-                    app_data = {
-                        "name": app_name,
-                        "category": sessions[0].category if sessions else "unknown",
-                        "total_sessions": len(sessions),
-                        "total_duration": sum(s.duration_seconds for s in sessions),
-                        "average_session_duration": round(sum(s.duration_seconds for s in sessions) / len(sessions), 2) if sessions else 0,
-                        "first_used": min(s.start_time for s in sessions).strftime("%Y-%m-%d %H:%M:%S") if sessions else None,
-                        "last_used": max(s.end_time for s in sessions if s.end_time).strftime("%Y-%m-%d %H:%M:%S") if sessions else None,
-                        "sessions": [session.to_dict() for session in sessions],
-                        "daily_usage": self._calculate_daily_usage(sessions),
-                        "hourly_pattern": self._calculate_hourly_pattern(sessions)
-                    }
-                    enhanced_data["applications"][app_name] = app_data
-            
-            # Save enhanced data
-            with open(self.log_file, 'w') as f:
-                json.dump(enhanced_data, f, indent=2)
+            enhanced_data = self.build_enhanced_data(data)
+            self.write_log(enhanced_data)
             
             # Save separate stats file
             self._save_statistics(enhanced_data)
@@ -300,6 +602,50 @@ class EnhancedDataManager:
         except IOError as e:
             print(f"Error saving enhanced data: {e}")
     
+    def build_enhanced_data(self, data: Dict[str, List[AppSession]]) -> Dict[str, Any]:
+        """Convert session data to the enhanced (v2) log format."""
+        # Convert to enhanced format
+        enhanced_data = {
+            "metadata": {
+                "version": "2.0",
+                "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "total_sessions": sum(len(sessions) for sessions in data.values()),
+                "total_apps": len(data),
+                "tracking_period": self._get_tracking_period(data)
+            },
+            "applications": {}
+        }
+        
+        # Process each application
+        for app_name, sessions in data.items():
+            if sessions:  # Only process if there are sessions
+                app_data = {
+                    "name": app_name,
+                    "category": sessions[0].category if sessions else "unknown",
+                    "total_sessions": len(sessions),
+                    "total_duration": sum(s.duration_seconds for s in sessions),
+                    "total_idle_time": sum(s.idle_time for s in sessions),
+                    "average_session_duration": round(sum(s.duration_seconds for s in sessions) / len(sessions), 2) if sessions else 0,
+                    "first_used": min(s.start_time for s in sessions).strftime("%Y-%m-%d %H:%M:%S") if sessions else None,
+                    "last_used": max(s.end_time for s in sessions if s.end_time).strftime("%Y-%m-%d %H:%M:%S") if sessions else None,
+                    "sessions": [session.to_dict() for session in sessions],
+                    "daily_usage": self._calculate_daily_usage(sessions),
+                    "hourly_pattern": self._calculate_hourly_pattern(sessions)
+                }
+                enhanced_data["applications"][app_name] = app_data
+        
+        return enhanced_data
+    
+    def write_log(self, enhanced_data: Dict[str, Any]):
+        """Write enhanced data to the log file."""
+        with self.metrics.timer("save_data"):
+            with open(self.log_file, 'w') as f:
+                json.dump(enhanced_data, f, indent=2)
+                bytes_written = f.tell()
+        
+        self.metrics.inc("saves")
+        self.metrics.inc("bytes_written", bytes_written)
+    
     def _get_tracking_period(self, data: Dict[str, List[AppSession]]) -> Dict[str, Any]:
         """Calculate tracking period."""
         all_sessions = [session for sessions in data.values() for session in sessions]
@@ -321,19 +667,19 @@ class EnhancedDataManager:
         }
     
     def _calculate_daily_usage(self, sessions: List[AppSession]) -> Dict[str, int]:
-        """Calculate daily usage patterns."""
+        """Calculate daily usage patterns from active (non-idle) time."""
         daily_usage = {}
         for session in sessions:
             date = session.start_time.strftime("%Y-%m-%d")
-            daily_usage[date] = daily_usage.get(date, 0) + session.duration_seconds
+            daily_usage[date] = daily_usage.get(date, 0) + session.active_seconds
         return daily_usage
     
     def _calculate_hourly_pattern(self, sessions: List[AppSession]) -> Dict[str, int]:
-        """Calculate hourly usage patterns."""
+        """Calculate hourly usage patterns from active (non-idle) time."""
         hourly_pattern = {str(hour): 0 for hour in range(24)}
         for session in sessions:
             hour = str(session.start_time.hour)
-            hourly_pattern[hour] += session.duration_seconds
+            hourly_pattern[hour] += session.active_seconds
         return hourly_pattern
     
     def _save_statistics(self, data: Dict[str, Any]):
@@ -346,8 +692,18 @@ class EnhancedDataManager:
             "time_patterns": self._analyze_time_patterns(data["applications"])
         }
         
-        with open(self.stats_file, 'w') as f:
-            json.dump(stats, f, indent=2)
+        with self.metrics.timer("save_statistics"):
+            with open(self.stats_file, 'w') as f:
+                json.dump(stats, f, indent=2)
+                bytes_written = f.tell()
+        
+        self.metrics.inc("stats_saves")
+        self.metrics.inc("bytes_written", bytes_written)
+    
+    @staticmethod
+    def _active_time(app_data: Dict[str, Any]) -> int:
+        """Active (non-idle) seconds of an application in the enhanced format."""
+        return app_data["total_duration"] - app_data.get("total_idle_time", 0)
     
     def _get_top_apps(self, apps: Dict[str, Any], limit: int = 10) -> List[Dict[str, Any]]:
         """Get top applications by usage."""
@@ -356,9 +712,9 @@ class EnhancedDataManager:
             app_list.append({
                 "name": app_name,
                 "category": app_data["category"],
-                "total_duration": app_data["total_duration"],
+                "total_duration": self._active_time(app_data),
                 "total_sessions": app_data["total_sessions"],
-                "average_session": app_data["average_session_duration"]
+                "average_session": round(self._active_time(app_data) / app_data["total_sessions"], 2) if app_data["total_sessions"] else 0
             })
         
         return sorted(app_list, key=lambda x: x["total_duration"], reverse=True)[:limit]
@@ -375,7 +731,7 @@ class EnhancedDataManager:
                     "app_count": 0
                 }
             
-            categories[category]["total_duration"] += app_data["total_duration"]
+            categories[category]["total_duration"] += self._active_time(app_data)
             categories[category]["total_sessions"] += app_data["total_sessions"]
             categories[category]["app_count"] += 1
         
@@ -383,10 +739,11 @@ class EnhancedDataManager:
     
     def _calculate_productivity_metrics(self, apps: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate productivity metrics."""
-        productive_categories = ['development', 'office', 'utilities']
-        total_time = sum(app_data["total_duration"] for app_data in apps.values())
+        productive_categories = PRODUCTIVE_CATEGORIES
+        idle_time = sum(app_data.get("total_idle_time", 0) for app_data in apps.values())
+        total_time = sum(self._active_time(app_data) for app_data in apps.values())
         productive_time = sum(
-            app_data["total_duration"] 
+            self._active_time(app_data)
             for app_data in apps.values() 
             if app_data["category"] in productive_categories
         )
@@ -395,7 +752,8 @@ class EnhancedDataManager:
             "total_time": total_time,
             "productive_time": productive_time,
             "productivity_percentage": round((productive_time / total_time * 100), 2) if total_time > 0 else 0,
-            "distraction_time": total_time - productive_time
+            "distraction_time": total_time - productive_time,
+            "idle_time": idle_time
         }
     
     def _analyze_time_patterns(self, apps: Dict[str, Any]) -> Dict[str, Any]:
@@ -448,7 +806,7 @@ class EnhancedUsageAnalyzer:
         
         for app_name, sessions in self.data.items():
             daily_time = sum(
-                session.duration_seconds
+                session.active_seconds
                 for session in sessions
                 if session.start_time.strftime("%Y-%m-%d") == target_date
             )
@@ -462,7 +820,7 @@ class EnhancedUsageAnalyzer:
         app_totals = {}
         
         for app_name, sessions in self.data.items():
-            total_time = sum(session.duration_seconds for session in sessions)
+            total_time = sum(session.active_seconds for session in sessions)
             app_totals[app_name] = total_time
         
         return sorted(app_totals.items(), key=lambda x: x[1], reverse=True)[:limit]
@@ -476,7 +834,7 @@ class EnhancedUsageAnalyzer:
                 continue
                 
             category = sessions[0].category
-            total_time = sum(session.duration_seconds for session in sessions)
+            total_time = sum(session.active_seconds for session in sessions)
             
             if category not in category_stats:
                 category_stats[category] = {
@@ -542,12 +900,11 @@ class EnhancedUsageAnalyzer:
             report += f"• {category.title()}: {duration} ({app_count} apps, {stats['session_count']} sessions)\n"
         
         # Productivity Metrics
-        productive_categories = ['development', 'office', 'utilities']
         total_time = sum(stats["total_time"] for stats in category_analysis.values())
         productive_time = sum(
             stats["total_time"] 
             for cat, stats in category_analysis.items() 
-            if cat in productive_categories
+            if cat in PRODUCTIVE_CATEGORIES
         )
         
         if total_time > 0:
@@ -562,91 +919,377 @@ class EnhancedUsageAnalyzer:
         return report
 
 class SafeLogger:
-    """Unicode-safe logging wrapper."""
+    """Unicode-safe, asynchronous logging wrapper.
     
-    def __init__(self, logger_name: str = __name__):
+    Calls only put the record on a bounded queue; a listener thread writes
+    it to the size- and time-rotated log file and to stdout, replacing
+    emojis there if the console cannot encode them. Handlers are set up
+    once per logger name however many SafeLoggers are created, and
+    messages logged with a rate_key are rate-limited per key.
+    """
+    
+    LOG_FILE = 'app_tracker.log'
+    
+    _listeners: Dict[str, QueueListener] = {}
+    _setup_lock = threading.Lock()
+    
+    def __init__(self, logger_name: str = __name__, level: str = "INFO", max_bytes: int = 5 * 1024 * 1024,
+                 backup_count: int = 5, when: str = "midnight", queue_size: int = 10000,
+                 rate_limit: float = 1.0, burst: int = 20):
         self.logger = logging.getLogger(logger_name)
-        self._setup_unicode_logging()
+        self.rate_limiter = RateLimiter(rate_limit, burst)
+        self._setup_unicode_logging(level, max_bytes, backup_count, when, queue_size)
     
-    def _setup_unicode_logging(self):
-        """Setup logging with proper Unicode support."""
-        # Set UTF-8 encoding for stdout if possible
-        if hasattr(sys.stdout, 'reconfigure'):
-            try:
-                sys.stdout.reconfigure(encoding='utf-8')
-            except (AttributeError, OSError):
-                pass
-        
-        # Create handlers with proper encoding
-        file_handler = logging.FileHandler('app_tracker.log', encoding='utf-8')
-        console_handler = logging.StreamHandler(sys.stdout)
-        
-        # Set formatting
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
-        
-        # Configure logger
-        self.logger.setLevel(logging.INFO)
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
-    
-    def safe_log(self, level, message):
-        """Log message with fallback for Unicode issues."""
-        try:
-            getattr(self.logger, level)(message)
-        except UnicodeEncodeError:
-            # Fallback: replace emojis with ASCII equivalents
-            safe_message = self._make_ascii_safe(message)
-            getattr(self.logger, level)(safe_message)
-    
-    def _make_ascii_safe(self, message):
-        """Convert Unicode emojis to ASCII equivalents."""
-        emoji_map = {
-            '🔄': '[*]',
-            '🟢': '[+]',
-            '✅': '[OK]',
-            '🛑': '[!]',
-            '🔴': '[-]',
-            '❌': '[ERROR]',
-            '📊': '[REPORT]',
-            '🏆': '[TOP]',
-            '📅': '[TODAY]'
-        }
-        
-        for emoji, ascii_equiv in emoji_map.items():
-            message = message.replace(emoji, ascii_equiv)
-        
-        return message
+    def _setup_unicode_logging(self, level: str, max_bytes: int, backup_count: int, when: str, queue_size: int):
+        """Setup queued logging with proper Unicode support, once per logger."""
+        with self._setup_lock:
+            if self.logger.name in self._listeners:
+                return
+            
+            # Set UTF-8 encoding for stdout if possible
+            if hasattr(sys.stdout, 'reconfigure'):
+                try:
+                    sys.stdout.reconfigure(encoding='utf-8')
+                except (AttributeError, OSError):
+                    pass
+            
+            # Create handlers with proper encoding; they run on the listener thread
+            file_handler = SizedTimedRotatingFileHandler(
+                self.LOG_FILE, max_bytes=max_bytes, when=when, backup_count=backup_count
+            )
+            console_handler = ConsoleHandler(sys.stdout)
+            
+            # Set formatting
+            formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+            file_handler.setFormatter(formatter)
+            console_handler.setFormatter(formatter)
+            
+            # Configure logger
+            self.logger.setLevel(getattr(logging, str(level).upper(), logging.INFO))
+            self.logger.addHandler(DroppingQueueHandler(queue.Queue(maxsize=queue_size)))
+            listener = QueueListener(self.logger.handlers[-1].queue, file_handler, console_handler)
+            listener.start()
+            self._listeners[self.logger.name] = listener
+            
+            if len(self._listeners) == 1:
+                atexit.register(SafeLogger.shutdown)
+    
+    @classmethod
+    def shutdown(cls):
+        """Write out queued records and stop every listener thread."""
+        with cls._setup_lock:
+            for listener in cls._listeners.values():
+                listener.stop()
+                for handler in listener.handlers:
+                    handler.close()
+            cls._listeners.clear()
+    
+    def safe_log(self, level, message, rate_key: Optional[str] = None):
+        """Log message, dropping it if its rate_key is over its rate limit."""
+        if rate_key is not None:
+            allowed, suppressed = self.rate_limiter.allow(rate_key)
+            if not allowed:
+                return
+            if suppressed:
+                message = f"{message} ({suppressed} similar messages suppressed)"
+        getattr(self.logger, level)(message)
     
-    def info(self, message):
-        self.safe_log('info', message)
+    def info(self, message, rate_key: Optional[str] = None):
+        self.safe_log('info', message, rate_key)
     
-    def error(self, message):
-        self.safe_log('error', message)
+    def error(self, message, rate_key: Optional[str] = None):
+        self.safe_log('error', message, rate_key)
     
-    def warning(self, message):
-        self.safe_log('warning', message)
+    def warning(self, message, rate_key: Optional[str] = None):
+        self.safe_log('warning', message, rate_key)
 
 class EnhancedAppUsageTracker:
     """Enhanced main application usage tracker class."""
     
-    def __init__(self, config_path: str = "config.json"):
+    def __init__(self, config_path: str = "config.json", load_history: bool = True):
         self.config = AppUsageConfig(config_path)
-        self.detector = EnhancedWindowsAppDetector()
-        self.data_manager = EnhancedDataManager(self.config.log_file)
+        self.metrics = TrackerMetrics(enabled=self.config.enable_metrics)
+        self.detector = EnhancedWindowsAppDetector(self.config.process_cache_size)
+        self.data_manager = EnhancedDataManager(self.config.log_file, self.metrics)
+        
+        # Use safe logger; handlers are shared by every tracker in the process
+        self.logger = SafeLogger(
+            level=self.config.log_level,
+            max_bytes=self.config.log_max_bytes,
+            backup_count=self.config.log_backup_count,
+            when=self.config.log_rotate_when,
+            rate_limit=self.config.log_rate_limit
+        )
         
-        # Use safe logger
-        self.logger = SafeLogger()
+        # Configured categories apply to the history being loaded too
+        set_app_categories(self.config.app_categories)
         
-        # Load existing data
-        self.data = self.data_manager.load_data()
+        # Load existing data (callers may defer this and use attach_history);
+        # readers on other threads get immutable snapshots of the store
+        self.store = SessionStore(self.data_manager.load_data() if load_history else None)
         self.current_session: Optional[AppSession] = None
         self.is_running = False
+        
+        # Poll faster after switches, slower when stable or idle
+        self.scheduler = AdaptivePollingScheduler.from_config(self.config)
+        
+        # Input idle detection (one cheap query per sample)
+        self.idle_monitor = IdleMonitor(
+            create_idle_source(self.config.enable_idle_detection),
+            self.config.idle_threshold
+        )
+        
+        # Per-app CPU/memory history in fixed-size ring buffers
+        self.resource_sampler = ResourceSampler(
+            raw_capacity=self.config.resource_raw_samples,
+            minute_capacity=self.config.resource_minute_buckets,
+            hour_capacity=self.config.resource_hour_buckets
+        )
+        
+        # Opt-in profiling; reports go next to the log file
+        self.profiler = LoopProfiler.from_config(
+            "tracker", self.config, output_dir=str(Path(SafeLogger.LOG_FILE).resolve().parent)
+        )
+        
+        # Callbacks notified of session events, and the async runtime if any
+        self._listeners = []
+        self.runtime = None
+        
+        # Per-app totals and last-used times, maintained incrementally. Never
+        # modified in place: each update publishes a new dict, so readers on
+        # other threads can keep the reference they took.
+        self.app_stats: Dict[str, Dict[str, Any]] = self._build_app_stats(self.data)
+        
+        # Time-ordered index for paging through history
+        self.history_index = SessionIndex(self.data)
+        
+        # Held while recording a session into the store, app_stats and history_index
+        self._record_lock = threading.Lock()
+        
+        # Local read-only query service over the in-memory aggregates, created when served
+        self.query_api: Optional["TrackerQueryAPI"] = None
+        
+        # Precompressed dashboard payloads, refreshed after each save
+        self.dashboard = DashboardPublisher(
+            str(self.data_manager.log_file.parent / self.config.dashboard_dir),
+            category_score=lambda category: self._calculate_productivity_score(None, category)
+        )
+        
+        # Push stream of tracker events, started on demand
+        self.event_stream: Optional["EventStreamServer"] = None
+        self._last_heartbeat = 0.0
+        
+        # Batched uploads of finished sessions to a fleet ingest service
+        self.ingest_client: Optional["IngestClient"] = None
+        if self.config.ingest_url:
+            from backend.ingest import IngestClient
+            
+            self.ingest_client = IngestClient(
+                self.config.ingest_url,
+                user=self.config.ingest_user or getpass.getuser(),
+                team=self.config.ingest_team,
+                batch_size=self.config.ingest_batch_size,
+                flush_interval=self.config.ingest_flush_interval
+            )
+            self.add_listener(self._queue_upload)
+        
+        # Rules derived from settings that can change while tracking
+        self._apply_config()
+    
+    @property
+    def data(self) -> StoreSnapshot:
+        """Immutable snapshot of all recorded sessions, cheap to take from any thread."""
+        return self.store.snapshot()
+    
+    @data.setter
+    def data(self, value: Dict[str, List[AppSession]]):
+        self.store.replace(value)
+    
+    @property
+    def data_version(self) -> int:
+        """Bumped whenever the data changes so readers can skip stale work."""
+        return self.store.version
+    
+    def _queue_upload(self, event_type: str, payload: Dict[str, Any]):
+        """Listener handing finished sessions to the ingest client."""
+        if event_type == "session_ended":
+            self.ingest_client.submit(payload)
+    
+    @staticmethod
+    def _session_payload(session: AppSession) -> Dict[str, Any]:
+        """Event payload for a session."""
+        return {"app_name": session.app_name, **session.to_dict()}
+    
+    def add_listener(self, callback):
+        """Register a callback(event_type, payload) for tracker events."""
+        self._listeners.append(callback)
+    
+    def remove_listener(self, callback):
+        """Unregister a tracker event callback."""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+    
+    def _notify(self, event_type: str, payload: Dict[str, Any]):
+        """Notify listeners of a tracker event."""
+        for callback in list(self._listeners):
+            try:
+                callback(event_type, payload)
+            except Exception as e:
+                self.logger.error(f"❌ Listener error: {e}", rate_key="listener_error")
+    
+    @staticmethod
+    def _build_app_stats(data) -> Dict[str, Dict[str, Any]]:
+        """Compute per-app stats from scratch."""
+        app_stats = {}
+        for sessions in data.values():
+            for session in sessions:
+                EnhancedAppUsageTracker._fold_session(app_stats, session)
+        return app_stats
+    
+    @staticmethod
+    def _fold_session(app_stats: Dict[str, Dict[str, Any]], session: AppSession):
+        """Fold one session into an app's entry, replacing the entry rather than changing it."""
+        stats = app_stats.get(session.app_name)
+        if stats is None:
+            stats = {"category": session.category, "total_time": 0, "session_count": 0, "last_used": None}
+        last_used = stats["last_used"]
+        if session.end_time and (last_used is None or session.end_time > last_used):
+            last_used = session.end_time
+        app_stats[session.app_name] = dict(
+            stats,
+            total_time=stats["total_time"] + session.active_seconds,
+            session_count=stats["session_count"] + 1,
+            last_used=last_used
+        )
+    
+    def _record_session(self, session: AppSession):
+        """Append a finished session to the store and the derived aggregates."""
+        with self._record_lock:
+            # Aggregates first, so a reader that finds the session in the store finds its totals
+            app_stats = dict(self.app_stats)
+            self._fold_session(app_stats, session)
+            self.app_stats = app_stats
+            self.history_index.add(session)
+            self.store.append(session)
+    
+    def mark_data_changed(self):
+        """Signal that the store's data was replaced outside the tracking loop.
+        
+        The per-app stats and history index are rebuilt off to the side
+        from a snapshot, so the tracking loop is never held up and readers
+        never see them half-built. Sessions recorded meanwhile are replayed
+        into them before both are swapped in.
+        """
+        while True:
+            snapshot = self.store.snapshot()
+            app_stats = self._build_app_stats(snapshot)
+            history_index = SessionIndex(snapshot)
+            with self._record_lock:
+                _, appended = self.store.changes_since(snapshot.version, self.store.version - snapshot.version)
+                if appended is None:
+                    continue  # Replaced again or too much recorded meanwhile; start over
+                for session in appended:
+                    self._fold_session(app_stats, session)
+                    history_index.add(session)
+                self.app_stats, self.history_index = app_stats, history_index
+                break
+        self._notify("data_changed", {"version": self.data_version})
+    
+    def dashboard_snapshot(self) -> Dict[str, Any]:
+        """Inputs of the dashboard payloads; take it where sessions are recorded, publish it anywhere."""
+        now = datetime.now()
+        return {
+            "sessions": self.history_index.between(*DashboardPublisher.window(now)),
+            "app_stats": self.app_stats,
+            "version": self.data_version,
+            "now": now
+        }
+    
+    def publish_dashboard(self, snapshot: Optional[Dict[str, Any]] = None):
+        """Rewrite the static dashboard payloads from a dashboard_snapshot() (default: one taken now)."""
+        if not self.config.enable_dashboard_snapshots:
+            return
+        try:
+            self.dashboard.publish(**(snapshot or self.dashboard_snapshot()))
+        except OSError as e:
+            self.logger.error(f"❌ Error writing dashboard payloads: {e}", rate_key="dashboard")
+    
+    def changes_since(self, cursor: Optional[str] = None, limit: int = 500) -> Dict[str, Any]:
+        """Sessions recorded and per-app totals changed since a cursor from an earlier call.
+        
+        Without a usable cursor (first call, restarted tracker or replaced
+        data) the response is a reset carrying today's sessions and every
+        app's totals. "more" is set when further changes are pending.
+        """
+        epoch, _, position = (cursor or "").partition(":")
+        position = int(position) if epoch == self.store.epoch and position.isdigit() else -1
+        # Lock-free reads; _record_session updates app_stats before the store
+        snapshot = self.store.snapshot()
+        sessions = snapshot.appended_since(position, limit)
+        app_stats = self.app_stats
+        
+        reset = sessions is None
+        if reset:
+            new_position = snapshot.version
+            today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            sessions = self.history_index.between(today, today + timedelta(days=1))[-limit:]
+            aggregates = {app_name: dict(stats) for app_name, stats in app_stats.items()}
+        else:
+            new_position = position + len(sessions)
+            aggregates = {
+                session.app_name: dict(app_stats[session.app_name])
+                for session in sessions if session.app_name in app_stats
+            }
+        
+        current = self.current_session
+        return {
+            "cursor": f"{self.store.epoch}:{new_position}",
+            "reset": reset,
+            "more": new_position < snapshot.version,
+            "sessions": [self._session_payload(session) for session in sessions],
+            "aggregates": aggregates,
+            "current_session": self._session_payload(current) if current else None
+        }
+    
+    def attach_history(self, history: Dict[str, List[AppSession]]):
+        """Install history loaded after construction, keeping sessions recorded since."""
+        self.store.prepend(history)
+        self.mark_data_changed()
+    
+    def replace_data(self, data: Dict[str, List[AppSession]]):
+        """Swap in a whole new data set (e.g. a cleared or freshly loaded log) and rebuild the aggregates."""
+        self.data = data
+        self.mark_data_changed()
+    
+    def merge_logs(self, paths: List[str], include_current: bool = True) -> Dict[str, int]:
+        """Merge log files and backups into the data; returns the merge statistics.
+        
+        Sessions are deduplicated on session_id and same-app overlaps are
+        trimmed (see LogMerger). Sessions recorded while the merge runs
+        are kept.
+        """
+        from backend.merge import LogMerger
+        
+        base = self.store.snapshot()
+        merger = LogMerger(AppSession.from_dict)
+        merged = merger.merge_to_data(([base] if include_current else []) + list(paths))
+        self.store.rebase(merged, base)
+        self.mark_data_changed()
+        return merger.stats
     
     def _should_track_app(self, app_name: str) -> bool:
         """Check if the application should be tracked."""
-        return app_name.lower() not in [app.lower() for app in self.config.excluded_apps]
+        return app_name.lower() not in self._excluded_apps
+    
+    def _apply_config(self):
+        """Recompile the rules derived from the config; runs between samples."""
+        self._config_version = self.config.version
+        self._excluded_apps = frozenset(app.lower() for app in self.config.excluded_apps)
+        set_app_categories(self.config.app_categories)
+        self.scheduler.reconfigure(self.config)
+        self.idle_monitor.threshold_seconds = self.config.idle_threshold
+        self.logger.logger.setLevel(getattr(logging, str(self.config.log_level).upper(), logging.INFO))
+        self.logger.rate_limiter.rate = self.config.log_rate_limit
     
     def _calculate_productivity_score(self, app_name: str, category: str) -> int:
         """Calculate productivity score for an app session."""
@@ -667,14 +1310,26 @@ class EnhancedAppUsageTracker:
         
         return scores.get(category, 5)
     
-    def _end_current_session(self):
+    def _end_current_session(self, save: bool = True):
         """End the current tracking session."""
+        with self.metrics.timer("end_session"):
+            self._close_session(save)
+    
+    def _close_session(self, save: bool):
+        """Finalize the current session and record it if long enough."""
         if self.current_session:
             self.current_session.end_time = datetime.now()
             self.current_session.duration_seconds = int(
                 (self.current_session.end_time - self.current_session.start_time).total_seconds()
             )
             
+            # Charge any ongoing idle period to this session
+            self.idle_monitor.close_session(self.current_session)
+            self.current_session.idle_time = min(
+                self.current_session.idle_time, self.current_session.duration_seconds
+            )
+            self.current_session.resource_stats = self.resource_sampler.session_summary()
+            
             # Calculate productivity score
             self.current_session.productivity_score = self._calculate_productivity_score(
                 self.current_session.app_name, 
@@ -685,46 +1340,56 @@ class EnhancedAppUsageTracker:
             if self.current_session.duration_seconds >= self.config.min_session_duration:
                 app_name = self.current_session.app_name
                 
-                if app_name not in self.data:
-                    self.data[app_name] = []
+                self._record_session(self.current_session)
+                if save:
+                    self.data_manager.save_data(self.data)
+                    self.publish_dashboard()
                 
-                self.data[app_name].append(self.current_session)
-                self.data_manager.save_data(self.data)
-                
-                self.logger.info(f"✅ {app_name} ({self.current_session.category}) - {self.current_session.duration_seconds}s")
+                self.logger.info(
+                    f"✅ {app_name} ({self.current_session.category}) - {self.current_session.duration_seconds}s",
+                    rate_key="session"
+                )
+                self._notify("session_ended", self._session_payload(self.current_session))
+                self._notify("stats_delta", {
+                    "app_name": app_name,
+                    "version": self.data_version,
+                    **self.app_stats[app_name]
+                })
+            
+            # Closed; samples taken until the next tracked app starts belong to no session
+            self.current_session = None
     
     def _start_new_session(self, app_info: Dict[str, Any]):
         """Start a new tracking session."""
         app_name = app_info["name"]
         if self._should_track_app(app_name):
-            self.current_session = AppSession(
-                app_name=app_name,
-                start_time=datetime.now(),
-                window_title=app_info.get("title", ""),
-                pid=app_info.get("pid", 0),
-                switch_count=app_info.get("switch_count", 0)
-            )
+            with self.metrics.timer("categorization"):
+                self.current_session = AppSession(
+                    app_name=app_name,
+                    start_time=datetime.now(),
+                    window_title=app_info.get("title", ""),
+                    pid=app_info.get("pid", 0),
+                    switch_count=app_info.get("switch_count", 0)
+                )
+            self.idle_monitor.open_session(self.current_session)
+            self.resource_sampler.start_session()
             
-            self.logger.info(f"🟢 Started tracking: {app_name} ({self.current_session.category})")
+            self.logger.info(f"🟢 Started tracking: {app_name} ({self.current_session.category})", rate_key="session")
+            self._notify("session_started", self._session_payload(self.current_session))
     
     def start_tracking(self):
         """Start the application usage tracking."""
         self.is_running = True
         self.logger.info("🔄 Enhanced app usage tracking started...")
         
+        self.start_servers()
+        self.scheduler.reset()
+        
         try:
             while self.is_running:
-                app_info = self.detector.get_active_app_info()
-                
-                if app_info:
-                    current_app = app_info["name"]
-                    
-                    # Check if app changed
-                    if not self.current_session or self.current_session.app_name != current_app:
-                        self._end_current_session()
-                        self._start_new_session(app_info)
-                
-                time.sleep(self.config.check_interval)
+                with self.profiler.iteration():
+                    interval = self.poll_once()
+                time.sleep(interval)
                 
         except KeyboardInterrupt:
             self.logger.info("🛑 Tracking stopped by user")
@@ -733,11 +1398,162 @@ class EnhancedAppUsageTracker:
         finally:
             self.stop_tracking()
     
+    def poll_once(self, save: bool = True) -> float:
+        """Sample the foreground app once and return the interval until the next poll."""
+        # Pick up settings changed in the file or the settings dialog since the last sample
+        self.config.reload_if_changed()
+        if self.config.version != self._config_version:
+            self._apply_config()
+        
+        with self.metrics.timer("detection"):
+            app_info = self.detector.get_active_app_info()
+        self.metrics.inc("samples")
+        switched = False
+        
+        if app_info:
+            current_app = app_info["name"]
+            
+            # Check if app changed; an excluded app ends the open session and is then ignored
+            changed = self.current_session.app_name != current_app if self.current_session \
+                else self._should_track_app(current_app)
+            if changed:
+                self._end_current_session(save=save)
+                self._start_new_session(app_info)
+                self.metrics.inc("switches")
+                switched = True
+            
+            # No CPU reading yet for a process first seen on this poll
+            if (self.config.enable_resource_sampling and self.current_session
+                    and app_info.get("cpu_percent") is not None):
+                self.resource_sampler.record(
+                    current_app, app_info.get("cpu_percent", 0), app_info.get("memory_mb", 0)
+                )
+        
+        is_idle = self.idle_monitor.sample(self.current_session, datetime.now())
+        self.metrics.maybe_dump(self._metrics_path(), self.config.metrics_dump_interval)
+        self._maybe_heartbeat(app_info, is_idle)
+        
+        return self._next_poll_interval(switched, idle=is_idle or app_info is None)
+    
+    def _maybe_heartbeat(self, app_info: Optional[Dict[str, Any]], is_idle: bool):
+        """Publish the current session with its CPU and memory every heartbeat_interval seconds."""
+        now = time.monotonic()
+        if not self.current_session or now - self._last_heartbeat < self.config.heartbeat_interval:
+            return
+        self._last_heartbeat = now
+        
+        session = self.current_session
+        app_info = app_info or {}
+        self._notify("heartbeat", {
+            "app_name": session.app_name,
+            "window_title": app_info.get("title", session.window_title),
+            "category": session.category,
+            "start": session.start_time.strftime("%Y-%m-%d %H:%M:%S"),
+            "elapsed_seconds": int((datetime.now() - session.start_time).total_seconds()),
+            "idle": is_idle,
+            "idle_time": session.idle_time,
+            "cpu_percent": app_info.get("cpu_percent", 0),
+            "memory_mb": app_info.get("memory_mb", 0)
+        })
+    
+    def start_tracking_async(self) -> 'AsyncTrackerRuntime':
+        """Start tracking on an asyncio runtime in a background thread."""
+        self.runtime = AsyncTrackerRuntime(self)
+        self.runtime.start_in_thread()
+        return self.runtime
+    
+    def _next_poll_interval(self, switched: bool, idle: bool = False) -> float:
+        """Get the sleep interval before the next poll."""
+        if not self.config.adaptive_polling:
+            return self.config.check_interval
+        return self.scheduler.record_sample(switched, idle=idle)
+    
+    def get_resource_series(self, app_name: str, resolution: str = "minute") -> List[Dict[str, Any]]:
+        """Get per-minute or per-hour CPU/memory min/avg/max for an app."""
+        return self.resource_sampler.get_series(app_name, resolution)
+    
+    def _metrics_path(self) -> Optional[str]:
+        """Prometheus dump path, placed next to the log file."""
+        if not self.config.metrics_file:
+            return None
+        return str(self.data_manager.log_file.parent / self.config.metrics_file)
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get a snapshot of the tracker's own latency, counters and overhead."""
+        snapshot = self.metrics.snapshot()
+        snapshot["polling"] = self.get_polling_stats()
+        return snapshot
+    
+    def serve_metrics(self, port: Optional[int] = None):
+        """Expose Prometheus metrics on a local HTTP port."""
+        return self.metrics.serve(port or self.config.metrics_port)
+    
+    def serve_queries(self, port: Optional[int] = None):
+        """Expose the JSON query API on a local HTTP port."""
+        if self.query_api is None:
+            from backend.query_api import TrackerQueryAPI
+            
+            self.query_api = TrackerQueryAPI(self)
+        return self.query_api.serve(port or self.config.query_api_port)
+    
+    def start_servers(self):
+        """Start the configured local endpoints and the ingest uploader if not yet running."""
+        if self.config.metrics_port and self.metrics._server is None:
+            self.serve_metrics()
+        if self.config.query_api_port and (self.query_api is None or self.query_api._server is None):
+            try:
+                self.serve_queries()
+            except OSError as e:
+                # Another tracker may hold the port; readers fall back to the saved log
+                self.logger.error(f"❌ Error starting query API on port {self.config.query_api_port}: {e}")
+        if (self.config.event_stream_port or self.config.event_stream_path) and self.event_stream is None:
+            self.serve_events()
+        if self.ingest_client is not None:
+            self.ingest_client.start()
+    
+    def serve_events(self, port: Optional[int] = None, path: Optional[str] = None) -> "EventStreamServer":
+        """Publish tracker events on a local TCP port or Unix socket."""
+        from backend.events import EventStreamServer
+        
+        self.event_stream = EventStreamServer(
+            port=port or self.config.event_stream_port,
+            path=path or self.config.event_stream_path or None,
+            queue_size=self.config.event_queue_size,
+            hello=lambda: {
+                "version": self.data_version,
+                "is_running": self.is_running,
+                "current_session": self._session_payload(self.current_session) if self.current_session else None
+            }
+        )
+        self.event_stream.start()
+        self.add_listener(self.event_stream.publish)
+        return self.event_stream
+    
+    def get_polling_stats(self) -> Dict[str, Any]:
+        """Get effective sample rate and estimated error of the poll scheduler."""
+        return self.scheduler.get_stats()
+    
     def stop_tracking(self):
         """Stop the application usage tracking."""
-        self.is_running = False
-        self._end_current_session()
-        self.logger.info("🔴 Enhanced tracking stopped")
+        if self.runtime is not None:
+            # The runtime ends the session and flushes pending writes itself
+            runtime, self.runtime = self.runtime, None
+            runtime.stop()
+        else:
+            self.is_running = False
+            self._end_current_session()
+            self.logger.info("🔴 Enhanced tracking stopped")
+        
+        # Upload the final sessions without waiting for the next interval
+        if self.ingest_client is not None:
+            self.ingest_client.flush()
+    
+    def close(self):
+        """Stop tracking if it is running and deliver queued uploads; call once before exiting."""
+        if self.is_running or self.runtime is not None:
+            self.stop_tracking()
+        if self.ingest_client is not None:
+            self.ingest_client.close()
     
     def get_analyzer(self) -> EnhancedUsageAnalyzer:
         """Get an enhanced analyzer instance for the current data."""
@@ -747,15 +1563,29 @@ class EnhancedAppUsageTracker:
         """Create a backup of the current data."""
         self.data_manager.backup_data()
     
-    def export_data(self, format_type: str = "json") -> str:
-        """Export data in specified format."""
-        if format_type == "json":
-            return json.dumps(self.data, default=str, indent=2)
-        elif format_type == "csv":
-            # Implementation for CSV export
-            pass
-        else:
-            raise ValueError(f"Unsupported format: {format_type}")
+    def export_data(self, format_type: str = "json", output=None, level: str = "sessions", **filters):
+        """Export data as json, csv or ndjson at session, daily or app level.
+        
+        With an output (a path or writable text stream) the export is
+        streamed in constant memory and the row count is returned;
+        otherwise the export is returned as a string. Filters: start, end,
+        apps, categories.
+        """
+        exporter = SessionExporter(self.data)
+        if output is not None:
+            return exporter.export(output, format_type, level, **filters)
+        
+        buffer = io.StringIO()
+        exporter.export(buffer, format_type, level, **filters)
+        return buffer.getvalue()
+    
+    def export_columnar(self, output_dir: str, format_type: str = "auto", **filters) -> Dict[str, Path]:
+        """Export the session table and daily/hourly rollups for analysis tools.
+        
+        Writes Parquet (or Arrow IPC) when pyarrow is installed and the
+        built-in .tcol format otherwise, with one row group per month.
+        """
+        return export_columnar(self.data, output_dir, format_type, **filters)
 
 # Usage Example
 def main():
@@ -777,6 +1607,8 @@ def main():
         
         # Create backup
         tracker.create_backup()
+        
+        tracker.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,140 @@
+import asyncio
+import json
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.runtime import put_drop_oldest
+
+_STOP = None
+
+
+class EventStreamServer:
+    """Pushes tracker events to local clients as newline-delimited JSON.
+
+    Each line is {"type", "seq", "ts", "data"}; a gap in seq tells a
+    client it fell behind. The server runs its own asyncio loop in a
+    daemon thread: publish() only hands the event over to that loop, so
+    the sampling thread never waits on the network. Every subscriber has
+    a bounded queue that drops its oldest event when full, and each event
+    is serialized once however many clients are connected.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, path: Optional[str] = None,
+                 queue_size: int = 100, hello: Optional[Callable[[], Dict[str, Any]]] = None):
+        self.host = host
+        self.port = port
+        self.path = path
+        self.queue_size = queue_size
+        self.hello = hello
+
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.address = None
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._subscribers: List[asyncio.Queue] = []
+        self._seq = 0
+
+        # Backpressure counters
+        self.published = 0
+        self.dropped = 0
+
+    def start(self):
+        """Start listening in a background thread."""
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._thread_main, name="tracker-events", daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout=5)
+        return self.address
+
+    def _thread_main(self):
+        try:
+            asyncio.run(self._serve())
+        except Exception as e:
+            print(f"Event stream error: {e}")
+        finally:
+            self._ready.set()
+
+    async def _serve(self):
+        self.loop = asyncio.get_running_loop()
+        if self.path and hasattr(socket, "AF_UNIX"):
+            Path(self.path).unlink(missing_ok=True)
+            self._server = await asyncio.start_unix_server(self._handle_client, path=self.path)
+            self.address = self.path
+        else:
+            self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+            self.address = self._server.sockets[0].getsockname()[:2]
+        self._ready.set()
+
+        async with self._server:
+            try:
+                await self._server.serve_forever()
+            except asyncio.CancelledError:
+                pass
+
+        # Wake every client writer so connections close cleanly
+        for queue in list(self._subscribers):
+            put_drop_oldest(queue, _STOP)
+
+    def stop(self, timeout: float = 5):
+        """Close the listener and all client connections."""
+        if self.loop is None or self.loop.is_closed() or self._server is None:
+            return
+        try:
+            self.loop.call_soon_threadsafe(self._server.close)
+        except RuntimeError:
+            pass  # Loop already closed
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def publish(self, event_type: str, payload: Dict[str, Any]):
+        """Queue an event for all subscribers; safe to call from any thread."""
+        if self.loop is None or self.loop.is_closed():
+            return
+        try:
+            self.loop.call_soon_threadsafe(self._fan_out, event_type, payload, time.time())
+        except RuntimeError:
+            pass  # Loop already closed
+
+    def _encode(self, event_type: str, payload: Dict[str, Any], timestamp: float) -> bytes:
+        event = {"type": event_type, "seq": self._seq, "ts": round(timestamp, 3), "data": payload}
+        return (json.dumps(event, default=str) + "\n").encode("utf-8")
+
+    def _fan_out(self, event_type: str, payload: Dict[str, Any], timestamp: float):
+        self._seq += 1
+        line = self._encode(event_type, payload, timestamp)
+        self.published += 1
+        for queue in self._subscribers:
+            put_drop_oldest(queue, line, self._count_drop)
+
+    def _count_drop(self):
+        self.dropped += 1
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.append(queue)
+        try:
+            # The greeting carries the last seq sent so the client can spot gaps
+            if self.hello is not None:
+                writer.write(self._encode("hello", self.hello(), time.time()))
+            while True:
+                line = await queue.get()
+                if line is _STOP:
+                    break
+                writer.write(line)
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._subscribers.remove(queue)
+            writer.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "dropped": self.dropped
+        }
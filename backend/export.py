@@ -0,0 +1,180 @@
+import csv
+import heapq
+import io
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, TextIO, Union
+
+EXPORT_FORMATS = ("csv", "ndjson", "json")
+EXPORT_LEVELS = ("sessions", "daily", "apps")
+
+SESSION_COLUMNS = [
+    "session_id", "app_name", "category", "start", "end", "duration_seconds", "active_seconds",
+    "idle_time", "window_title", "pid", "productivity_score", "switch_count"
+]
+DAILY_COLUMNS = ["date", "app_name", "category", "sessions", "duration_seconds", "active_seconds", "idle_time"]
+APP_COLUMNS = [
+    "app_name", "category", "sessions", "duration_seconds", "active_seconds", "idle_time", "first_used", "last_used"
+]
+
+
+def iter_sessions(data: Mapping[str, Sequence], start: Optional[datetime] = None, end: Optional[datetime] = None,
+                  apps: Optional[Iterable[str]] = None, categories: Optional[Iterable[str]] = None) -> Iterator:
+    """Finished sessions in start-time order, filtered, merged lazily across apps.
+
+    Per-app lists are already time-ordered, so a k-way merge yields the
+    whole history in order while holding one session per app.
+    """
+    app_filter = set(apps) if apps else None
+    category_filter = {category.lower() for category in categories} if categories else None
+
+    streams = []
+    for app_name, sessions in data.items():
+        if app_filter is not None and app_name not in app_filter:
+            continue
+        if not sessions:
+            continue
+        if category_filter is not None and sessions[0].category not in category_filter:
+            continue
+        streams.append(sessions)
+
+    for session in heapq.merge(*streams, key=lambda s: s.start_time):
+        if not session.end_time:
+            continue
+        if start is not None and session.start_time < start:
+            continue
+        if end is not None and session.start_time >= end:
+            continue
+        yield session
+
+
+def _session_row(session) -> Dict[str, Any]:
+    return {
+        "session_id": session.session_id,
+        "app_name": session.app_name,
+        "category": session.category,
+        "start": session.start_time.strftime("%Y-%m-%d %H:%M:%S"),
+        "end": session.end_time.strftime("%Y-%m-%d %H:%M:%S") if session.end_time else None,
+        "duration_seconds": session.duration_seconds,
+        "active_seconds": session.active_seconds,
+        "idle_time": session.idle_time,
+        "window_title": session.window_title,
+        "pid": session.pid,
+        "productivity_score": session.productivity_score,
+        "switch_count": session.switch_count
+    }
+
+
+def _add(totals: Dict[str, Any], session):
+    totals["sessions"] += 1
+    totals["duration_seconds"] += session.duration_seconds
+    totals["active_seconds"] += session.active_seconds
+    totals["idle_time"] += session.idle_time
+
+
+def _daily_rows(sessions: Iterable) -> Iterator[Dict[str, Any]]:
+    """Per-day, per-app totals; sessions arrive in order, so each day is flushed when it ends."""
+    day = None
+    totals: Dict[str, Dict[str, Any]] = {}
+    for session in sessions:
+        session_day = session.start_time.strftime("%Y-%m-%d")
+        if session_day != day:
+            yield from sorted(totals.values(), key=lambda row: row["app_name"])
+            day, totals = session_day, {}
+        row = totals.get(session.app_name)
+        if row is None:
+            row = totals[session.app_name] = {
+                "date": day, "app_name": session.app_name, "category": session.category,
+                "sessions": 0, "duration_seconds": 0, "active_seconds": 0, "idle_time": 0
+            }
+        _add(row, session)
+    yield from sorted(totals.values(), key=lambda row: row["app_name"])
+
+
+def _app_rows(sessions: Iterable) -> Iterator[Dict[str, Any]]:
+    """Per-app totals over the exported range (memory grows with apps, not sessions)."""
+    totals: Dict[str, Dict[str, Any]] = {}
+    for session in sessions:
+        row = totals.get(session.app_name)
+        if row is None:
+            row = totals[session.app_name] = {
+                "app_name": session.app_name, "category": session.category, "sessions": 0,
+                "duration_seconds": 0, "active_seconds": 0, "idle_time": 0,
+                "first_used": session.start_time, "last_used": session.end_time
+            }
+        _add(row, session)
+        row["last_used"] = max(row["last_used"], session.end_time)
+
+    for row in sorted(totals.values(), key=lambda row: row["active_seconds"], reverse=True):
+        row["first_used"] = row["first_used"].strftime("%Y-%m-%d %H:%M:%S")
+        row["last_used"] = row["last_used"].strftime("%Y-%m-%d %H:%M:%S")
+        yield row
+
+
+class SessionExporter:
+    """Streams sessions or aggregates as CSV, NDJSON or a JSON array.
+
+    Rows are produced lazily from the data and written in chunks of
+    `chunk_size` to a path or any writable text stream (a file, or a
+    socket via socket.makefile('w')), so memory stays flat however long
+    the history is.
+    """
+
+    def __init__(self, data: Mapping[str, Sequence], chunk_size: int = 1000):
+        self.data = data
+        self.chunk_size = chunk_size
+
+    def rows(self, level: str = "sessions", **filters) -> Iterator[Dict[str, Any]]:
+        if level not in EXPORT_LEVELS:
+            raise ValueError(f"Unsupported export level: {level}")
+        sessions = iter_sessions(self.data, **filters)
+        if level == "daily":
+            return _daily_rows(sessions)
+        if level == "apps":
+            return _app_rows(sessions)
+        return (_session_row(session) for session in sessions)
+
+    def export(self, output: Union[str, Path, TextIO], format_type: str = "csv", level: str = "sessions",
+               start: Optional[datetime] = None, end: Optional[datetime] = None,
+               apps: Optional[List[str]] = None, categories: Optional[List[str]] = None) -> int:
+        """Write the export and return the number of rows written."""
+        if format_type not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported format: {format_type}")
+        rows = self.rows(level, start=start, end=end, apps=apps, categories=categories)
+        columns = {"sessions": SESSION_COLUMNS, "daily": DAILY_COLUMNS, "apps": APP_COLUMNS}[level]
+
+        if isinstance(output, (str, Path)):
+            with open(output, 'w', encoding='utf-8', newline='') as f:
+                return self._write(f, rows, format_type, columns)
+        return self._write(output, rows, format_type, columns)
+
+    def _write(self, out: TextIO, rows: Iterator[Dict[str, Any]], format_type: str, columns: List[str]) -> int:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=columns, lineterminator="\n") if format_type == "csv" else None
+        count = 0
+
+        if writer is not None:
+            writer.writeheader()
+        elif format_type == "json":
+            buffer.write("[")
+
+        for row in rows:
+            if writer is not None:
+                writer.writerow(row)
+            elif format_type == "json":
+                buffer.write(("," if count else "") + "\n" + json.dumps(row, default=str))
+            else:
+                buffer.write(json.dumps(row, default=str) + "\n")
+            count += 1
+
+            if count % self.chunk_size == 0:
+                out.write(buffer.getvalue())
+                buffer.seek(0)
+                buffer.truncate()
+
+        if format_type == "json":
+            buffer.write("\n]\n")
+        out.write(buffer.getvalue())
+        out.flush()
+        return count
@@ -0,0 +1,135 @@
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+
+class _SortedSessions:
+    """Sessions kept in start-time order, with a parallel list of sort keys.
+
+    One writer may add while others read: `state` is published as a
+    (keys, sessions, length) tuple, and readers look no further than its
+    length. Appends extend both lists before publishing the new length;
+    an out-of-order insert copies them, so lists a reader holds never
+    shift under it.
+    """
+
+    __slots__ = ("state",)
+
+    def __init__(self):
+        self.state: Tuple[List[Tuple[float, str]], List, int] = ([], [], 0)
+
+    def add(self, session):
+        key = (session.start_time.timestamp(), session.session_id)
+        keys, sessions, length = self.state
+        # Sessions almost always arrive in order, so appending is the common case
+        if not length or key >= keys[length - 1]:
+            keys.append(key)
+            sessions.append(session)
+        else:
+            position = bisect_right(keys, key, 0, length)
+            keys = keys[:position] + [key] + keys[position:length]
+            sessions = sessions[:position] + [session] + sessions[position:length]
+        self.state = (keys, sessions, length + 1)
+
+    def __len__(self) -> int:
+        return self.state[2]
+
+
+_EMPTY: Tuple[List, List, int] = ([], [], 0)
+
+
+class SessionIndex:
+    """Time-ordered index over every recorded session.
+
+    Sessions are indexed once, overall and per app and per category, so a
+    page of history (newest first) or the position of a date can be found
+    without flattening or sorting the whole log. Only the requested page is
+    ever materialized.
+
+    The tracking thread adds sessions while the GUI and query API read
+    without locking; the per-app and per-category maps are replaced, not
+    changed, when a new one appears.
+    """
+
+    def __init__(self, data: Optional[Dict[str, List]] = None):
+        self._all = _SortedSessions()
+        self._by_app: Dict[str, _SortedSessions] = {}
+        self._by_category: Dict[str, _SortedSessions] = {}
+        if data:
+            self.rebuild(data)
+
+    def rebuild(self, data: Dict[str, List]):
+        """Re-index from scratch; readers keep seeing the old index until it is done."""
+        index = SessionIndex()
+        sessions = [session for app_sessions in data.values() for session in app_sessions if session.end_time]
+        sessions.sort(key=lambda s: (s.start_time.timestamp(), s.session_id))
+        for session in sessions:
+            index.add(session)
+        self._all, self._by_app, self._by_category = index._all, index._by_app, index._by_category
+
+    def add(self, session):
+        """Index one finished session."""
+        if not session.end_time:
+            return
+        self._all.add(session)
+        self._by_app = self._add_to_group(self._by_app, session.app_name, session)
+        self._by_category = self._add_to_group(self._by_category, session.category, session)
+
+    @staticmethod
+    def _add_to_group(groups: Dict[str, _SortedSessions], name: str, session) -> Dict[str, _SortedSessions]:
+        """Add a session to its group; returns the map, a new one if the group is new."""
+        group = groups.get(name)
+        if group is None:
+            groups = dict(groups)
+            group = groups[name] = _SortedSessions()
+        group.add(session)
+        return groups
+
+    def _view(self, app: Optional[str] = None, category: Optional[str] = None):
+        """The (keys, sessions, length) state of the sessions matching a filter."""
+        if app:
+            view = self._by_app.get(app)
+            if view is None:
+                return _EMPTY
+            keys, sessions, length = view.state
+            # An app's sessions all share its category
+            if category and sessions[0].category != category:
+                return _EMPTY
+            return keys, sessions, length
+        if category:
+            view = self._by_category.get(category)
+            return view.state if view is not None else _EMPTY
+        return self._all.state
+
+    def apps(self) -> List[str]:
+        return sorted(self._by_app)
+
+    def categories(self) -> List[str]:
+        return sorted(self._by_category)
+
+    def count(self, app: Optional[str] = None, category: Optional[str] = None) -> int:
+        """Number of sessions matching the filter."""
+        return self._view(app, category)[2]
+
+    def page(self, offset: int, limit: int, app: Optional[str] = None,
+             category: Optional[str] = None) -> List:
+        """Sessions offset..offset+limit, newest first."""
+        _, sessions, total = self._view(app, category)
+        end = max(total - max(offset, 0), 0)
+        start = max(end - limit, 0)
+        return sessions[start:end][::-1]
+
+    def offset_for(self, date: datetime, app: Optional[str] = None, category: Optional[str] = None) -> int:
+        """Page offset of the newest session starting on or before the given day."""
+        keys, _, total = self._view(app, category)
+        day_start = datetime.combine(date.date() if isinstance(date, datetime) else date, datetime.min.time())
+        cutoff = (day_start + timedelta(days=1)).timestamp()
+        return total - bisect_right(keys, (cutoff, ""), 0, total)
+
+    def between(self, start: datetime, end: datetime, app: Optional[str] = None,
+                category: Optional[str] = None) -> List:
+        """Sessions starting in [start, end), oldest first."""
+        keys, sessions, total = self._view(app, category)
+        low = bisect_right(keys, (start.timestamp(), ""), 0, total)
+        high = bisect_right(keys, (end.timestamp(), ""), 0, total)
+        return sessions[low:high]
@@ -0,0 +1,115 @@
+import ctypes
+import sys
+import time
+from datetime import timedelta
+
+
+class IdleSource:
+    """Base class for user input idle queries."""
+
+    def get_idle_seconds(self) -> float:
+        """Seconds since the last keyboard or mouse input."""
+        return 0.0
+
+
+class WindowsIdleSource(IdleSource):
+    """Input idle time via GetLastInputInfo (a single cheap user32 call)."""
+
+    class _LastInputInfo(ctypes.Structure):
+        _fields_ = [("cbSize", ctypes.c_uint), ("dwTime", ctypes.c_uint)]
+
+    def __init__(self):
+        self._user32 = ctypes.windll.user32
+        self._kernel32 = ctypes.windll.kernel32
+        self._kernel32.GetTickCount.restype = ctypes.c_uint
+        self._info = self._LastInputInfo()
+        self._info.cbSize = ctypes.sizeof(self._LastInputInfo)
+
+    def get_idle_seconds(self) -> float:
+        if not self._user32.GetLastInputInfo(ctypes.byref(self._info)):
+            return 0.0
+        # Both values are 32-bit millisecond tick counts that wrap every ~49 days
+        elapsed_ms = (self._kernel32.GetTickCount() - self._info.dwTime) & 0xFFFFFFFF
+        return elapsed_ms / 1000.0
+
+
+class SyntheticIdleSource(IdleSource):
+    """Scriptable idle source for tests and benchmarks."""
+
+    def __init__(self, idle_seconds: float = 0.0):
+        self._last_input = time.monotonic() - idle_seconds
+
+    def touch(self):
+        """Simulate user input right now."""
+        self._last_input = time.monotonic()
+
+    def set_idle_seconds(self, idle_seconds: float):
+        """Pretend the last input happened idle_seconds ago."""
+        self._last_input = time.monotonic() - idle_seconds
+
+    def get_idle_seconds(self) -> float:
+        return max(time.monotonic() - self._last_input, 0.0)
+
+
+def create_idle_source(enabled: bool = True) -> IdleSource:
+    """Get the idle source for the current platform."""
+    if enabled and sys.platform == "win32":
+        try:
+            return WindowsIdleSource()
+        except (AttributeError, OSError):
+            pass
+    return IdleSource()
+
+
+class IdleMonitor:
+    """Tracks idle periods past a threshold and charges them to the current session."""
+
+    def __init__(self, source: IdleSource, threshold_seconds: float = 300):
+        self.source = source
+        self.threshold_seconds = threshold_seconds
+        self.idle_since = None
+        self.last_idle_seconds = 0.0
+
+    @property
+    def is_idle(self) -> bool:
+        return self.idle_since is not None
+
+    def sample(self, session, now) -> bool:
+        """Query the idle source once and update the session's idle_time.
+
+        Returns True while the user is idle past the threshold.
+        """
+        idle_seconds = self.source.get_idle_seconds()
+        self.last_idle_seconds = idle_seconds
+        last_input = now - timedelta(seconds=idle_seconds)
+
+        if idle_seconds >= self.threshold_seconds:
+            if self.idle_since is None:
+                # The idle period began at the last input, not when we noticed it
+                self.idle_since = last_input
+                if session is not None and self.idle_since < session.start_time:
+                    self.idle_since = session.start_time
+        elif self.idle_since is not None:
+            self._charge(session, self.idle_since, last_input)
+            self.idle_since = None
+
+        return self.is_idle
+
+    def close_session(self, session):
+        """Charge any open idle period to a session that is ending."""
+        if self.idle_since is not None and session is not None and session.end_time:
+            self._charge(session, self.idle_since, session.end_time)
+            self.idle_since = session.end_time
+
+    def open_session(self, session):
+        """Carry an ongoing idle period into a newly started session."""
+        if self.idle_since is not None and session is not None:
+            self.idle_since = session.start_time
+
+    def _charge(self, session, start, end):
+        if session is None or end <= start:
+            return
+        if start < session.start_time:
+            start = session.start_time
+        session.idle_time += int((end - start).total_seconds())
+
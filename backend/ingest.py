@@ -0,0 +1,567 @@
+import argparse
+import gzip
+import json
+import random
+import re
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib import error as urlerror
+from urllib import request as urlrequest
+from urllib.parse import parse_qs, unquote, urlparse
+
+from backend.dashboard import atomic_write
+from backend.query_api import QueryError, parse_date
+
+# Largest upload accepted, after decompression
+MAX_BODY_BYTES = 8 * 1024 * 1024
+
+
+def _shard_name(value: str) -> str:
+    """Filesystem-safe directory name for a user or team."""
+    name = re.sub(r"[^A-Za-z0-9._-]", "_", value.strip())[:64].strip(".")
+    return name or "_"
+
+
+def _new_day(date: str) -> Dict[str, Any]:
+    return {"date": date, "sessions": 0, "active_seconds": 0, "users": set(), "apps": {}}
+
+
+class FleetStore:
+    """Session storage for many trackers, sharded by user and month.
+
+    Uploaded sessions are appended as NDJSON to
+    users/<user>/<YYYY-MM>.ndjson, so uploads from different users never
+    contend and a month can be archived as a unit. Per-team daily rollups
+    (sessions and active time, per app and in total, plus the users seen)
+    are updated as each batch arrives and flushed to
+    teams/<team>/<YYYY-MM>.json. The last `remembered_batches` batch ids
+    of each user are kept in users/<user>/batches.log, so a retried upload
+    is not counted twice, even across a restart. At most `cached_rollups`
+    flushed months stay in memory; older ones are read back from disk.
+    """
+
+    def __init__(self, data_dir: str, remembered_batches: int = 1000, cached_rollups: int = 256):
+        self.data_dir = Path(data_dir)
+        self.remembered_batches = remembered_batches
+        self.cached_rollups = cached_rollups
+
+        self._user_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        # user -> recent batch ids, oldest first; each user's entry is guarded by its user lock
+        self._batches: Dict[str, "OrderedDict[str, None]"] = {}
+        self._batch_log_lines: Dict[str, int] = {}
+
+        # (team, month) -> date -> day rollup, least recently used first
+        self._rollups: "OrderedDict[Tuple[str, str], Dict[str, Dict[str, Any]]]" = OrderedDict()
+        self._dirty: Set[Tuple[str, str]] = set()
+        self._rollup_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+        self.batches = 0
+        self.sessions = 0
+        self.duplicate_batches = 0
+        self.rejected_sessions = 0
+
+    def _user_lock(self, user: str) -> threading.Lock:
+        with self._lock:
+            lock = self._user_locks.get(user)
+            if lock is None:
+                lock = self._user_locks[user] = threading.Lock()
+            return lock
+
+    def ingest(self, user: str, team: str, batch_id: str, sessions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Store one uploaded batch and fold it into the team rollups."""
+        user, team = _shard_name(user), _shard_name(team)
+        # One batch at a time per user, so a concurrent retry of the same batch is a duplicate
+        with self._user_lock(user):
+            seen = self._seen_batches(user)
+            if batch_id in seen:
+                with self._lock:
+                    self.duplicate_batches += 1
+                return {"accepted": 0, "duplicate": True}
+            accepted = self._store(user, team, sessions)
+            self._remember_batch(user, batch_id, seen)
+
+        with self._lock:
+            self.batches += 1
+            self.sessions += len(accepted)
+            self.rejected_sessions += len(sessions) - len(accepted)
+        return {"accepted": len(accepted), "rejected": len(sessions) - len(accepted), "duplicate": False}
+
+    def _store(self, user: str, team: str, sessions: List[Dict[str, Any]]) -> List[Tuple[datetime, int, Dict[str, Any]]]:
+        accepted = []
+        shards: Dict[str, List[str]] = {}
+        for session in sessions:
+            if not isinstance(session.get("app_name"), str):
+                continue
+            try:
+                start = datetime.strptime(session["start"], "%Y-%m-%d %H:%M:%S")
+                active = max(int(session.get("duration_seconds") or 0) - int(session.get("idle_time") or 0), 0)
+            except (KeyError, TypeError, ValueError):
+                continue
+            accepted.append((start, active, session))
+            shards.setdefault(start.strftime("%Y-%m"), []).append(
+                json.dumps(session, separators=(",", ":"), default=str) + "\n"
+            )
+
+        user_dir = self.data_dir / "users" / user
+        user_dir.mkdir(parents=True, exist_ok=True)
+        for month, lines in shards.items():
+            with open(user_dir / f"{month}.ndjson", 'a', encoding='utf-8') as f:
+                f.write("".join(lines))
+
+        self._update_rollups(team, user, accepted)
+        return accepted
+
+    def _seen_batches(self, user: str) -> "OrderedDict[str, None]":
+        """Recent batch ids of a user, read from its batch log on first use; caller holds the user lock."""
+        seen = self._batches.get(user)
+        if seen is None:
+            seen = OrderedDict()
+            path = self.data_dir / "users" / user / "batches.log"
+            lines = 0
+            if path.exists():
+                with open(path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        seen[line.rstrip("\n")] = None
+                        lines += 1
+                while len(seen) > self.remembered_batches:
+                    seen.popitem(last=False)
+            self._batches[user] = seen
+            self._batch_log_lines[user] = lines
+        return seen
+
+    def _remember_batch(self, user: str, batch_id: str, seen: "OrderedDict[str, None]"):
+        """Record a stored batch id; the log is rewritten with the recent ids once it doubles. Caller holds the user lock."""
+        seen[batch_id] = None
+        if len(seen) > self.remembered_batches:
+            seen.popitem(last=False)
+
+        path = self.data_dir / "users" / user / "batches.log"
+        if self._batch_log_lines[user] >= 2 * self.remembered_batches:
+            atomic_write(path, "".join(f"{known}\n" for known in seen).encode("utf-8"))
+            self._batch_log_lines[user] = len(seen)
+        else:
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(f"{batch_id}\n")
+            self._batch_log_lines[user] += 1
+
+    def _update_rollups(self, team: str, user: str, sessions: List[Tuple[datetime, int, Dict[str, Any]]]):
+        with self._rollup_lock:
+            for start, active, session in sessions:
+                month = start.strftime("%Y-%m")
+                days = self._month_rollup(team, month)
+                date = start.strftime("%Y-%m-%d")
+                day = days.get(date)
+                if day is None:
+                    day = days[date] = _new_day(date)
+
+                app = day["apps"].get(session["app_name"])
+                if app is None:
+                    app = day["apps"][session["app_name"]] = {
+                        "category": session.get("category", "unknown"), "sessions": 0, "active_seconds": 0
+                    }
+                app["sessions"] += 1
+                app["active_seconds"] += active
+                day["sessions"] += 1
+                day["active_seconds"] += active
+                day["users"].add(user)
+                self._dirty.add((team, month))
+
+    def _month_rollup(self, team: str, month: str) -> Dict[str, Dict[str, Any]]:
+        """Rollup of one team and month for updating, loaded from disk on first use; caller holds the rollup lock."""
+        key = (team, month)
+        days = self._rollups.get(key)
+        if days is None:
+            days = self._rollups[key] = self._read_month(team, month)
+        else:
+            self._rollups.move_to_end(key)
+        return days
+
+    def _read_month(self, team: str, month: str) -> Dict[str, Dict[str, Any]]:
+        """Rollup of one team and month as flushed to disk (empty if there is none)."""
+        days = {}
+        path = self.data_dir / "teams" / _shard_name(team) / f"{month}.json"
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                for day in json.load(f)["days"]:
+                    day["users"] = set(day["users"])
+                    days[day["date"]] = day
+        return days
+
+    def flush(self):
+        """Write every rollup that changed since the last flush."""
+        with self._flush_lock:
+            with self._rollup_lock:
+                pending = []
+                for team, month in self._dirty:
+                    days = [dict(day, users=sorted(day["users"]))
+                            for _, day in sorted(self._rollups[(team, month)].items())]
+                    body = json.dumps({"team": team, "month": month, "days": days}, separators=(",", ":"))
+                    pending.append((team, month, body.encode("utf-8")))
+                self._dirty.clear()
+
+            for i, (team, month, body) in enumerate(pending):
+                try:
+                    team_dir = self.data_dir / "teams" / _shard_name(team)
+                    team_dir.mkdir(parents=True, exist_ok=True)
+                    atomic_write(team_dir / f"{month}.json", body)
+                except OSError:
+                    # Still only in memory; keep them dirty so they are neither dropped nor forgotten
+                    with self._rollup_lock:
+                        self._dirty.update((team, month) for team, month, _ in pending[i:])
+                    raise
+
+            # Only months whose changes are on disk can be dropped and read back later
+            with self._rollup_lock:
+                excess = len(self._rollups) - self.cached_rollups
+                for key in [key for key in self._rollups if key not in self._dirty][:max(excess, 0)]:
+                    del self._rollups[key]
+
+    def teams(self) -> List[str]:
+        with self._rollup_lock:
+            teams = {team for team, _ in self._rollups}
+        teams_dir = self.data_dir / "teams"
+        if teams_dir.exists():
+            teams.update(path.name for path in teams_dir.iterdir() if path.is_dir())
+        return sorted(teams)
+
+    def team_rollup(self, team: str, start: datetime, end: datetime) -> Dict[str, Any]:
+        """Daily totals and top apps of a team between two dates, inclusive."""
+        team = _shard_name(team)
+        days = []
+        apps: Dict[str, Dict[str, Any]] = {}
+        users: Set[str] = set()
+        with self._rollup_lock:
+            month = start.replace(day=1)
+            while month <= end:
+                # Lookups never add to the cache, so reads cannot grow it or invent teams
+                month_days = self._rollups.get((team, month.strftime("%Y-%m")))
+                if month_days is None:
+                    month_days = self._read_month(team, month.strftime("%Y-%m"))
+                for date in sorted(month_days):
+                    if start.strftime("%Y-%m-%d") <= date <= end.strftime("%Y-%m-%d"):
+                        day = month_days[date]
+                        days.append({"date": date, "sessions": day["sessions"],
+                                     "active_seconds": day["active_seconds"], "users": len(day["users"])})
+                        users.update(day["users"])
+                        for app_name, app in day["apps"].items():
+                            entry = apps.setdefault(app_name, {"app_name": app_name, "category": app["category"],
+                                                               "sessions": 0, "active_seconds": 0})
+                            entry["sessions"] += app["sessions"]
+                            entry["active_seconds"] += app["active_seconds"]
+                month = (month + timedelta(days=32)).replace(day=1)
+
+        return {
+            "team": team,
+            "start": start.strftime("%Y-%m-%d"),
+            "end": end.strftime("%Y-%m-%d"),
+            "users": len(users),
+            "sessions": sum(day["sessions"] for day in days),
+            "active_seconds": sum(day["active_seconds"] for day in days),
+            "days": days,
+            "top_apps": sorted(apps.values(), key=lambda entry: entry["active_seconds"], reverse=True)[:20]
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "sessions": self.sessions,
+            "duplicate_batches": self.duplicate_batches,
+            "rejected_sessions": self.rejected_sessions,
+            "users": len(self._user_locks),
+            "dirty_rollups": len(self._dirty)
+        }
+
+
+class IngestServer:
+    """HTTP front end of a FleetStore.
+
+    Endpoints:
+        POST /ingest                                  - {"user", "team", "batch_id", "sessions": [...]},
+                                                        optionally gzip-encoded
+        GET  /teams                                   - known teams
+        GET  /teams/<team>?start=YYYY-MM-DD[&end=]    - a team's daily rollup and top apps
+        GET  /stats                                   - ingest counters
+    Rollups are flushed to disk every flush_interval seconds.
+    """
+
+    def __init__(self, store: FleetStore, flush_interval: float = 5):
+        self.store = store
+        self.flush_interval = flush_interval
+        self._server = None
+        self._stop = threading.Event()
+
+    def handle_ingest(self, body: bytes, content_encoding: str = "") -> Tuple[int, Dict[str, Any]]:
+        """Answer an upload; returns (status, JSON response)."""
+        try:
+            if content_encoding == "gzip":
+                # Bounded, so a small compressed body cannot expand without limit
+                body = zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(body, MAX_BODY_BYTES + 1)
+            if len(body) > MAX_BODY_BYTES:
+                return 413, {"error": "batch too large"}
+            upload = json.loads(body)
+        except (zlib.error, ValueError):
+            return 400, {"error": "body must be JSON"}
+
+        if not isinstance(upload, dict):
+            return 400, {"error": "body must be a JSON object"}
+        user, batch_id, sessions = upload.get("user"), upload.get("batch_id"), upload.get("sessions")
+        if not isinstance(user, str) or not user:
+            return 400, {"error": "user is required"}
+        if not isinstance(batch_id, str) or not batch_id:
+            return 400, {"error": "batch_id is required"}
+        if len(batch_id) > 128 or not batch_id.isprintable():
+            return 400, {"error": "batch_id must be at most 128 printable characters"}
+        if not isinstance(sessions, list):
+            return 400, {"error": "sessions must be a list"}
+        team = upload.get("team") if isinstance(upload.get("team"), str) and upload.get("team") else "default"
+        return 200, self.store.ingest(user, team, batch_id, [s for s in sessions if isinstance(s, dict)])
+
+    def handle_get(self, path: str) -> Tuple[int, Dict[str, Any]]:
+        parsed = urlparse(path)
+        parts = [unquote(part) for part in parsed.path.strip("/").split("/") if part]
+        params = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+
+        if parts == ["stats"]:
+            return 200, self.store.get_stats()
+        if parts == ["teams"]:
+            return 200, {"teams": self.store.teams()}
+        if len(parts) == 2 and parts[0] == "teams":
+            try:
+                if "start" not in params:
+                    raise QueryError("start is required")
+                start = parse_date(params["start"], "start")
+                end = parse_date(params["end"], "end") if "end" in params else start
+                if end < start:
+                    raise QueryError("end is before start")
+                if (end - start).days > 366:
+                    raise QueryError("range is limited to a year")
+            except QueryError as e:
+                return 400, {"error": str(e)}
+            return 200, self.store.team_rollup(parts[1], start, end)
+        return 404, {"error": "not found"}
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.store.flush()
+            except OSError as e:
+                print(f"Error flushing rollups: {e}")
+
+    def serve(self, port: int, host: str = "127.0.0.1"):
+        """Serve uploads and rollups over HTTP from daemon threads."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        api = self
+
+        class Server(ThreadingHTTPServer):
+            # Room for bursts of connecting clients
+            request_queue_size = 1024
+            daemon_threads = True
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, status: int, payload: Dict[str, Any]):
+                body = json.dumps(payload, default=str).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                self._reply(*api.handle_get(self.path))
+
+            def do_POST(self):
+                if urlparse(self.path).path.rstrip("/") != "/ingest":
+                    self._reply(404, {"error": "not found"})
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                if length > MAX_BODY_BYTES:
+                    self._reply(413, {"error": "batch too large"})
+                    return
+                body = self.rfile.read(length)
+                try:
+                    status, payload = api.handle_ingest(body, self.headers.get("Content-Encoding", ""))
+                except OSError as e:
+                    status, payload = 503, {"error": f"storage unavailable: {e}"}
+                self._reply(status, payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._stop.clear()
+        self._server = Server((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, name="fleet-ingest", daemon=True).start()
+        threading.Thread(target=self._flush_loop, name="fleet-ingest-flush", daemon=True).start()
+        return self._server
+
+    def shutdown(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        self._stop.set()
+        self.store.flush()
+
+
+class IngestClient:
+    """Uploads finished sessions to a fleet ingest service in batches.
+
+    submit() only appends to a bounded buffer (dropping the oldest session
+    when full), so it is safe to call on the tracking thread. A daemon
+    thread uploads a batch whenever batch_size sessions are waiting or
+    flush_interval seconds pass. Each batch is gzip-compressed and keeps
+    its batch id across retries, so the service stores it once; failed
+    uploads back off exponentially with jitter and are retried on the
+    next flush, while batches the service rejects (4xx other than 429)
+    are dropped.
+    """
+
+    def __init__(self, url: str, user: str, team: str = "", batch_size: int = 100, flush_interval: float = 30,
+                 max_pending: int = 10000, max_retries: int = 4, timeout: float = 10):
+        self.url = url.rstrip("/") + "/ingest"
+        self.user = user
+        self.team = team
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.timeout = timeout
+
+        self._pending: deque = deque(maxlen=max_pending)
+        self._retry: Optional[Tuple[str, List[Dict[str, Any]]]] = None
+        self._wake = threading.Event()
+        self._closing = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.sent = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.failures = 0
+
+    def start(self):
+        """Start the upload thread if it is not running."""
+        if self._thread is None or not self._thread.is_alive():
+            self._closing.clear()
+            self._thread = threading.Thread(target=self._run, name="tracker-ingest", daemon=True)
+            self._thread.start()
+
+    def submit(self, session: Dict[str, Any]):
+        """Queue a finished session for upload."""
+        if len(self._pending) == self._pending.maxlen:
+            self.dropped += 1
+        self._pending.append(session)
+        if len(self._pending) >= self.batch_size:
+            self._wake.set()
+
+    def flush(self):
+        """Ask the upload thread to send what is waiting now."""
+        self._wake.set()
+
+    def close(self, timeout: float = 5):
+        """Send what is waiting (one attempt per batch) and stop the thread."""
+        self._closing.set()
+        self._wake.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout)
+        else:
+            while self._send_next():
+                pass
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            closing = self._closing.is_set()
+            while self._send_next():
+                pass
+            if closing:
+                return
+
+    def _next_batch(self) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+        if self._retry is not None:
+            batch, self._retry = self._retry, None
+            return batch
+        sessions = []
+        while self._pending and len(sessions) < self.batch_size:
+            sessions.append(self._pending.popleft())
+        return (uuid.uuid4().hex, sessions) if sessions else None
+
+    def _send_next(self) -> bool:
+        """Upload one batch; False when nothing is left or the service is unreachable."""
+        batch = self._next_batch()
+        if batch is None:
+            return False
+        batch_id, sessions = batch
+        body = gzip.compress(json.dumps({
+            "user": self.user, "team": self.team, "batch_id": batch_id, "sessions": sessions
+        }, default=str).encode("utf-8"))
+
+        attempts = 1 if self._closing.is_set() else self.max_retries
+        for attempt in range(attempts):
+            try:
+                self._post(body)
+                self.sent += len(sessions)
+                return True
+            except urlerror.HTTPError as e:
+                if 400 <= e.code < 500 and e.code != 429:
+                    self.rejected += len(sessions)
+                    return True
+            except (urlerror.URLError, OSError):
+                pass
+            self.failures += 1
+            if attempt + 1 < attempts:
+                delay = min(2 ** attempt, 60) * random.uniform(0.5, 1.5)
+                if self._closing.wait(delay):
+                    break
+
+        self._retry = batch
+        return False
+
+    def _post(self, body: bytes):
+        req = urlrequest.Request(self.url, data=body, method="POST", headers={
+            "Content-Type": "application/json",
+            "Content-Encoding": "gzip"
+        })
+        with urlrequest.urlopen(req, timeout=self.timeout) as response:
+            response.read()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._pending) + (len(self._retry[1]) if self._retry else 0),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+            "failures": self.failures
+        }
+
+
+def main():
+    """Run the fleet ingest service from the command line."""
+    parser = argparse.ArgumentParser(description="Collect sessions from many trackers into sharded storage.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--data-dir", default="fleet_data")
+    parser.add_argument("--flush-interval", type=float, default=5, help="seconds between rollup flushes")
+    args = parser.parse_args()
+
+    server = IngestServer(FleetStore(args.data_dir), flush_interval=args.flush_interval)
+    server.serve(args.port, args.host)
+    print(f"Fleet ingest listening on http://{args.host}:{args.port}, storing in {args.data_dir}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+import argparse
+import asyncio
+import gzip
+import json
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from backend.ingest import FleetStore, IngestServer
+
+# A small app mix with its categories; enough variety for the team rollups
+APPS = [
+    ("code.exe", "development"), ("pycharm64.exe", "development"), ("chrome.exe", "browser"),
+    ("firefox.exe", "browser"), ("teams.exe", "communication"), ("slack.exe", "communication"),
+    ("outlook.exe", "office"), ("excel.exe", "office"), ("spotify.exe", "media"), ("explorer.exe", "system")
+]
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * percent / 100), len(ordered) - 1)]
+
+
+def synthetic_batch(rng: random.Random, start: datetime, size: int) -> List[Dict[str, Any]]:
+    """`size` back-to-back session payloads starting at `start`."""
+    sessions = []
+    current = start
+    for _ in range(size):
+        app_name, category = rng.choice(APPS)
+        duration = max(int(rng.expovariate(1 / 120)), 3)
+        end = current + timedelta(seconds=duration)
+        sessions.append({
+            "app_name": app_name,
+            "session_id": f"{app_name}_{int(current.timestamp())}_{rng.getrandbits(24):06x}",
+            "start": current.strftime("%Y-%m-%d %H:%M:%S"),
+            "end": end.strftime("%Y-%m-%d %H:%M:%S"),
+            "duration_seconds": duration,
+            "category": category,
+            "idle_time": 0,
+            "window_title": "Document - Window"
+        })
+        current = end + timedelta(seconds=rng.randint(0, 5))
+    return sessions
+
+
+class LoadTest:
+    """Simulates many trackers uploading session batches to an ingest service.
+
+    Every client has its own user, belongs to one of `teams` teams and
+    sends `batches` gzip-compressed batches, in IngestClient's format,
+    over fresh HTTP connections with a random think time between them.
+    `concurrency` caps requests in flight so thousands of clients
+    fit within the process's file descriptor limit. A share of the
+    batches is resent to exercise deduplication.
+    """
+
+    def __init__(self, url: str, clients: int = 1000, teams: int = 20, batches: int = 5, batch_size: int = 50,
+                 concurrency: int = 500, think_time: float = 0.5, retry_ratio: float = 0.05, seed: int = 42):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 80
+        self.clients = clients
+        self.teams = teams
+        self.batches = batches
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.think_time = think_time
+        self.retry_ratio = retry_ratio
+        self.seed = seed
+
+        self.latencies: List[float] = []
+        self.statuses: Dict[str, int] = {}
+        self.sessions_sent = 0
+
+    async def _post(self, body: bytes) -> str:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            writer.write(
+                f"POST /ingest HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+                f"Content-Encoding: gzip\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("ascii")
+                + body
+            )
+            await writer.drain()
+            status_line = await reader.readline()
+            await reader.read()
+            return status_line.split()[1].decode("ascii") if status_line else "closed"
+        finally:
+            writer.close()
+
+    async def _client(self, index: int, limit: asyncio.Semaphore):
+        rng = random.Random(self.seed * 100003 + index)
+        user, team = f"user{index:05d}", f"team{index % self.teams:03d}"
+        start = datetime(2024, 1, 1, 9) + timedelta(days=rng.randint(0, 27))
+
+        for _ in range(self.batches):
+            sessions = synthetic_batch(rng, start, self.batch_size)
+            start = datetime.strptime(sessions[-1]["end"], "%Y-%m-%d %H:%M:%S")
+            body = gzip.compress(json.dumps({
+                "user": user, "team": team, "batch_id": uuid.UUID(int=rng.getrandbits(128)).hex, "sessions": sessions
+            }).encode("utf-8"))
+
+            for attempt in range(2 if rng.random() < self.retry_ratio else 1):
+                async with limit:
+                    began = time.perf_counter()
+                    try:
+                        status = await self._post(body)
+                    except (ConnectionError, OSError) as e:
+                        status = type(e).__name__
+                    self.latencies.append(time.perf_counter() - began)
+                self.statuses[status] = self.statuses.get(status, 0) + 1
+                if status == "200" and attempt == 0:
+                    self.sessions_sent += len(sessions)
+
+            await asyncio.sleep(rng.uniform(0, self.think_time * 2))
+
+    async def _run(self):
+        limit = asyncio.Semaphore(self.concurrency)
+        await asyncio.gather(*(self._client(index, limit) for index in range(self.clients)))
+
+    def run(self) -> Dict[str, Any]:
+        began = time.perf_counter()
+        asyncio.run(self._run())
+        elapsed = time.perf_counter() - began
+        requests = len(self.latencies)
+
+        return {
+            "clients": self.clients,
+            "teams": self.teams,
+            "requests": requests,
+            "statuses": self.statuses,
+            "sessions_sent": self.sessions_sent,
+            "elapsed_s": round(elapsed, 3),
+            "requests_per_s": round(requests / elapsed, 1) if elapsed else 0,
+            "sessions_per_s": round(self.sessions_sent / elapsed, 1) if elapsed else 0,
+            "latency_ms": {
+                "mean": round(statistics.mean(self.latencies) * 1000, 2) if self.latencies else 0,
+                "p50": round(_percentile(self.latencies, 50) * 1000, 2),
+                "p95": round(_percentile(self.latencies, 95) * 1000, 2),
+                "p99": round(_percentile(self.latencies, 99) * 1000, 2),
+                "max": round(max(self.latencies, default=0) * 1000, 2)
+            }
+        }
+
+
+def main():
+    """Run the load test against a running service or an in-process one."""
+    parser = argparse.ArgumentParser(description="Load-test the fleet ingest service with simulated trackers.")
+    parser.add_argument("--url", help="service to test (default: start one in-process on a temporary directory)")
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--teams", type=int, default=20)
+    parser.add_argument("--batches", type=int, default=5, help="batches per client")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=500, help="requests in flight at most")
+    parser.add_argument("--think-time", type=float, default=0.5, help="mean seconds between a client's batches")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    server: Optional[IngestServer] = None
+    tmp = None
+    url = args.url
+    if url is None:
+        tmp = tempfile.TemporaryDirectory(prefix="fleet-loadtest-")
+        server = IngestServer(FleetStore(tmp.name))
+        url = "http://127.0.0.1:%d" % server.serve(0).server_address[1]
+
+    try:
+        results = LoadTest(
+            url, clients=args.clients, teams=args.teams, batches=args.batches, batch_size=args.batch_size,
+            concurrency=args.concurrency, think_time=args.think_time, seed=args.seed
+        ).run()
+        if server is not None:
+            results["server"] = server.store.get_stats()
+    finally:
+        if server is not None:
+            server.shutdown()
+            tmp.cleanup()
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import logging
+import os
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, TimedRotatingFileHandler
+from typing import Dict, List, Optional, Tuple
+
+# ASCII stand-ins for the emojis used in tracker messages
+EMOJI_FALLBACKS = {
+    '🔄': '[*]',
+    '🟢': '[+]',
+    '✅': '[OK]',
+    '🛑': '[!]',
+    '🔴': '[-]',
+    '❌': '[ERROR]',
+    '📊': '[REPORT]',
+    '🏆': '[TOP]',
+    '📅': '[TODAY]'
+}
+
+
+def make_ascii_safe(message: str) -> str:
+    """Convert Unicode emojis to ASCII equivalents."""
+    for emoji, ascii_equiv in EMOJI_FALLBACKS.items():
+        message = message.replace(emoji, ascii_equiv)
+    return message
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler for a bounded queue that drops records instead of blocking when it is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class ConsoleHandler(logging.StreamHandler):
+    """Stream handler that falls back to ASCII when the console cannot encode a message."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record)
+        encoding = getattr(self.stream, "encoding", None)
+        if encoding:
+            try:
+                message.encode(encoding)
+            except UnicodeEncodeError:
+                message = make_ascii_safe(message).encode(encoding, "replace").decode(encoding)
+            except LookupError:
+                pass
+        return message
+
+
+class SizedTimedRotatingFileHandler(TimedRotatingFileHandler):
+    """Rotates at time boundaries (`when`) and whenever the file would exceed max_bytes.
+
+    Size rollovers within one period get numbered suffixes so they never
+    overwrite each other; backup_count limits the files kept either way.
+    """
+
+    def __init__(self, filename: str, max_bytes: int = 0, when: str = "midnight", backup_count: int = 0,
+                 encoding: str = "utf-8"):
+        super().__init__(filename, when=when, backupCount=backup_count, encoding=encoding, delay=True)
+        self.max_bytes = max_bytes
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if super().shouldRollover(record):
+            return True
+        if self.max_bytes > 0:
+            if self.stream is None:
+                self.stream = self._open()
+            position = self.stream.seek(0, 2)  # Windows does not position appended files at the end
+            if position and position + len(self.format(record)) + 1 >= self.max_bytes:
+                return True
+        return False
+
+    def rotation_filename(self, default_name: str) -> str:
+        name = super().rotation_filename(default_name)
+        # Number past the highest rollover of the period, even if older ones were deleted
+        directory, base_name = os.path.split(name)
+        numbers = [
+            int(other[len(base_name) + 1:]) for other in os.listdir(directory or ".")
+            if other.startswith(base_name + ".") and other[len(base_name) + 1:].isdigit()
+        ]
+        if numbers:
+            return f"{name}.{max(numbers) + 1}"
+        return f"{name}.1" if os.path.exists(name) else name
+
+    def _rollover_order(self, suffix: str) -> Optional[Tuple[str, int]]:
+        """Sort key of a backup's suffix ("<time>" or "<time>.<n>"), None if it is not a backup.
+
+        Time suffixes are zero-padded, so they sort as text; the rollover
+        number must sort as a number ("x.10" comes after "x.9").
+        """
+        stamp, _, number = suffix.rpartition(".")
+        if not stamp or not number.isdigit():
+            stamp, number = suffix, "0"
+        try:
+            time.strptime(stamp, self.suffix)
+        except ValueError:
+            return None
+        return stamp, int(number)
+
+    def getFilesToDelete(self) -> List[str]:
+        """Backups beyond backup_count, oldest first, in rollover order."""
+        directory, base_name = os.path.split(self.baseFilename)
+        prefix = base_name + "."
+        backups = []
+        for name in os.listdir(directory):
+            if name.startswith(prefix):
+                order = self._rollover_order(name[len(prefix):])
+                if order is not None:
+                    backups.append((order, os.path.join(directory, name)))
+        if len(backups) <= self.backupCount:
+            return []
+        backups.sort()
+        return [path for _, path in backups[:len(backups) - self.backupCount]]
+
+
+class RateLimiter:
+    """Token buckets keyed by message kind: `rate` messages per second with bursts of `burst`.
+
+    allow() returns whether a message may be logged plus how many of its
+    kind were suppressed since the last one that was.
+    """
+
+    def __init__(self, rate: float = 1.0, burst: int = 20):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, key: str) -> Tuple[bool, int]:
+        if self.rate <= 0:
+            return True, 0
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                # tokens, last refill, suppressed
+                bucket = self._buckets[key] = [float(self.burst), now, 0]
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if bucket[0] < 1:
+                bucket[2] += 1
+                return False, 0
+            bucket[0] -= 1
+            suppressed, bucket[2] = bucket[2], 0
+            return True, suppressed
@@ -0,0 +1,199 @@
+import heapq
+import json
+import os
+import pickle
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from datetime import datetime, timedelta
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+
+def iter_log_records(raw_data: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """(app name, session dict) pairs from a parsed v1 or v2 log."""
+    if "applications" in raw_data:  # New format
+        for app_name, app_data in raw_data["applications"].items():
+            for session_data in app_data["sessions"]:
+                yield app_name, session_data
+    else:  # Old format
+        for app_name, sessions in raw_data.items():
+            for session_data in sessions:
+                yield app_name, session_data
+
+
+def _record_key(app_name: str, session_data: Dict[str, Any]) -> Tuple[str, str]:
+    """Merge key of a raw session; "%Y-%m-%d %H:%M:%S" strings sort chronologically."""
+    session_id = session_data.get("session_id")
+    if not session_id:
+        # Same id AppSession derives for sessions logged without one
+        start = datetime.strptime(session_data["start"], "%Y-%m-%d %H:%M:%S")
+        session_id = session_data["session_id"] = f"{app_name}_{int(start.timestamp())}"
+    return session_data["start"], session_id
+
+
+def _spill_log(path: Union[str, Path], spill_dir: str, chunk_size: int) -> str:
+    """Sort one log's sessions into a run file of pickled chunks; returns its path."""
+    with open(path, 'r') as f:
+        raw_data = json.load(f)
+    records = []
+    for app_name, session_data in iter_log_records(raw_data):
+        session_data.pop("metadata", None)  # Derived from the start time on load
+        records.append(_record_key(app_name, session_data) + (app_name, session_data))
+    del raw_data
+    records.sort(key=itemgetter(0, 1))
+
+    fd, run_path = tempfile.mkstemp(suffix=".run", dir=spill_dir)
+    with os.fdopen(fd, 'wb') as f:
+        for offset in range(0, len(records), chunk_size):
+            pickle.dump(records[offset:offset + chunk_size], f, pickle.HIGHEST_PROTOCOL)
+    return run_path
+
+
+def _session_end(session) -> datetime:
+    return session.end_time or session.start_time + timedelta(seconds=session.duration_seconds)
+
+
+class LogMerger:
+    """K-way merge of v1/v2 logs, backups and in-memory data by start time.
+
+    Each log file is parsed once, sorted and spilled to a temporary run
+    file, in parallel worker processes, so only one file per worker is
+    ever held in memory; the runs are then merged lazily holding one
+    chunk per source. Sessions are compared on their raw start and id,
+    and only those that survive become session objects. As they stream
+    past:
+
+    - duplicates share a session_id and start second; the copy with the
+      longest duration is kept, the earliest source's on a tie
+    - a session of the same app that starts before the previous one ended
+      is trimmed to start at that end, or dropped if it lies inside it; a
+      trimmed session gets the id AppSession derives from its new start,
+      so merging the output again with its sources finds it as a duplicate
+    """
+
+    # Sessions per pickled chunk of a run file; bounds what each source holds
+    RUN_CHUNK = 1024
+
+    def __init__(self, session_factory: Callable[[str, Dict[str, Any]], Any], resolve_overlaps: bool = True,
+                 spill_dir: Union[str, Path, None] = None, workers: Optional[int] = None):
+        self.session_factory = session_factory
+        self.resolve_overlaps = resolve_overlaps
+        self.spill_dir = spill_dir
+        # Processes parsing logs at once (default: one per CPU)
+        self.workers = workers
+        self.stats = self._empty_stats()
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, int]:
+        return {"sources": 0, "sessions_read": 0, "duplicates": 0, "trimmed": 0, "dropped": 0, "sessions": 0}
+
+    def _spill(self, paths: List[Union[str, Path]], spill_dir: str) -> List[str]:
+        """Spill every log to a sorted run, parsing several at once when workers allow."""
+        workers = min(self.workers or os.cpu_count() or 1, len(paths))
+        if workers <= 1:
+            return [_spill_log(path, spill_dir, self.RUN_CHUNK) for path in paths]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_spill_log, paths, [spill_dir] * len(paths), [self.RUN_CHUNK] * len(paths)))
+
+    @staticmethod
+    def _read_run(run_path: str, source: int) -> Iterator[Tuple]:
+        """Merge entries (start, id, source, app, raw session) of a run file."""
+        with open(run_path, 'rb') as f:
+            while True:
+                try:
+                    chunk = pickle.load(f)
+                except EOFError:
+                    return
+                for start, session_id, app_name, session_data in chunk:
+                    yield start, session_id, source, app_name, session_data
+
+    @staticmethod
+    def _iter_data(data: Mapping[str, Iterable], source: int) -> Iterator[Tuple]:
+        """Merge entries of in-memory sessions."""
+        streams = [
+            ((session.start_time.strftime("%Y-%m-%d %H:%M:%S"), session.session_id, source, app_name, session)
+             for session in sessions)
+            for app_name, sessions in data.items()
+        ]
+        return heapq.merge(*streams, key=itemgetter(0, 1))
+
+    @staticmethod
+    def _duration(entry: Tuple) -> int:
+        payload = entry[4]
+        return payload.get("duration_seconds", 0) if isinstance(payload, dict) else payload.duration_seconds
+
+    def merge(self, sources: Iterable[Union[str, Path, Mapping[str, Iterable]]]) -> Iterator:
+        """Merged, deduplicated sessions in start-time order.
+
+        A source is a log or backup path, or app -> sessions data such as
+        a store snapshot (each app's sessions already in time order).
+        """
+        self.stats = self._empty_stats()
+        with tempfile.TemporaryDirectory(prefix="tracker-merge-", dir=self.spill_dir) as spill_dir:
+            sources = list(sources)
+            paths = [source for source in sources if not isinstance(source, Mapping)]
+            runs = iter(self._spill(paths, spill_dir))
+            streams = [
+                self._iter_data(source, index) if isinstance(source, Mapping) else self._read_run(next(runs), index)
+                for index, source in enumerate(sources)
+            ]
+            self.stats["sources"] = len(streams)
+
+            # Copies of a session share its (start, id) key, so they arrive back to back
+            pending = None
+            # app -> (end, merge key) of the last session kept
+            last: Dict[str, Tuple[datetime, Tuple[str, str]]] = {}
+            for entry in heapq.merge(*streams, key=itemgetter(0, 1, 2)):
+                self.stats["sessions_read"] += 1
+                if pending is not None and entry[:2] == pending[:2]:
+                    self.stats["duplicates"] += 1
+                    if self._duration(entry) > self._duration(pending):
+                        pending = entry
+                    continue
+                if pending is not None:
+                    yield from self._emit(pending, last)
+                pending = entry
+            if pending is not None:
+                yield from self._emit(pending, last)
+
+    def _emit(self, entry: Tuple, last: Dict[str, Tuple[datetime, Tuple[str, str]]]) -> Iterator:
+        app_name, payload = entry[3], entry[4]
+        if self.resolve_overlaps:
+            previous = last.get(app_name)
+            # A copy of a session that was trimmed into this key earlier on
+            if previous is not None and previous[1] == entry[:2]:
+                self.stats["duplicates"] += 1
+                return
+        session = self.session_factory(app_name, payload) if isinstance(payload, dict) else payload
+        if self.resolve_overlaps:
+            session = self._resolve_overlap(session, last)
+            if session is None:
+                return
+        self.stats["sessions"] += 1
+        yield session
+
+    def _resolve_overlap(self, session, last: Dict[str, Tuple[datetime, Tuple[str, str]]]):
+        """Trim or drop a session overlapping the previous one of its app."""
+        end = _session_end(session)
+        previous = last.get(session.app_name)
+        if previous is not None and session.start_time < previous[0]:
+            previous_end = previous[0]
+            if end <= previous_end:
+                self.stats["dropped"] += 1
+                return None
+            duration = int((end - previous_end).total_seconds())
+            session = replace(session, start_time=previous_end, duration_seconds=duration,
+                              idle_time=min(session.idle_time, duration),
+                              session_id=f"{session.app_name}_{int(previous_end.timestamp())}")
+            self.stats["trimmed"] += 1
+        last[session.app_name] = (end, (session.start_time.strftime("%Y-%m-%d %H:%M:%S"), session.session_id))
+        return session
+
+    def merge_to_data(self, sources: Iterable[Union[str, Path, Mapping[str, Iterable]]]) -> Dict[str, List]:
+        """Merge into app -> sessions lists, each in start-time order."""
+        data: Dict[str, List] = {}
+        for session in self.merge(sources):
+            data.setdefault(session.app_name, []).append(session)
+        return data
@@ -0,0 +1,248 @@
+import os
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+import psutil
+
+
+class LatencyHistogram:
+    """HDR-style log-linear latency histogram with microsecond resolution.
+
+    Each power of two is split into linear sub-buckets, so every recorded
+    value is kept to a few percent relative error using a fixed, small
+    array of counters.
+    """
+
+    def __init__(self, precision: int = 5, max_exponent: int = 40):
+        self.precision = precision
+        self.sub_buckets = 1 << precision
+        self._counts = array('Q', bytes(8 * self.sub_buckets * (max_exponent + 1)))
+        self.count = 0
+        self.total_us = 0
+        self.min_us = 0
+        self.max_us = 0
+
+    def _index(self, value: int) -> int:
+        if value < self.sub_buckets:
+            return value
+        exponent = value.bit_length() - self.precision
+        sub = value >> exponent
+        return min(exponent * self.sub_buckets + sub, len(self._counts) - 1)
+
+    def _value_at(self, index: int) -> int:
+        exponent, sub = divmod(index, self.sub_buckets)
+        if exponent == 0:
+            return sub
+        # Upper edge of the bucket, so percentiles never under-report
+        return ((sub + 1) << exponent) - 1
+
+    def record_us(self, value: int):
+        value = max(int(value), 0)
+        self._counts[self._index(value)] += 1
+        if self.count == 0 or value < self.min_us:
+            self.min_us = value
+        if value > self.max_us:
+            self.max_us = value
+        self.count += 1
+        self.total_us += value
+
+    def percentile(self, p: float) -> int:
+        """Latency in microseconds at percentile p (0-100)."""
+        if not self.count:
+            return 0
+        target = max(int(self.count * p / 100.0 + 0.5), 1)
+        seen = 0
+        for index, bucket_count in enumerate(self._counts):
+            if bucket_count:
+                seen += bucket_count
+                if seen >= target:
+                    return min(self._value_at(index), self.max_us)
+        return self.max_us
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_us / 1000, 3),
+            "min_us": self.min_us,
+            "mean_us": round(self.total_us / self.count, 1) if self.count else 0,
+            "p50_us": self.percentile(50),
+            "p90_us": self.percentile(90),
+            "p99_us": self.percentile(99),
+            "p999_us": self.percentile(99.9),
+            "max_us": self.max_us
+        }
+
+
+class _NullTimer:
+    """Reusable no-op context manager for disabled metrics."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class TrackerMetrics:
+    """Self-instrumentation for the tracker: stage latencies, counters and process overhead."""
+
+    STAGES = ("detection", "categorization", "end_session", "save_data", "save_statistics")
+    QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.started_at = time.time()
+        self.histograms: Dict[str, LatencyHistogram] = {stage: LatencyHistogram() for stage in self.STAGES}
+        self.counters: Dict[str, int] = {
+            "samples": 0,
+            "switches": 0,
+            "saves": 0,
+            "stats_saves": 0,
+            "bytes_written": 0
+        }
+        self._lock = threading.Lock()
+        self._process = None
+        self._last_dump = 0.0
+        self._server = None
+
+    def timer(self, stage: str):
+        """Context manager timing one execution of a stage."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return self._timed(stage)
+
+    @contextmanager
+    def _timed(self, stage: str):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            elapsed_us = (time.perf_counter_ns() - start) // 1000
+            with self._lock:
+                histogram = self.histograms.get(stage)
+                if histogram is None:
+                    histogram = self.histograms[stage] = LatencyHistogram()
+                histogram.record_us(elapsed_us)
+
+    def inc(self, name: str, value: int = 1):
+        if self.enabled:
+            with self._lock:
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    def process_stats(self) -> Dict[str, Any]:
+        """RSS and CPU usage of the tracker process itself."""
+        try:
+            if self._process is None:
+                self._process = psutil.Process()
+                self._process.cpu_percent(None)
+            cpu_times = self._process.cpu_times()
+            return {
+                "rss_bytes": self._process.memory_info().rss,
+                "cpu_percent": self._process.cpu_percent(None),
+                "cpu_seconds": round(cpu_times.user + cpu_times.system, 3)
+            }
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return {"rss_bytes": 0, "cpu_percent": 0.0, "cpu_seconds": 0.0}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Point-in-time copy of all metrics."""
+        with self._lock:
+            stages = {name: histogram.summary() for name, histogram in self.histograms.items()}
+            counters = dict(self.counters)
+        return {
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "counters": counters,
+            "stages": stages,
+            "process": self.process_stats()
+        }
+
+    def to_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        snap = self.snapshot()
+        lines: List[str] = []
+
+        for name, value in snap["counters"].items():
+            metric = f"tracker_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+
+        lines.append("# HELP tracker_stage_latency_seconds Latency of tracker pipeline stages.")
+        lines.append("# TYPE tracker_stage_latency_seconds summary")
+        with self._lock:
+            for stage, histogram in self.histograms.items():
+                for quantile in self.QUANTILES:
+                    value = histogram.percentile(quantile * 100) / 1e6
+                    lines.append(f'tracker_stage_latency_seconds{{stage="{stage}",quantile="{quantile}"}} {value:.6f}')
+                lines.append(f'tracker_stage_latency_seconds_sum{{stage="{stage}"}} {histogram.total_us / 1e6:.6f}')
+                lines.append(f'tracker_stage_latency_seconds_count{{stage="{stage}"}} {histogram.count}')
+
+        process = snap["process"]
+        lines.append("# TYPE tracker_process_resident_memory_bytes gauge")
+        lines.append(f"tracker_process_resident_memory_bytes {process['rss_bytes']}")
+        lines.append("# TYPE tracker_process_cpu_percent gauge")
+        lines.append(f"tracker_process_cpu_percent {process['cpu_percent']}")
+        lines.append("# TYPE tracker_process_cpu_seconds_total counter")
+        lines.append(f"tracker_process_cpu_seconds_total {process['cpu_seconds']}")
+        lines.append("# TYPE tracker_uptime_seconds gauge")
+        lines.append(f"tracker_uptime_seconds {snap['uptime_seconds']}")
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        """Atomically write the Prometheus text dump to a file."""
+        target = Path(path)
+        tmp_path = target.with_name(target.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, target)
+
+    def maybe_dump(self, path: Optional[str], interval: float):
+        """Write the Prometheus dump if at least interval seconds have passed."""
+        if not self.enabled or not path:
+            return
+        now = time.monotonic()
+        if now - self._last_dump >= interval:
+            self._last_dump = now
+            try:
+                self.write_prometheus(path)
+            except OSError:
+                pass
+
+    def serve(self, port: int, host: str = "127.0.0.1"):
+        """Serve /metrics over HTTP on a local port from a daemon thread."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") not in ("", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.to_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="tracker-metrics", daemon=True).start()
+        return self._server
+
+    def shutdown(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
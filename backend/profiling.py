@@ -0,0 +1,230 @@
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+import traceback
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+PROFILING_MODES = ("off", "cprofile", "tracemalloc", "slow_iterations")
+
+
+class _NullIteration:
+    """Shared no-op context manager used when profiling is off."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_ITERATION = _NullIteration()
+
+# Profilers in tracemalloc mode share its global state; the last one to finish stops tracing
+_tracemalloc_users = 0
+_tracemalloc_lock = threading.Lock()
+
+
+def _acquire_tracemalloc():
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+        _tracemalloc_users += 1
+
+
+def _release_tracemalloc() -> Optional[tracemalloc.Snapshot]:
+    """Snapshot of the allocations traced so far (None if tracing was stopped elsewhere)."""
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0 and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        return snapshot
+
+
+class LoopProfiler:
+    """Opt-in profiling of a periodic loop (tracker polls, GUI refreshes).
+
+    Modes:
+        cprofile         - cProfile the loop iterations for `duration` seconds
+        tracemalloc      - report the top allocations after `duration` seconds
+        slow_iterations  - log iterations slower than `slow_threshold_ms`,
+                           with stacks sampled while they were running
+    Reports are written as timestamped text files into `output_dir`.
+    """
+
+    def __init__(self, name: str, mode: str = "off", output_dir: str = ".", duration: float = 60,
+                 slow_threshold_ms: float = 200, top_n: int = 25):
+        if mode not in PROFILING_MODES:
+            raise ValueError(f"Unsupported profiling mode: {mode}")
+
+        self.name = name
+        self.mode = mode
+        self.output_dir = Path(output_dir)
+        self.duration = duration
+        self.slow_threshold = slow_threshold_ms / 1000.0
+        self.top_n = top_n
+        self.reports: List[Path] = []
+
+        self._started_at: Optional[float] = None
+        self._profile: Optional[cProfile.Profile] = None
+        self._iteration_start: Optional[float] = None
+        self._iteration_thread: Optional[int] = None
+        self._sampled_stacks: List[str] = []
+        self._watchdog: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, name: str, config, output_dir: str = ".") -> 'LoopProfiler':
+        """Create a profiler from an AppUsageConfig instance; unknown modes mean "off"."""
+        mode = str(getattr(config, "profiling_mode", "off")).lower()
+        if mode not in PROFILING_MODES:
+            print(f"Unsupported profiling mode {mode!r}, profiling is off")
+            mode = "off"
+        return cls(
+            name,
+            mode=mode,
+            output_dir=output_dir,
+            duration=getattr(config, "profiling_duration", 60),
+            slow_threshold_ms=getattr(config, "slow_iteration_threshold_ms", 200),
+            top_n=getattr(config, "profiling_top_n", 25)
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def iteration(self):
+        """Context manager wrapping one loop iteration."""
+        if self.mode == "off":
+            return _NULL_ITERATION
+        return _ProfiledIteration(self)
+
+    def _begin(self):
+        now = time.monotonic()
+        if self._started_at is None:
+            self._started_at = now
+            if self.mode == "tracemalloc":
+                _acquire_tracemalloc()
+            elif self.mode == "slow_iterations":
+                self._start_watchdog()
+
+        if self.mode == "cprofile":
+            if self._profile is None:
+                self._profile = cProfile.Profile()
+            self._profile.enable()
+        elif self.mode == "slow_iterations":
+            with self._lock:
+                self._sampled_stacks = []
+                self._iteration_thread = threading.get_ident()
+                self._iteration_start = time.perf_counter()
+
+    def _end(self):
+        if self.mode == "cprofile":
+            self._profile.disable()
+        elif self.mode == "slow_iterations":
+            with self._lock:
+                elapsed = time.perf_counter() - self._iteration_start
+                stacks = self._sampled_stacks
+                self._iteration_start = None
+            if elapsed >= self.slow_threshold:
+                self._write_slow_iteration(elapsed, stacks)
+            return
+
+        if time.monotonic() - self._started_at >= self.duration:
+            self._finish()
+
+    def _finish(self):
+        """Write the report for a time-boxed mode and switch profiling off."""
+        if self.mode == "cprofile":
+            stream = io.StringIO()
+            stats = pstats.Stats(self._profile, stream=stream)
+            stats.sort_stats("cumulative").print_stats(self.top_n)
+            self._write_report("cprofile", stream.getvalue())
+            path = self._report_path("cprofile", ".prof")
+            try:
+                self.output_dir.mkdir(parents=True, exist_ok=True)
+                stats.dump_stats(str(path))
+                self.reports.append(path)
+            except OSError as e:
+                print(f"Error writing profile report: {e}")
+            self._profile = None
+        elif self.mode == "tracemalloc":
+            snapshot = _release_tracemalloc()
+            if snapshot is None:
+                lines = [f"tracemalloc was stopped before {self.name} finished profiling"]
+            else:
+                lines = [f"Top {self.top_n} allocations in {self.name} after {self.duration}s:"]
+                for stat in snapshot.statistics("lineno")[:self.top_n]:
+                    lines.append(str(stat))
+            self._write_report("tracemalloc", "\n".join(lines) + "\n")
+
+        self.mode = "off"
+
+    def _start_watchdog(self):
+        self._watchdog = threading.Thread(target=self._watch, name=f"{self.name}-profiler", daemon=True)
+        self._watchdog.start()
+
+    def _watch(self):
+        """Sample the loop thread's stack while an iteration runs past the threshold."""
+        interval = max(self.slow_threshold / 2, 0.01)
+        while self.mode == "slow_iterations":
+            time.sleep(interval)
+            with self._lock:
+                if self._iteration_start is None:
+                    continue
+                if time.perf_counter() - self._iteration_start < self.slow_threshold:
+                    continue
+                frame = sys._current_frames().get(self._iteration_thread)
+                if frame is not None:
+                    self._sampled_stacks.append("".join(traceback.format_stack(frame)))
+
+    def _write_slow_iteration(self, elapsed: float, stacks: List[str]):
+        path = self.output_dir / f"{self.name}_slow_iterations.log"
+        header = f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {self.name} iteration took {elapsed * 1000:.1f} ms\n"
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(header)
+                for i, stack in enumerate(stacks, 1):
+                    f.write(f"  sample {i}:\n{stack}\n")
+            if path not in self.reports:
+                self.reports.append(path)
+        except OSError as e:
+            print(f"Error writing profile report: {e}")
+
+    def _report_path(self, kind: str, suffix: str = ".txt") -> Path:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return self.output_dir / f"{self.name}_{kind}_{timestamp}{suffix}"
+
+    def _write_report(self, kind: str, text: str):
+        path = self._report_path(kind)
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            self.reports.append(path)
+        except OSError as e:
+            print(f"Error writing profile report: {e}")
+
+
+class _ProfiledIteration:
+    __slots__ = ("profiler",)
+
+    def __init__(self, profiler: LoopProfiler):
+        self.profiler = profiler
+
+    def __enter__(self):
+        self.profiler._begin()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler._end()
+        return False
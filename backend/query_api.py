@@ -0,0 +1,233 @@
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+class QueryError(ValueError):
+    """A malformed query; reported to the client as 400 Bad Request."""
+
+
+def parse_date(value: str, name: str) -> datetime:
+    """Parse a YYYY-MM-DD query parameter, raising QueryError naming it otherwise."""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise QueryError(f"{name} must be YYYY-MM-DD")
+
+
+def _parse_int(params: Dict[str, str], name: str, default: int, minimum: int = 0, maximum: int = 1000) -> int:
+    try:
+        value = int(params.get(name, default))
+    except ValueError:
+        raise QueryError(f"{name} must be an integer")
+    return max(minimum, min(value, maximum))
+
+
+def _totals(sessions) -> Dict[str, Dict[str, Any]]:
+    """Per-app active time and session count for a list of sessions."""
+    totals: Dict[str, Dict[str, Any]] = {}
+    for session in sessions:
+        entry = totals.get(session.app_name)
+        if entry is None:
+            entry = totals[session.app_name] = {"category": session.category, "total_time": 0, "sessions": 0}
+        entry["total_time"] += session.active_seconds
+        entry["sessions"] += 1
+    return totals
+
+
+def _top(totals: Dict[str, Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
+    ranked = sorted(totals.items(), key=lambda item: item[1]["total_time"], reverse=True)[:limit]
+    return [{"app_name": app_name, **entry} for app_name, entry in ranked]
+
+
+class TrackerQueryAPI:
+    """Read-only JSON queries answered from the tracker's in-memory aggregates.
+
+    Endpoints:
+        /summary                                   - totals, today and the current session
+        /range?start=YYYY-MM-DD&end=YYYY-MM-DD     - per-app totals for a date range
+        /top-apps?limit=10[&days=7]                - top apps, all time or recent days
+        /sessions?offset=0&limit=50[&app=][&category=][&date=YYYY-MM-DD]
+                                                   - one page of history, newest first
+        /changes?cursor=<cursor>                   - sessions and app totals changed since
+                                                     the cursor returned by the previous call
+    Every response carries the store epoch and data version as its ETag,
+    and rendered bodies are cached per query until the version changes.
+    """
+
+    CACHE_SIZE = 256
+
+    def __init__(self, tracker):
+        self.tracker = tracker
+        self.routes: Dict[str, Callable[[Dict[str, str]], Dict[str, Any]]] = {
+            "/summary": self.summary,
+            "/range": self.range,
+            "/top-apps": self.top_apps,
+            "/sessions": self.sessions,
+            "/changes": self.changes
+        }
+        self._cache: "OrderedDict[str, Tuple[int, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def version(self) -> int:
+        return self.tracker.data_version
+
+    def etag(self, version: int) -> str:
+        """ETag of a data version; carries the store epoch so a restarted tracker never matches an old one."""
+        return f'"{self.tracker.store.epoch}:{version}"'
+
+    @staticmethod
+    def is_cacheable(path: str) -> bool:
+        """Whether the response depends on the data version alone.
+
+        The summary and changes also report the current session, which
+        changes without a new data version.
+        """
+        return (urlparse(path).path.rstrip("/") or "/summary") not in ("/summary", "/changes")
+
+    def handle(self, path: str) -> Tuple[int, int, bytes]:
+        """Answer a request path; returns (status, version, JSON body)."""
+        parsed = urlparse(path)
+        route = self.routes.get(parsed.path.rstrip("/") or "/summary")
+        if route is None:
+            return 404, self.version, b'{"error": "not found"}'
+
+        version = self.version
+        cacheable = self.is_cacheable(path)
+        with self._lock:
+            cached = self._cache.get(path)
+            if cached is not None and cached[0] == version:
+                self._cache.move_to_end(path)
+                return 200, version, cached[1]
+
+        params = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        try:
+            result = route(params)
+        except QueryError as e:
+            return 400, version, json.dumps({"error": str(e)}).encode("utf-8")
+
+        result["version"] = version
+        body = json.dumps(result, default=str).encode("utf-8")
+        if cacheable:
+            with self._lock:
+                self._cache[path] = (version, body)
+                if len(self._cache) > self.CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        return 200, version, body
+
+    def summary(self, params: Dict[str, str]) -> Dict[str, Any]:
+        app_stats = dict(self.tracker.app_stats)
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        today_totals = _totals(self.tracker.history_index.between(today, today + timedelta(days=1)))
+        current = self.tracker.current_session
+
+        return {
+            "is_running": self.tracker.is_running,
+            "current_session": {"app_name": current.app_name, **current.to_dict()} if current else None,
+            "total_time": sum(stats["total_time"] for stats in app_stats.values()),
+            "total_sessions": sum(stats["session_count"] for stats in app_stats.values()),
+            "total_apps": len(app_stats),
+            "today": {
+                "total_time": sum(entry["total_time"] for entry in today_totals.values()),
+                "sessions": sum(entry["sessions"] for entry in today_totals.values()),
+                "top_apps": _top(today_totals, 5)
+            }
+        }
+
+    def range(self, params: Dict[str, str]) -> Dict[str, Any]:
+        if "start" not in params:
+            raise QueryError("start is required")
+        start = parse_date(params["start"], "start")
+        end = parse_date(params["end"], "end") if "end" in params else start
+        if end < start:
+            raise QueryError("end is before start")
+
+        sessions = self.tracker.history_index.between(
+            start, end + timedelta(days=1), params.get("app"), params.get("category")
+        )
+        totals = _totals(sessions)
+        return {
+            "start": start.strftime("%Y-%m-%d"),
+            "end": end.strftime("%Y-%m-%d"),
+            "total_time": sum(entry["total_time"] for entry in totals.values()),
+            "sessions": len(sessions),
+            "apps": _top(totals, len(totals))
+        }
+
+    def top_apps(self, params: Dict[str, str]) -> Dict[str, Any]:
+        limit = _parse_int(params, "limit", 10, minimum=1)
+        if "days" in params:
+            days = _parse_int(params, "days", 7, minimum=1, maximum=3660)
+            since = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=days - 1)
+            totals = _totals(self.tracker.history_index.between(since, datetime.now() + timedelta(days=1)))
+        else:
+            totals = {
+                app_name: {"category": stats["category"], "total_time": stats["total_time"],
+                           "sessions": stats["session_count"]}
+                for app_name, stats in dict(self.tracker.app_stats).items()
+            }
+        return {"apps": _top(totals, limit)}
+
+    def sessions(self, params: Dict[str, str]) -> Dict[str, Any]:
+        index = self.tracker.history_index
+        app, category = params.get("app"), params.get("category")
+        limit = _parse_int(params, "limit", 50, minimum=1)
+        if "date" in params:
+            offset = index.offset_for(parse_date(params["date"], "date"), app, category)
+        else:
+            offset = _parse_int(params, "offset", 0, maximum=10 ** 9)
+
+        page = index.page(offset, limit, app, category)
+        return {
+            "offset": offset,
+            "total": index.count(app, category),
+            "sessions": [{"app_name": session.app_name, **session.to_dict()} for session in page]
+        }
+
+    def changes(self, params: Dict[str, str]) -> Dict[str, Any]:
+        return self.tracker.changes_since(params.get("cursor"), _parse_int(params, "limit", 500, minimum=1))
+
+    def serve(self, port: int, host: str = "127.0.0.1"):
+        """Serve the queries over HTTP on a local port from a daemon thread."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                # Answer revalidation without rendering anything
+                etag = api.etag(api.version)
+                if api.is_cacheable(self.path) and self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+
+                status, version, body = api.handle(self.path)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", api.etag(version))
+                self.send_header("X-Tracker-Version", str(version))
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="tracker-query-api", daemon=True).start()
+        return self._server
+
+    def shutdown(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,206 @@
+import time
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any
+
+
+class RingBuffer:
+    """Fixed-capacity ring buffer of floats backed by array.array."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._data = array('d', bytes(8 * capacity))
+        self._head = 0
+        self._count = 0
+
+    def append(self, value: float):
+        self._data[self._head] = value
+        self._head = (self._head + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def values(self) -> List[float]:
+        """Values in insertion order, oldest first."""
+        if self._count < self.capacity:
+            return self._data[:self._count].tolist()
+        return (self._data[self._head:] + self._data[:self._head]).tolist()
+
+    def last(self) -> Optional[float]:
+        if not self._count:
+            return None
+        return self._data[(self._head - 1) % self.capacity]
+
+    def __len__(self) -> int:
+        return self._count
+
+
+class _Accumulator:
+    """Running min/sum/max over a stream of samples."""
+
+    __slots__ = ("count", "minimum", "total", "maximum")
+
+    def __init__(self):
+        self.count = 0
+        self.minimum = 0.0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def add(self, value: float):
+        if self.count == 0 or value < self.minimum:
+            self.minimum = value
+        if self.count == 0 or value > self.maximum:
+            self.maximum = value
+        self.total += value
+        self.count += 1
+
+    @property
+    def average(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class ResourceRollup:
+    """Min/avg/max of CPU and RSS downsampled into fixed-width time buckets."""
+
+    FIELDS = ("cpu_min", "cpu_avg", "cpu_max", "memory_min", "memory_avg", "memory_max")
+
+    def __init__(self, bucket_seconds: int, capacity: int):
+        self.bucket_seconds = bucket_seconds
+        self.timestamps = RingBuffer(capacity)
+        self.series = {name: RingBuffer(capacity) for name in self.FIELDS}
+        self._bucket_start = None
+        self._cpu = _Accumulator()
+        self._memory = _Accumulator()
+
+    def add(self, timestamp: float, cpu_percent: float, memory_mb: float):
+        bucket_start = timestamp - (timestamp % self.bucket_seconds)
+        if self._bucket_start is not None and bucket_start != self._bucket_start:
+            self.flush()
+        self._bucket_start = bucket_start
+        self._cpu.add(cpu_percent)
+        self._memory.add(memory_mb)
+
+    def flush(self):
+        """Close the open bucket and push it into the ring buffers."""
+        if self._bucket_start is None or not self._cpu.count:
+            return
+        self.timestamps.append(self._bucket_start)
+        self.series["cpu_min"].append(self._cpu.minimum)
+        self.series["cpu_avg"].append(self._cpu.average)
+        self.series["cpu_max"].append(self._cpu.maximum)
+        self.series["memory_min"].append(self._memory.minimum)
+        self.series["memory_avg"].append(self._memory.average)
+        self.series["memory_max"].append(self._memory.maximum)
+        self._cpu = _Accumulator()
+        self._memory = _Accumulator()
+
+    def to_rows(self, include_open: bool = True) -> List[Dict[str, Any]]:
+        """Buckets as a list of dicts, oldest first.
+
+        The bucket still being filled comes last, flagged "partial", unless
+        include_open is False.
+        """
+        columns = {name: buffer.values() for name, buffer in self.series.items()}
+        rows = []
+        for i, timestamp in enumerate(self.timestamps.values()):
+            row = {"timestamp": timestamp}
+            for name in self.FIELDS:
+                row[name] = round(columns[name][i], 2)
+            rows.append(row)
+        if include_open and self._bucket_start is not None and self._cpu.count:
+            values = (self._cpu.minimum, self._cpu.average, self._cpu.maximum,
+                      self._memory.minimum, self._memory.average, self._memory.maximum)
+            row = {"timestamp": self._bucket_start, "partial": True}
+            for name, value in zip(self.FIELDS, values):
+                row[name] = round(value, 2)
+            rows.append(row)
+        return rows
+
+
+class AppResourceSeries:
+    """Raw and downsampled CPU/RSS history for one application."""
+
+    def __init__(self, raw_capacity: int, minute_capacity: int, hour_capacity: int):
+        self.raw_timestamps = RingBuffer(raw_capacity)
+        self.raw_cpu = RingBuffer(raw_capacity)
+        self.raw_memory = RingBuffer(raw_capacity)
+        self.per_minute = ResourceRollup(60, minute_capacity)
+        self.per_hour = ResourceRollup(3600, hour_capacity)
+
+    def add(self, timestamp: float, cpu_percent: float, memory_mb: float):
+        self.raw_timestamps.append(timestamp)
+        self.raw_cpu.append(cpu_percent)
+        self.raw_memory.append(memory_mb)
+        self.per_minute.add(timestamp, cpu_percent, memory_mb)
+        self.per_hour.add(timestamp, cpu_percent, memory_mb)
+
+
+class ResourceSampler:
+    """Records per-app CPU and memory samples at a bounded memory cost."""
+
+    def __init__(self, raw_capacity: int = 720, minute_capacity: int = 1440,
+                 hour_capacity: int = 720, max_apps: int = 64):
+        self.raw_capacity = raw_capacity
+        self.minute_capacity = minute_capacity
+        self.hour_capacity = hour_capacity
+        self.max_apps = max_apps
+        self._apps: "OrderedDict[str, AppResourceSeries]" = OrderedDict()
+        self._session_cpu = _Accumulator()
+        self._session_memory = _Accumulator()
+
+    def record(self, app_name: str, cpu_percent: float, memory_mb: float, timestamp: Optional[float] = None):
+        """Record one foreground sample for an app and the current session."""
+        if timestamp is None:
+            timestamp = time.time()
+
+        series = self._apps.get(app_name)
+        if series is None:
+            series = AppResourceSeries(self.raw_capacity, self.minute_capacity, self.hour_capacity)
+            self._apps[app_name] = series
+            # Forget the least recently seen app once over the limit
+            if len(self._apps) > self.max_apps:
+                self._apps.popitem(last=False)
+        else:
+            self._apps.move_to_end(app_name)
+
+        series.add(timestamp, cpu_percent or 0.0, memory_mb or 0.0)
+        self._session_cpu.add(cpu_percent or 0.0)
+        self._session_memory.add(memory_mb or 0.0)
+
+    def start_session(self):
+        """Reset the per-session accumulators."""
+        self._session_cpu = _Accumulator()
+        self._session_memory = _Accumulator()
+
+    def session_summary(self) -> Dict[str, Any]:
+        """Summary stats for the samples recorded since start_session()."""
+        if not self._session_cpu.count:
+            return {}
+        return {
+            "samples": self._session_cpu.count,
+            "cpu_avg": round(self._session_cpu.average, 2),
+            "cpu_max": round(self._session_cpu.maximum, 2),
+            "memory_avg_mb": round(self._session_memory.average, 2),
+            "memory_max_mb": round(self._session_memory.maximum, 2)
+        }
+
+    def get_series(self, app_name: str, resolution: str = "minute") -> List[Dict[str, Any]]:
+        """Get downsampled min/avg/max rows for an app ('minute' or 'hour'), the open bucket last."""
+        series = self._apps.get(app_name)
+        if series is None:
+            return []
+        rollup = series.per_minute if resolution == "minute" else series.per_hour
+        return rollup.to_rows()
+
+    def get_raw_series(self, app_name: str) -> Dict[str, List[float]]:
+        """Get the most recent raw samples for an app."""
+        series = self._apps.get(app_name)
+        if series is None:
+            return {"timestamps": [], "cpu_percent": [], "memory_mb": []}
+        return {
+            "timestamps": series.raw_timestamps.values(),
+            "cpu_percent": series.raw_cpu.values(),
+            "memory_mb": series.raw_memory.values()
+        }
+
+    def tracked_apps(self) -> List[str]:
+        return list(self._apps.keys())
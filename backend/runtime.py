@@ -0,0 +1,245 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+# Queue sentinels
+_SAVE = "save"
+_STOP = "stop"
+
+
+class AsyncTrackerRuntime:
+    """Runs sampling, persistence, stats and notifications as cooperating asyncio tasks.
+
+    Sampling never waits on disk or subscribers: save requests are
+    coalesced into a single pending slot, file I/O runs on a dedicated
+    writer thread, and events are fanned out to bounded per-subscriber
+    queues that drop their oldest entry when full.
+    """
+
+    def __init__(self, tracker, event_queue_size: int = 1000, subscriber_queue_size: int = 100):
+        self.tracker = tracker
+        self.event_queue_size = event_queue_size
+        self.subscriber_queue_size = subscriber_queue_size
+        self.on_error: Optional[Callable[[Exception], None]] = None
+
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._stopping: Optional[asyncio.Event] = None
+        self._save_queue: Optional[asyncio.Queue] = None
+        self._stats_queue: Optional[asyncio.Queue] = None
+        self._event_queue: Optional[asyncio.Queue] = None
+        self._subscribers: List[asyncio.Queue] = []
+        self._io_executor: Optional[ThreadPoolExecutor] = None
+
+        # Backpressure counters
+        self.coalesced_saves = 0
+        self.dropped_events = 0
+        self.saves_completed = 0
+
+    async def run(self):
+        """Run the tracker until stop() is called."""
+        self.loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._stopping = asyncio.Event()
+        self._save_queue = asyncio.Queue(maxsize=1)
+        self._stats_queue = asyncio.Queue(maxsize=1)
+        self._event_queue = asyncio.Queue(maxsize=self.event_queue_size)
+        self._io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tracker-writer")
+
+        self.tracker.add_listener(self._on_tracker_event)
+        self.tracker.is_running = True
+        self.tracker.start_servers()
+        self.tracker.scheduler.reset()
+        self.tracker.logger.info("🔄 Enhanced app usage tracking started (async runtime)...")
+
+        sampler = asyncio.create_task(self._sampler())
+        writer = asyncio.create_task(self._writer())
+        stats_writer = asyncio.create_task(self._stats_writer())
+        notifier = asyncio.create_task(self._notifier())
+        self._ready.set()
+
+        try:
+            await self._stopping.wait()
+        finally:
+            sampler.cancel()
+            await asyncio.gather(sampler, return_exceptions=True)
+
+            # Close the open session, then drain the writers and notifier
+            self.tracker.is_running = False
+            self.tracker._end_current_session(save=False)
+            await self._save_queue.put(_STOP)
+            await asyncio.gather(writer, stats_writer, return_exceptions=True)
+            await self._event_queue.put((_STOP, None))
+            await asyncio.gather(notifier, return_exceptions=True)
+
+            self.tracker.remove_listener(self._on_tracker_event)
+            self._io_executor.shutdown(wait=True)
+            self.tracker.logger.info("🔴 Enhanced tracking stopped")
+
+    def start_in_thread(self):
+        """Run the event loop in a background thread."""
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._thread_main, name="tracker-runtime", daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout=5)
+
+    def _thread_main(self):
+        try:
+            asyncio.run(self.run())
+        except Exception as e:
+            self._report_error(e)
+        finally:
+            self._ready.set()
+
+    def request_stop(self):
+        """Ask the runtime to stop; safe to call from any thread."""
+        if self.loop is None or self._stopping is None or self.loop.is_closed():
+            return
+        try:
+            self.loop.call_soon_threadsafe(self._stopping.set)
+        except RuntimeError:
+            pass  # Loop already closed
+
+    def stop(self, timeout: float = 10):
+        """Stop the runtime and wait for pending writes to finish."""
+        self.request_stop()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def subscribe(self, maxsize: Optional[int] = None) -> asyncio.Queue:
+        """Get a bounded queue of (event_type, payload) tuples; call from the loop."""
+        queue = asyncio.Queue(maxsize=maxsize or self.subscriber_queue_size)
+        self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "saves_completed": self.saves_completed,
+            "coalesced_saves": self.coalesced_saves,
+            "dropped_events": self.dropped_events,
+            "subscribers": len(self._subscribers)
+        }
+
+    def _on_tracker_event(self, event_type: str, payload: Dict[str, Any]):
+        """Tracker listener; events raised on other threads (history loads, merges) are handed to the loop."""
+        if self._loop_thread == threading.get_ident():
+            self._handle_event(event_type, payload)
+            return
+        if self.loop is None or self.loop.is_closed():
+            return
+        try:
+            self.loop.call_soon_threadsafe(self._handle_event, event_type, payload)
+        except RuntimeError:
+            pass  # Loop already closed
+
+    def _handle_event(self, event_type: str, payload: Dict[str, Any]):
+        """Queue a tracker event; runs on the loop thread."""
+        if event_type == "session_ended":
+            self._request_save()
+        put_drop_oldest(self._event_queue, (event_type, payload), self._count_drop)
+
+    def _request_save(self):
+        # A pending save will include everything in memory, so extra requests coalesce
+        if self._save_queue.full():
+            self.coalesced_saves += 1
+        else:
+            self._save_queue.put_nowait(_SAVE)
+
+    def _count_drop(self):
+        self.dropped_events += 1
+
+    def _report_error(self, error: Exception):
+        self.tracker.logger.error(f"❌ Tracking error: {error}")
+        if self.on_error:
+            self.on_error(error)
+
+    async def _sampler(self):
+        """Poll the foreground app on the scheduler's interval."""
+        try:
+            while not self._stopping.is_set():
+                with self.tracker.profiler.iteration():
+                    interval = self.tracker.poll_once(save=False)
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=interval)
+                except asyncio.TimeoutError:
+                    pass
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._report_error(e)
+            self._stopping.set()
+
+    async def _writer(self):
+        """Persist the log whenever a save is requested."""
+        while True:
+            request = await self._save_queue.get()
+            try:
+                # Immutable snapshot, so later appends never reach this write
+                snapshot = self.tracker.store.snapshot()
+                enhanced_data = await self.loop.run_in_executor(self._io_executor, self._write_log, snapshot)
+                self.saves_completed += 1
+                _replace_pending(self._stats_queue, enhanced_data)
+            except Exception as e:
+                self.tracker.logger.error(f"❌ Error saving data: {e}")
+            if request == _STOP:
+                await self._stats_queue.put(_STOP)
+                return
+
+    def _write_log(self, snapshot: Mapping[str, Sequence[Any]]) -> Dict[str, Any]:
+        enhanced_data = self.tracker.data_manager.build_enhanced_data(snapshot)
+        self.tracker.data_manager.write_log(enhanced_data)
+        return enhanced_data
+
+    async def _stats_writer(self):
+        """Materialize the stats file from the latest written log."""
+        while True:
+            enhanced_data = await self._stats_queue.get()
+            if enhanced_data == _STOP:
+                return
+            try:
+                await self.loop.run_in_executor(
+                    self._io_executor, self.tracker.data_manager._save_statistics, enhanced_data
+                )
+                # Captured here, where sessions are recorded, so the writer thread sees a fixed state
+                dashboard = self.tracker.dashboard_snapshot()
+                await self.loop.run_in_executor(self._io_executor, self.tracker.publish_dashboard, dashboard)
+            except Exception as e:
+                self.tracker.logger.error(f"❌ Error saving statistics: {e}")
+
+    async def _notifier(self):
+        """Fan tracker events out to subscriber queues without waiting on them."""
+        while True:
+            event = await self._event_queue.get()
+            for queue in list(self._subscribers):
+                put_drop_oldest(queue, event, self._count_drop)
+            if event[0] == _STOP:
+                return
+
+
+def put_drop_oldest(queue: asyncio.Queue, item, on_drop: Optional[Callable[[], None]] = None):
+    """Put without blocking, discarding the oldest entry if the queue is full."""
+    if queue.full():
+        try:
+            queue.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+        if on_drop:
+            on_drop()
+    queue.put_nowait(item)
+
+
+def _replace_pending(queue: asyncio.Queue, item):
+    """Put into a single-slot queue, replacing any item not yet consumed."""
+    if queue.full():
+        try:
+            queue.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+    queue.put_nowait(item)
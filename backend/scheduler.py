@@ -0,0 +1,97 @@
+import time
+from collections import deque
+from typing import Dict, Any, Optional
+
+
+class AdaptivePollingScheduler:
+    """Adaptive poll interval driven by recent app switches and idleness."""
+
+    def __init__(self, base_interval: float = 5, min_interval: float = 1, max_interval: float = 30,
+                 backoff_factor: float = 1.5, switch_window: float = 60):
+        self.base_interval = float(base_interval)
+        self.min_interval = float(min(min_interval, base_interval))
+        self.max_interval = float(max(max_interval, base_interval))
+        self.backoff_factor = max(float(backoff_factor), 1.0)
+        self.switch_window = float(switch_window)
+
+        self.interval = self.base_interval
+        self._recent_switches = deque()
+        self._started_at = time.monotonic()
+
+        # Counters for the effective rate and error estimate
+        self.total_samples = 0
+        self.total_switches = 0
+        self.idle_samples = 0
+        self.estimated_error_seconds = 0.0
+
+    @classmethod
+    def from_config(cls, config) -> 'AdaptivePollingScheduler':
+        """Create a scheduler from an AppUsageConfig instance."""
+        return cls(
+            base_interval=config.check_interval,
+            min_interval=getattr(config, "min_check_interval", 1),
+            max_interval=getattr(config, "max_check_interval", 30),
+            backoff_factor=getattr(config, "polling_backoff_factor", 1.5),
+            switch_window=getattr(config, "switch_window_seconds", 60)
+        )
+
+    def reconfigure(self, config):
+        """Adopt changed interval settings, keeping the counters and recent switches."""
+        updated = self.from_config(config)
+        self.base_interval = updated.base_interval
+        self.min_interval = updated.min_interval
+        self.max_interval = updated.max_interval
+        self.backoff_factor = updated.backoff_factor
+        self.switch_window = updated.switch_window
+        self.interval = min(max(self.interval, self.min_interval), self.max_interval)
+
+    def record_sample(self, switched: bool, idle: bool = False, now: Optional[float] = None) -> float:
+        """Record the outcome of a poll and return the interval to sleep before the next one."""
+        if now is None:
+            now = time.monotonic()
+
+        self.total_samples += 1
+
+        # Drop switches that fell out of the activity window
+        while self._recent_switches and now - self._recent_switches[0] > self.switch_window:
+            self._recent_switches.popleft()
+
+        if switched:
+            # The switch happened somewhere within the last interval, so on
+            # average it was detected half an interval late
+            self.estimated_error_seconds += self.interval / 2
+            self.total_switches += 1
+            self._recent_switches.append(now)
+            self.interval = self.min_interval
+        elif idle:
+            # Nobody is at the keyboard; back off twice as fast up to the max
+            self.idle_samples += 1
+            self.interval = min(self.interval * self.backoff_factor * 2, self.max_interval)
+        elif self._recent_switches:
+            # Active user: relax towards the configured interval only
+            self.interval = min(self.interval * self.backoff_factor, self.base_interval)
+        else:
+            # Long stable session: keep backing off up to the max
+            self.interval = min(self.interval * self.backoff_factor, self.max_interval)
+
+        return self.interval
+
+    def reset(self):
+        """Return to the base interval, e.g. after tracking restarts."""
+        self.interval = self.base_interval
+        self._recent_switches.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Report the effective sample rate and the estimated timing error."""
+        elapsed = max(time.monotonic() - self._started_at, 1e-9)
+
+        return {
+            "current_interval": round(self.interval, 3),
+            "total_samples": self.total_samples,
+            "total_switches": self.total_switches,
+            "idle_samples": self.idle_samples,
+            "effective_sample_rate": round(self.total_samples / elapsed, 4),
+            "fixed_interval_samples": int(elapsed / self.base_interval),
+            "estimated_error_seconds": round(self.estimated_error_seconds, 2),
+            "average_error_per_switch": round(self.estimated_error_seconds / self.total_switches, 3) if self.total_switches else 0
+        }
@@ -0,0 +1,226 @@
+import threading
+import uuid
+from collections.abc import Mapping, Sequence
+from itertools import islice, takewhile
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class SessionsView(Sequence):
+    """Read-only view of the first `length` sessions of an append-only list."""
+
+    __slots__ = ("_sessions", "_length")
+
+    def __init__(self, sessions: List, length: int):
+        self._sessions = sessions
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._sessions[:self._length][index]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("session index out of range")
+        return self._sessions[index]
+
+    def __iter__(self) -> Iterator:
+        return islice(self._sessions, self._length)
+
+    def __reversed__(self) -> Iterator:
+        for index in range(self._length - 1, -1, -1):
+            yield self._sessions[index]
+
+    def __repr__(self) -> str:
+        return f"SessionsView({self._length} sessions)"
+
+
+class StoreSnapshot(Mapping):
+    """Immutable app -> sessions mapping as of one store version.
+
+    Holds references to the store's append-only lists plus the lengths
+    published with this version, so later appends are never visible.
+    The journal of recent appends is published the same way: entry i has
+    version journal_start + i, up to this snapshot's version.
+    """
+
+    __slots__ = ("version", "_lists", "_lengths", "journal", "journal_start")
+
+    def __init__(self, version: int, lists: Dict[str, List], lengths: Dict[str, int],
+                 journal: Optional[List] = None, journal_start: Optional[int] = None):
+        self.version = version
+        self._lists = lists
+        self._lengths = lengths
+        self.journal = journal if journal is not None else []
+        self.journal_start = journal_start if journal_start is not None else version + 1
+
+    def appended_since(self, version: int, limit: Optional[int] = None) -> Optional[List]:
+        """Sessions appended after `version` up to this snapshot, oldest first.
+
+        None when `version` predates the journal (or a wholesale
+        replacement) or is newer than this snapshot.
+        """
+        if version > self.version or version < self.journal_start - 1:
+            return None
+        start = version - self.journal_start + 1
+        end = self.version - self.journal_start + 1
+        if limit is not None:
+            end = min(end, start + limit)
+        return self.journal[start:end]
+
+    def __getitem__(self, app_name: str) -> SessionsView:
+        return SessionsView(self._lists[app_name], self._lengths[app_name])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._lengths)
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def __contains__(self, app_name) -> bool:
+        return app_name in self._lengths
+
+    def __repr__(self) -> str:
+        return f"StoreSnapshot(version={self.version}, apps={len(self._lengths)})"
+
+
+class SessionStore:
+    """Versioned, append-only session store with O(1) snapshots for readers.
+
+    Per-app session lists only ever grow; each write publishes a new
+    StoreSnapshot whose lengths mark how far readers may look. Readers just
+    take the current snapshot reference and never lock, so a writer is
+    never held up by a slow reader. Wholesale replacement swaps in new
+    lists, leaving older snapshots intact.
+
+    The version doubles as a change sequence: a bounded journal of recent
+    appends lets clients fetch just the sessions recorded after a cursor.
+    Like the session lists it only grows (until compacted into a fresh
+    list), so it is read from the published snapshot without locking.
+    """
+
+    def __init__(self, data: Optional[Dict[str, List]] = None, journal_size: int = 10000):
+        self._write_lock = threading.Lock()
+        # Distinguishes cursors handed out by this store from those of earlier runs
+        self.epoch = uuid.uuid4().hex[:8]
+        # Appends that stay fetchable by cursor, at least
+        self.journal_size = journal_size
+        self._lists: Dict[str, List] = {}
+        # Appended sessions, oldest first; entry i has version _journal_start + i
+        self._journal: List = []
+        self._journal_start = 1
+        # Version of the last wholesale replacement
+        self._replaced_version = 0
+        self._published = StoreSnapshot(0, self._lists, {}, self._journal, self._journal_start)
+        if data:
+            self.replace(data)
+
+    @property
+    def version(self) -> int:
+        return self._published.version
+
+    def snapshot(self) -> StoreSnapshot:
+        """Current immutable view of the data."""
+        return self._published
+
+    def append(self, session) -> int:
+        """Record a session and publish a new version; returns that version."""
+        with self._write_lock:
+            current = self._published
+            sessions = self._lists.get(session.app_name)
+            if sessions is None:
+                sessions = []
+                lists = dict(self._lists)
+                lists[session.app_name] = sessions
+                self._lists = lists
+            sessions.append(session)
+
+            lengths = dict(current._lengths)
+            lengths[session.app_name] = len(sessions)
+            if len(self._journal) >= 2 * self.journal_size:
+                # Compact into a fresh list; older snapshots keep the old one
+                self._journal = self._journal[-self.journal_size:]
+                self._journal_start = current.version + 1 - len(self._journal)
+            self._journal.append(session)
+            self._published = StoreSnapshot(
+                current.version + 1, self._lists, lengths, self._journal, self._journal_start
+            )
+            return current.version + 1
+
+    def changes_since(self, cursor: int, limit: int = 1000) -> Tuple[int, Optional[List]]:
+        """Sessions appended after version `cursor`, oldest first, at most `limit`.
+
+        Returns (new cursor, sessions). Sessions is None when the cursor
+        predates a wholesale replacement or the journal, so the caller
+        must reload everything. Never waits on the writer.
+        """
+        snapshot = self._published
+        sessions = snapshot.appended_since(cursor, limit)
+        if sessions is None:
+            return snapshot.version, None
+        return cursor + len(sessions), sessions
+
+    def replace(self, data) -> int:
+        """Swap in a whole new data set and publish it; returns the new version."""
+        lists = {app_name: list(sessions) for app_name, sessions in data.items()}
+        with self._write_lock:
+            return self._publish(lists)
+
+    def prepend(self, history) -> int:
+        """Put older sessions in front of those already recorded; returns the new version."""
+        with self._write_lock:
+            lists = {app_name: list(sessions) for app_name, sessions in history.items()}
+            for app_name, sessions in self._published.items():
+                lists.setdefault(app_name, []).extend(sessions)
+            return self._publish(lists)
+
+    def rebase(self, data, base: StoreSnapshot) -> int:
+        """Swap in data derived from snapshot `base`, replaying sessions appended since.
+
+        Appended sessions the new data already holds (same session_id) are
+        not replayed. Raises ValueError if the store was replaced after
+        `base` was taken, since the sessions appended to `base` can then no
+        longer be told apart. Returns the new version.
+        """
+        lists = {app_name: list(sessions) for app_name, sessions in data.items()}
+        with self._write_lock:
+            if self._replaced_version > base.version:
+                raise ValueError("the data was replaced while it was being rebased")
+            # Without a replacement, everything appended since `base` is the tail of a list it saw
+            current = self._published
+            appended = [
+                session
+                for app_name, length in current._lengths.items()
+                for session in current._lists[app_name][base._lengths.get(app_name, 0):length]
+            ]
+            if appended:
+                since = min(session.start_time for session in appended).replace(microsecond=0)
+                known = {
+                    session.session_id
+                    for sessions in lists.values()
+                    for session in takewhile(lambda s: s.start_time >= since, reversed(sessions))
+                }
+                for session in appended:
+                    if session.session_id in known:
+                        continue
+                    sessions = lists.setdefault(session.app_name, [])
+                    in_order = not sessions or sessions[-1].start_time <= session.start_time
+                    sessions.append(session)
+                    if not in_order:
+                        sessions.sort(key=lambda s: s.start_time)
+            return self._publish(lists)
+
+    def _publish(self, lists: Dict[str, List]) -> int:
+        """Swap in new lists as the next version; caller holds the write lock."""
+        version = self._published.version + 1
+        self._journal = []
+        self._journal_start = version + 1
+        self._replaced_version = version
+        self._lists = lists
+        self._published = StoreSnapshot(
+            version, lists, {app_name: len(sessions) for app_name, sessions in lists.items()},
+            self._journal, self._journal_start
+        )
+        return version
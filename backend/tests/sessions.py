@@ -0,0 +1,60 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+# backend.enhanced_tracker needs the Windows APIs, so the tests use this
+# stand-in with the AppSession fields the storage and merge code relies on
+
+
+@dataclass
+class Session:
+    app_name: str
+    start_time: datetime
+    end_time: Optional[datetime] = None
+    duration_seconds: int = 0
+    session_id: str = ""
+    category: str = "unknown"
+    idle_time: int = 0
+    window_title: str = ""
+    pid: int = 0
+    productivity_score: Optional[int] = None
+    switch_count: int = 0
+
+    def __post_init__(self):
+        if not self.session_id:
+            self.session_id = f"{self.app_name}_{int(self.start_time.timestamp())}"
+
+    @property
+    def active_seconds(self) -> int:
+        return max(self.duration_seconds - self.idle_time, 0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "session_id": self.session_id,
+            "start": self.start_time.strftime("%Y-%m-%d %H:%M:%S"),
+            "end": self.end_time.strftime("%Y-%m-%d %H:%M:%S") if self.end_time else None,
+            "duration_seconds": self.duration_seconds,
+            "category": self.category,
+            "idle_time": self.idle_time
+        }
+
+    @classmethod
+    def from_dict(cls, app_name: str, data: Dict[str, Any]) -> 'Session':
+        return cls(
+            app_name=app_name,
+            start_time=datetime.strptime(data["start"], "%Y-%m-%d %H:%M:%S"),
+            end_time=datetime.strptime(data["end"], "%Y-%m-%d %H:%M:%S") if data.get("end") else None,
+            duration_seconds=data.get("duration_seconds", 0),
+            session_id=data.get("session_id", ""),
+            category=data.get("category", "unknown"),
+            idle_time=data.get("idle_time", 0)
+        )
+
+
+BASE = datetime(2024, 1, 1, 9)
+
+
+def make_session(app_name: str, start_minutes: float, duration_seconds: int, **fields) -> Session:
+    """A finished session starting `start_minutes` after BASE."""
+    start = BASE + timedelta(minutes=start_minutes)
+    return Session(app_name, start, start + timedelta(seconds=duration_seconds), duration_seconds, **fields)
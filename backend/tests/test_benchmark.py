@@ -0,0 +1,43 @@
+import pytest
+
+# The workload builds tracker sessions, so it needs pywin32 and psutil
+pytest.importorskip("psutil")
+pytest.importorskip("win32gui")
+pytest.importorskip("win32process")
+
+from backend.benchmark import SyntheticWorkload, compare_results, run_benchmarks  # noqa: E402
+
+
+def session_rows(data):
+    return sorted((s.session_id, s.duration_seconds, s.idle_time, s.window_title)
+                  for sessions in data.values() for s in sessions)
+
+
+def test_workloads_are_reproducible_from_their_seed():
+    assert session_rows(SyntheticWorkload(seed=7, days=2).generate()) == \
+        session_rows(SyntheticWorkload(seed=7, days=2).generate())
+    assert session_rows(SyntheticWorkload(seed=7, days=2).generate()) != \
+        session_rows(SyntheticWorkload(seed=8, days=2).generate())
+
+
+def test_workloads_honor_their_shape():
+    workload = SyntheticWorkload(days=3, apps=30, categories=["development"], idle_ratio=0.5)
+    data = workload.generate()
+
+    assert len(data) <= 30
+    assert any(name.startswith("app") for name in data)  # padded beyond the known apps
+    days = {s.start_time.date() for sessions in data.values() for s in sessions}
+    assert len(days) == 3 and max(days) < workload.end_date.date()
+    for sessions in data.values():
+        assert all(0 <= s.idle_time <= s.duration_seconds for s in sessions)
+        assert all(a.end_time <= b.start_time for a, b in zip(sessions, sessions[1:]))
+
+
+def test_run_and_compare(tmp_path):
+    result = run_benchmarks(SyntheticWorkload(days=1), repeat=1, track_memory=False, work_dir=str(tmp_path))
+    assert result["total_sessions"] > 0
+    assert set(result["results"]) >= {"save_data", "load_data", "generate_enhanced_report"}
+
+    slower = {"results": {name: {"mean_s": row["mean_s"] * 2 or 1.0}
+                          for name, row in result["results"].items()}}
+    assert all(row["ratio"] >= 1 for row in compare_results(result, slower))
@@ -0,0 +1,76 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("tkinter")
+pytest.importorskip("matplotlib")
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+
+from backend import charts  # noqa: E402
+
+
+class HeadlessCanvas(FigureCanvasAgg):
+    """FigureCanvasTkAgg stand-in that renders off screen and counts redraws."""
+
+    def __init__(self, figure, parent):
+        super().__init__(figure)
+        self.full_draws = 0
+        self.blits = 0
+
+    def get_tk_widget(self):
+        return SimpleNamespace(pack=lambda **options: None)
+
+    def draw_idle(self, *args, **kwargs):
+        self.full_draws += 1
+        self.draw()
+
+    def blit(self, bbox=None):
+        self.blits += 1
+
+
+@pytest.fixture
+def panel(monkeypatch):
+    monkeypatch.setattr(charts, "FigureCanvasTkAgg", HeadlessCanvas)
+    return charts.ChartPanel(None)
+
+
+def test_pie_moves_existing_wedges_for_the_same_labels(panel):
+    panel.pie(["a", "b"], [1, 1], "Usage")
+    wedges = list(panel._artists)
+
+    panel.pie(["a", "b"], [3, 1], "Usage")
+    assert panel._artists == wedges
+    assert (wedges[0].theta1, wedges[0].theta2) == (90, 360)
+    assert panel._texts[0][1].get_text() == "75.0%"
+
+    draws = panel.canvas.full_draws
+    panel.pie(["a", "b"], [3, 1], "Usage")
+    assert panel.canvas.full_draws == draws
+
+
+def test_bar_heights_are_blitted_within_the_y_range(panel):
+    panel.bar(["mon", "tue"], [10, 8], "Daily", "Hours", "skyblue")
+    bars = list(panel._artists)
+    draws = panel.canvas.full_draws
+
+    panel.bar(["mon", "tue"], [9, 10], "Daily", "Hours", "skyblue")
+    assert panel._artists == bars and bars[0].get_height() == 9
+    assert (panel.canvas.full_draws, panel.canvas.blits) == (draws, 1)
+
+    # Outgrowing the y range rescales and redraws
+    panel.bar(["mon", "tue"], [9, 40], "Daily", "Hours", "skyblue")
+    assert panel.ax.get_ylim()[1] == pytest.approx(44)
+    assert panel.canvas.full_draws == draws + 1
+
+
+def test_new_labels_rebuild_the_chart(panel):
+    panel.bar(["mon"], [1], "Daily", "Hours", "skyblue")
+    bars = list(panel._artists)
+    panel.bar(["mon", "tue"], [1, 2], "Daily", "Hours", "skyblue")
+    assert len(panel._artists) == 2 and panel._artists[0] is not bars[0]
+
+    panel.line(["mon", "tue"], [10, 20], "Trend", "%", "purple", ylim=(0, 100))
+    line = panel._artists[0]
+    panel.line(["mon", "tue"], [30, 20], "Trend", "%", "purple", ylim=(0, 100))
+    assert panel._artists[0] is line and list(line.get_ydata()) == [30, 20]
@@ -0,0 +1,71 @@
+import sys
+
+import pytest
+
+from backend import columnar
+from backend.columnar import export_columnar, read_tcol, resolve_format
+from backend.tests.sessions import make_session
+
+
+@pytest.fixture
+def data():
+    return {
+        "code.exe": [
+            make_session("code.exe", 0, 600, idle_time=60, window_title="main.py", pid=42,
+                         productivity_score=8, switch_count=3),
+            make_session("code.exe", 60 * 24 * 40, 300)  # in February
+        ],
+        "chrome.exe": [make_session("chrome.exe", 30, 120, window_title="Docs – café")]
+    }
+
+
+def test_sessions_round_trip(tmp_path, data):
+    paths = export_columnar(data, str(tmp_path), "tcol")
+    assert sorted(paths) == ["daily_rollup", "hourly_rollup", "sessions"]
+
+    table = read_tcol(str(paths["sessions"]))
+    assert table["app_name"] == ["code.exe", "chrome.exe", "code.exe"]
+    assert table["month"] == ["2024-01", "2024-01", "2024-02"]
+    assert table["start"][0] == data["code.exe"][0].start_time
+    assert table["window_title"][:2] == ["main.py", "Docs – café"]
+    assert table["active_seconds"] == [540, 120, 300]
+    assert table["pid"][0] == 42
+    assert table["productivity_score"][0] == 8.0
+    assert table["switch_count"][0] == 3
+
+
+def test_read_selected_columns_and_months(tmp_path, data):
+    paths = export_columnar(data, str(tmp_path), "tcol")
+
+    table = read_tcol(str(paths["sessions"]), columns=["app_name", "duration_seconds"], months=["2024-02"])
+    assert table == {"app_name": ["code.exe"], "duration_seconds": [300]}
+
+
+def test_daily_rollup_totals(tmp_path, data):
+    paths = export_columnar(data, str(tmp_path), "tcol")
+
+    table = read_tcol(str(paths["daily_rollup"]), months=["2024-01"])
+    rows = sorted(zip(table["app_name"], table["sessions"], table["duration_seconds"], table["active_seconds"]))
+    assert rows == [("chrome.exe", 1, 120, 120), ("code.exe", 1, 600, 540)]
+
+
+def test_read_rejects_other_files(tmp_path):
+    path = tmp_path / "sessions.tcol"
+    path.write_bytes(b"not a table")
+    with pytest.raises(ValueError):
+        read_tcol(str(path))
+
+
+def test_resolve_format_without_pyarrow(monkeypatch):
+    monkeypatch.setattr(columnar, "_has_pyarrow", lambda: False)
+    assert resolve_format("auto") == "tcol"
+    with pytest.raises(ImportError):
+        resolve_format("parquet")
+    with pytest.raises(ValueError):
+        resolve_format("csv")
+
+
+def test_pyarrow_is_not_imported_for_tcol(tmp_path, data, monkeypatch):
+    monkeypatch.delitem(sys.modules, "pyarrow", raising=False)
+    export_columnar(data, str(tmp_path), "tcol")
+    assert "pyarrow" not in sys.modules
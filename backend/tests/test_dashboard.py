@@ -0,0 +1,100 @@
+import gzip
+import json
+import os
+
+import pytest
+
+from backend import dashboard
+from backend.dashboard import DashboardPublisher, atomic_write, productivity_metrics
+from backend.tests.sessions import BASE, make_session
+
+NOW = BASE.replace(hour=18)
+
+
+def app_stats(sessions):
+    stats = {}
+    for session in sessions:
+        entry = stats.setdefault(session.app_name, {"category": session.category, "total_time": 0,
+                                                    "session_count": 0})
+        entry["total_time"] += session.active_seconds
+        entry["session_count"] += 1
+    return stats
+
+
+@pytest.fixture
+def sessions():
+    return [
+        make_session("code.exe", -60 * 24, 1800, category="development"),
+        make_session("code.exe", 0, 1800, category="development"),
+        make_session("chrome.exe", 30, 600, idle_time=300, category="browser"),
+        make_session("word.exe", 40, 1200, category="office")
+    ]
+
+
+def test_payloads_cover_today_and_the_week(sessions):
+    payloads = DashboardPublisher("unused").build(sessions, app_stats(sessions), NOW)
+
+    today = payloads["today"]
+    assert (today["date"], today["total_time"], today["sessions"]) == ("2024-01-01", 3300, 3)
+    assert [app["name"] for app in today["apps"]] == ["code.exe", "word.exe", "chrome.exe"]
+    assert today["hourly"][9] == 3300
+
+    week = payloads["week"]
+    assert (week["total_time"], week["productive_time"]) == (5100, 4800)
+    assert week["days"][-1] == {"date": "2024-01-01", "total_time": 3300, "productive_time": 3000}
+    assert payloads["top_apps"]["apps"][0] == {"name": "code.exe", "duration": 3600, "category": "development",
+                                               "sessions": 2}
+
+
+def test_focus_sessions_and_interruptions(sessions):
+    metrics = productivity_metrics(sessions[1:])
+    assert metrics["focus_sessions"] == 1
+    assert metrics["interruptions"] == 1
+    assert metrics["productivity_percentage"] == pytest.approx(3000 / 3300 * 100, abs=0.01)
+    assert productivity_metrics([])["productivity_percentage"] == 0
+
+
+def test_publish_writes_compressed_siblings_and_a_manifest(tmp_path, sessions, monkeypatch):
+    monkeypatch.setattr(dashboard, "brotli", None)
+    manifest = DashboardPublisher(str(tmp_path / "dashboard")).publish(sessions, app_stats(sessions), 7, NOW)
+
+    output = tmp_path / "dashboard"
+    assert manifest["version"] == 7 and manifest["encodings"] == ["gzip"]
+    assert json.loads((output / "manifest.json").read_text()) == manifest
+    for name in DashboardPublisher.PAYLOADS:
+        body = (output / f"{name}.json").read_bytes()
+        assert gzip.decompress((output / f"{name}.json.gz").read_bytes()) == body
+        assert manifest["files"][name]["bytes"] == len(body)
+    assert not list(output.glob("*.tmp"))
+
+
+def test_unchanged_payloads_are_not_rewritten(tmp_path, sessions, monkeypatch):
+    monkeypatch.setattr(dashboard, "brotli", None)
+    publisher = DashboardPublisher(str(tmp_path))
+    publisher.publish(sessions, app_stats(sessions), 1, NOW)
+    week = tmp_path / "week.json"
+    os.utime(week, (0, 0))
+
+    publisher.publish(sessions, app_stats(sessions), 2, NOW)
+    assert week.stat().st_mtime == 0
+
+    later = sessions + [make_session("code.exe", 120, 60, category="development")]
+    publisher.publish(later, app_stats(later), 3, NOW)
+    assert week.stat().st_mtime > 0
+
+
+def test_stale_brotli_files_are_removed(tmp_path, sessions, monkeypatch):
+    monkeypatch.setattr(dashboard, "brotli", None)
+    stale = tmp_path / "today.json.br"
+    stale.write_bytes(b"old")
+
+    DashboardPublisher(str(tmp_path)).publish(sessions, app_stats(sessions), 1, NOW)
+    assert not stale.exists()
+
+
+def test_atomic_write_replaces_the_whole_file(tmp_path):
+    path = tmp_path / "payload.json"
+    path.write_bytes(b"old contents that are longer")
+    atomic_write(path, b"new")
+    assert path.read_bytes() == b"new"
+    assert [p.name for p in tmp_path.iterdir()] == ["payload.json"]
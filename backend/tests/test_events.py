@@ -0,0 +1,55 @@
+import asyncio
+import json
+import socket
+
+import pytest
+
+from backend.events import EventStreamServer
+
+
+@pytest.fixture
+def server():
+    server = EventStreamServer(queue_size=3, hello=lambda: {"is_running": True})
+    server.start()
+    yield server
+    server.stop()
+
+
+def read_events(stream, count):
+    return [json.loads(stream.readline()) for _ in range(count)]
+
+
+def test_clients_get_a_hello_then_every_event_in_order(server):
+    with socket.create_connection(server.address, timeout=5) as client, client.makefile("rb") as stream:
+        hello, = read_events(stream, 1)
+        assert (hello["type"], hello["data"]) == ("hello", {"is_running": True})
+        assert server.get_stats()["subscribers"] == 1
+
+        for n in range(3):
+            server.publish("heartbeat", {"n": n})
+        events = read_events(stream, 3)
+
+    assert [event["data"]["n"] for event in events] == [0, 1, 2]
+    assert [event["seq"] for event in events] == [1, 2, 3]
+    assert server.get_stats()["dropped"] == 0
+
+
+def test_a_full_subscriber_queue_drops_its_oldest_events():
+    server = EventStreamServer(queue_size=3)
+    slow = asyncio.Queue(maxsize=3)
+    server._subscribers.append(slow)
+
+    for n in range(5):
+        server._fan_out("heartbeat", {"n": n}, 0)
+
+    lines = [json.loads(slow.get_nowait()) for _ in range(slow.qsize())]
+    assert [line["seq"] for line in lines] == [3, 4, 5]
+    assert server.get_stats() == {"subscribers": 1, "published": 5, "dropped": 2}
+
+
+def test_stop_closes_client_connections(server):
+    with socket.create_connection(server.address, timeout=5) as client, client.makefile("rb") as stream:
+        read_events(stream, 1)
+        server.stop()
+        assert stream.readline() == b""
+    server.publish("heartbeat", {})  # Ignored once the loop has closed
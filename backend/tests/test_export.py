@@ -0,0 +1,87 @@
+import csv
+import io
+import json
+
+import pytest
+
+from backend.export import SESSION_COLUMNS, SessionExporter, iter_sessions
+from backend.tests.sessions import BASE, make_session
+
+
+@pytest.fixture
+def data():
+    unfinished = make_session("code.exe", 90, 0, category="development")
+    unfinished.end_time = None
+    return {
+        "code.exe": [make_session("code.exe", minute, 600, idle_time=60, category="development")
+                     for minute in (0, 30, 60 * 24)] + [unfinished],
+        "chrome.exe": [make_session("chrome.exe", minute, 300, category="browser") for minute in (15, 60 * 24 + 15)],
+        "idle.exe": []
+    }
+
+
+def starts(sessions):
+    return [(s.app_name, s.start_time.strftime("%d %H:%M")) for s in sessions]
+
+
+def test_sessions_merge_in_start_order_without_unfinished_ones(data):
+    assert starts(iter_sessions(data)) == [
+        ("code.exe", "01 09:00"), ("chrome.exe", "01 09:15"), ("code.exe", "01 09:30"),
+        ("code.exe", "02 09:00"), ("chrome.exe", "02 09:15")
+    ]
+
+
+def test_filters_are_half_open_and_combine(data):
+    day_two = BASE.replace(day=2)
+    assert starts(iter_sessions(data, start=BASE.replace(minute=15), end=day_two)) == \
+        [("chrome.exe", "01 09:15"), ("code.exe", "01 09:30")]
+    assert [s.app_name for s in iter_sessions(data, apps=["chrome.exe"])] == ["chrome.exe"] * 2
+    assert [s.app_name for s in iter_sessions(data, categories=["Development"], start=day_two)] == ["code.exe"]
+
+
+def test_csv_sessions(data):
+    out = io.StringIO()
+    assert SessionExporter(data, chunk_size=2).export(out, "csv", apps=["code.exe"]) == 3
+
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert list(rows[0]) == SESSION_COLUMNS
+    assert [(row["start"], row["active_seconds"]) for row in rows] == [
+        ("2024-01-01 09:00:00", "540"), ("2024-01-01 09:30:00", "540"), ("2024-01-02 09:00:00", "540")
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 1000])
+def test_json_and_ndjson_hold_the_same_rows(data, chunk_size):
+    exporter = SessionExporter(data, chunk_size=chunk_size)
+    as_json, as_ndjson = io.StringIO(), io.StringIO()
+    exporter.export(as_json, "json", level="daily")
+    exporter.export(as_ndjson, "ndjson", level="daily")
+
+    rows = json.loads(as_json.getvalue())
+    assert rows == [json.loads(line) for line in as_ndjson.getvalue().splitlines()]
+    assert [(row["date"], row["app_name"], row["sessions"], row["active_seconds"]) for row in rows] == [
+        ("2024-01-01", "chrome.exe", 1, 300), ("2024-01-01", "code.exe", 2, 1080),
+        ("2024-01-02", "chrome.exe", 1, 300), ("2024-01-02", "code.exe", 1, 540)
+    ]
+
+
+def test_empty_json_export_is_an_empty_array():
+    out = io.StringIO()
+    assert SessionExporter({}).export(out, "json") == 0
+    assert json.loads(out.getvalue()) == []
+
+
+def test_app_totals_to_a_file(tmp_path, data):
+    path = tmp_path / "apps.ndjson"
+    SessionExporter(data).export(path, "ndjson", level="apps")
+
+    rows = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [row["app_name"] for row in rows] == ["code.exe", "chrome.exe"]
+    assert rows[0]["sessions"] == 3 and rows[0]["idle_time"] == 180
+    assert (rows[0]["first_used"], rows[0]["last_used"]) == ("2024-01-01 09:00:00", "2024-01-02 09:10:00")
+
+
+@pytest.mark.parametrize("options", [{"format_type": "xml"}, {"level": "hourly"}])
+def test_unknown_formats_and_levels_are_rejected(data, options):
+    with pytest.raises(ValueError):
+        SessionExporter(data).export(io.StringIO(), **options)
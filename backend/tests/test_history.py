@@ -0,0 +1,110 @@
+import sys
+import threading
+from datetime import datetime, timedelta
+
+from backend.history import SessionIndex
+from backend.tests.sessions import BASE, make_session
+
+
+LATER = BASE + timedelta(days=7)
+
+
+def ids(sessions):
+    return [session.session_id for session in sessions]
+
+
+def make_index():
+    data = {
+        "code.exe": [make_session("code.exe", minute, 60, category="development") for minute in (0, 20, 40)],
+        "chrome.exe": [make_session("chrome.exe", minute, 60, category="browser") for minute in (10, 30)],
+        "slack.exe": [make_session("slack.exe", 60 * 24, 60, category="communication")]
+    }
+    return SessionIndex(data), data
+
+
+def test_pages_run_newest_first():
+    index, data = make_index()
+    everything = sorted((s for sessions in data.values() for s in sessions), key=lambda s: s.start_time)
+
+    assert ids(index.page(0, 2)) == ids(everything[::-1][:2])
+    assert ids(index.page(2, 10)) == ids(everything[::-1][2:])
+    assert index.page(10, 5) == []
+    assert index.count() == 6
+
+
+def test_pages_filter_by_app_and_category():
+    index, data = make_index()
+    assert ids(index.page(0, 10, app="chrome.exe")) == ids(data["chrome.exe"][::-1])
+    assert ids(index.page(0, 10, category="development")) == ids(data["code.exe"][::-1])
+    assert index.page(0, 10, app="chrome.exe", category="development") == []
+    assert index.count(app="missing.exe") == 0
+    assert index.apps() == ["chrome.exe", "code.exe", "slack.exe"]
+
+
+def test_offset_for_a_day_skips_newer_sessions():
+    index, _ = make_index()
+    assert index.offset_for(BASE) == 1
+    assert index.offset_for(datetime(2024, 1, 2)) == 0
+    assert index.offset_for(datetime(2023, 12, 31)) == 6
+
+
+def test_between_is_half_open_and_oldest_first():
+    index, data = make_index()
+    sessions = index.between(make_session("x", 10, 0).start_time, make_session("x", 40, 0).start_time)
+    assert ids(sessions) == ids([data["chrome.exe"][0], data["code.exe"][1], data["chrome.exe"][1]])
+
+
+def test_out_of_order_and_unfinished_sessions():
+    index, _ = make_index()
+    late = make_session("code.exe", 5, 60, category="development")
+    index.add(late)
+    unfinished = make_session("code.exe", 50, 0, category="development")
+    unfinished.end_time = None
+    index.add(unfinished)
+
+    assert index.count() == 7
+    assert ids(index.page(5, 1)) == [late.session_id]
+    assert index.count(app="code.exe") == 4
+
+
+def test_readers_see_consistent_pages_while_sessions_are_added():
+    index = SessionIndex()
+    stop = threading.Event()
+    errors = []
+
+    def read():
+        while not stop.is_set():
+            try:
+                for sessions in (index.page(0, 50)[::-1], index.page(0, 50, app="code.exe")[::-1]):
+                    starts = [s.start_time for s in sessions]
+                    assert starts == sorted(starts)
+                # The newest ten minutes; keys and sessions must line up
+                newest = index.page(0, 1)
+                if newest:
+                    end = newest[0].start_time + timedelta(minutes=1)
+                    start = end - timedelta(minutes=10)
+                    assert all(start <= s.start_time < end for s in index.between(start, end))
+            except Exception as e:  # Reported from the main thread
+                errors.append(e)
+                return
+
+    readers = [threading.Thread(target=read) for _ in range(2)]
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    for reader in readers:
+        reader.start()
+    try:
+        # Every other session arrives out of order, forcing inserts
+        for minute in range(0, 4000, 2):
+            index.add(make_session("code.exe", minute + 2, 30))
+            index.add(make_session("chrome.exe", minute + 1, 30))
+    finally:
+        stop.set()
+        for reader in readers:
+            reader.join()
+        sys.setswitchinterval(switch_interval)
+
+    assert errors == []
+    assert index.count() == 4000
+    starts = [s.start_time for s in index.between(BASE, LATER)]
+    assert starts == sorted(starts)
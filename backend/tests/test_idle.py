@@ -0,0 +1,70 @@
+from datetime import timedelta
+
+from backend.idle import IdleMonitor, IdleSource
+from backend.tests.sessions import BASE, make_session
+
+
+class ScriptedIdleSource(IdleSource):
+    def __init__(self):
+        self.idle_seconds = 0.0
+
+    def get_idle_seconds(self) -> float:
+        return self.idle_seconds
+
+
+def at(seconds):
+    return BASE + timedelta(seconds=seconds)
+
+
+def make_monitor(threshold=300):
+    source = ScriptedIdleSource()
+    return IdleMonitor(source, threshold_seconds=threshold), source
+
+
+def test_idle_periods_count_from_the_last_input():
+    monitor, source = make_monitor()
+    session = make_session("code.exe", 0, 0)
+
+    source.idle_seconds = 400
+    assert monitor.sample(session, at(500))   # last input at 100s
+    source.idle_seconds = 0
+    assert not monitor.sample(session, at(900))
+
+    # Idle from 100s until the input noticed at 900s
+    assert session.idle_time == 800
+
+
+def test_short_pauses_are_not_idle():
+    monitor, source = make_monitor()
+    session = make_session("code.exe", 0, 0)
+    source.idle_seconds = 299
+    assert not monitor.sample(session, at(400))
+    source.idle_seconds = 0
+    monitor.sample(session, at(500))
+    assert session.idle_time == 0
+
+
+def test_idleness_before_the_session_is_not_charged_to_it():
+    monitor, source = make_monitor()
+    session = make_session("code.exe", 10, 0)     # starts at 600s
+    source.idle_seconds = 1000
+    monitor.sample(session, at(700))
+    source.idle_seconds = 0
+    monitor.sample(session, at(1000))
+    assert session.idle_time == 400
+
+
+def test_an_idle_period_is_split_across_sessions():
+    monitor, source = make_monitor()
+    first = make_session("code.exe", 0, 0)
+    source.idle_seconds = 300
+    monitor.sample(first, at(300))             # idle since 0s
+
+    first.end_time = at(600)
+    monitor.close_session(first)
+    second = make_session("chrome.exe", 10, 0)
+    monitor.open_session(second)
+    source.idle_seconds = 0
+    monitor.sample(second, at(1000))
+
+    assert (first.idle_time, second.idle_time) == (600, 400)
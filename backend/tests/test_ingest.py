@@ -0,0 +1,127 @@
+import gzip
+import json
+from datetime import datetime
+
+import pytest
+
+from backend.ingest import MAX_BODY_BYTES, FleetStore, IngestServer
+
+
+def session(app_name, start, duration=600, idle=0, category="development"):
+    return {"app_name": app_name, "start": start, "duration_seconds": duration, "idle_time": idle,
+            "category": category}
+
+
+def january(store, team="core"):
+    return store.team_rollup(team, datetime(2024, 1, 1), datetime(2024, 1, 31))
+
+
+def test_batches_are_stored_per_user_and_month(tmp_path):
+    store = FleetStore(str(tmp_path))
+    result = store.ingest("ana", "core", "b1", [
+        session("code.exe", "2024-01-31 23:00:00"),
+        session("code.exe", "2024-02-01 09:00:00"),
+        {"app_name": "broken.exe", "start": "yesterday"}
+    ])
+
+    assert result == {"accepted": 2, "rejected": 1, "duplicate": False}
+    assert sorted(path.name for path in (tmp_path / "users" / "ana").glob("*.ndjson")) == \
+        ["2024-01.ndjson", "2024-02.ndjson"]
+
+
+def test_retried_batches_count_once_even_after_a_restart(tmp_path):
+    store = FleetStore(str(tmp_path))
+    store.ingest("ana", "core", "b1", [session("code.exe", "2024-01-02 09:00:00")])
+    assert store.ingest("ana", "core", "b1", [session("code.exe", "2024-01-02 09:00:00")])["duplicate"]
+    # Batch ids are per user
+    assert not store.ingest("ben", "core", "b1", [session("code.exe", "2024-01-02 10:00:00")])["duplicate"]
+    store.flush()
+
+    restarted = FleetStore(str(tmp_path))
+    assert restarted.ingest("ana", "core", "b1", [session("code.exe", "2024-01-02 09:00:00")])["duplicate"]
+    assert january(restarted)["sessions"] == 2
+    assert restarted.get_stats()["duplicate_batches"] == 1
+
+
+def test_the_batch_log_keeps_only_recent_ids(tmp_path):
+    store = FleetStore(str(tmp_path), remembered_batches=3)
+    for n in range(10):
+        store.ingest("ana", "core", f"b{n}", [])
+
+    log = (tmp_path / "users" / "ana" / "batches.log").read_text().split()
+    assert len(log) <= 6 and log[-1] == "b9"
+    restarted = FleetStore(str(tmp_path), remembered_batches=3)
+    assert restarted.ingest("ana", "core", "b9", [])["duplicate"]
+    assert not restarted.ingest("ana", "core", "b6", [])["duplicate"]
+
+
+def test_team_rollups_count_active_time_and_users(tmp_path):
+    store = FleetStore(str(tmp_path))
+    store.ingest("ana", "core", "b1", [session("code.exe", "2024-01-02 09:00:00", idle=100),
+                                       session("chrome.exe", "2024-01-02 10:00:00", 300, category="browser")])
+    store.ingest("ben", "core", "b1", [session("code.exe", "2024-01-03 09:00:00")])
+
+    rollup = january(store)
+    assert (rollup["users"], rollup["sessions"], rollup["active_seconds"]) == (2, 3, 1400)
+    assert [(day["date"], day["users"]) for day in rollup["days"]] == [("2024-01-02", 1), ("2024-01-03", 1)]
+    assert rollup["top_apps"][0] == {"app_name": "code.exe", "category": "development", "sessions": 2,
+                                     "active_seconds": 1100}
+
+    store.flush()
+    assert january(FleetStore(str(tmp_path))) == rollup
+    assert store.teams() == ["core"]
+
+
+def test_flushed_rollups_are_evicted_and_read_back(tmp_path):
+    store = FleetStore(str(tmp_path), cached_rollups=1)
+    for month in range(1, 4):
+        store.ingest("ana", "core", f"b{month}", [session("code.exe", f"2024-0{month}-01 09:00:00")])
+    assert len(store._rollups) == 3  # Not yet on disk
+
+    store.flush()
+    assert list(store._rollups) == [("core", "2024-03")]
+    store.ingest("ana", "core", "b4", [session("code.exe", "2024-01-01 10:00:00")])
+    assert january(store)["sessions"] == 2
+
+
+def test_failed_flushes_keep_rollups_dirty(tmp_path):
+    store = FleetStore(str(tmp_path), cached_rollups=0)
+    store.ingest("ana", "core", "b1", [session("code.exe", "2024-01-02 09:00:00")])
+    (tmp_path / "teams").write_text("")  # The team directory cannot be created
+
+    with pytest.raises(OSError):
+        store.flush()
+    (tmp_path / "teams").unlink()
+    store.flush()
+    assert january(FleetStore(str(tmp_path)))["sessions"] == 1
+
+
+@pytest.mark.parametrize("upload, error", [
+    ({"batch_id": "b1", "sessions": []}, "user is required"),
+    ({"user": "ana", "sessions": []}, "batch_id is required"),
+    ({"user": "ana", "batch_id": "b\n1", "sessions": []}, "batch_id must be at most 128 printable characters"),
+    ({"user": "ana", "batch_id": "b1", "sessions": {}}, "sessions must be a list"),
+])
+def test_malformed_uploads_are_rejected(tmp_path, upload, error):
+    server = IngestServer(FleetStore(str(tmp_path)))
+    assert server.handle_ingest(json.dumps(upload).encode()) == (400, {"error": error})
+
+
+def test_gzip_uploads_and_their_size_limit(tmp_path):
+    server = IngestServer(FleetStore(str(tmp_path)))
+    upload = {"user": "ana", "batch_id": "b1", "sessions": [session("code.exe", "2024-01-02 09:00:00")]}
+    status, result = server.handle_ingest(gzip.compress(json.dumps(upload).encode()), "gzip")
+    assert (status, result["accepted"]) == (200, 1)
+    assert server.handle_get("/teams/default?start=2024-01-02")[1]["sessions"] == 1
+
+    bomb = gzip.compress(b" " * (MAX_BODY_BYTES + 1))
+    assert server.handle_ingest(bomb, "gzip")[0] == 413
+
+
+def test_rollup_queries_validate_their_range(tmp_path):
+    server = IngestServer(FleetStore(str(tmp_path)))
+    assert server.handle_get("/teams/core")[0] == 400
+    assert server.handle_get("/teams/core?start=2024-01-01&end=2025-06-01") == \
+        (400, {"error": "range is limited to a year"})
+    assert server.handle_get("/nope")[0] == 404
+    assert server.handle_get("/stats")[1]["batches"] == 0
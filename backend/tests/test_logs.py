@@ -0,0 +1,60 @@
+import logging
+import os
+import time
+
+from backend.logs import RateLimiter, SizedTimedRotatingFileHandler
+
+
+def write_lines(path, count, **handler_options):
+    handler = SizedTimedRotatingFileHandler(str(path), **handler_options)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger = logging.getLogger(f"test-rotation-{path}")
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        for i in range(count):
+            logger.warning("line %03d with some padding to fill the file", i)
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+
+def test_size_rollovers_keep_the_newest_backups(tmp_path):
+    write_lines(tmp_path / "tracker.log", 100, max_bytes=200, backup_count=2)
+
+    files = sorted(tmp_path.iterdir())
+    assert len(files) == 3
+    kept = sorted(int(line.split()[1]) for path in files for line in path.read_text().splitlines())
+    # One contiguous run of the newest lines
+    assert kept == list(range(kept[0], 100))
+
+
+def test_backup_numbers_sort_numerically(tmp_path):
+    handler = SizedTimedRotatingFileHandler(str(tmp_path / "tracker.log"), backup_count=1)
+    try:
+        for name in ("tracker.log.2024-01-01", "tracker.log.2024-01-01.9", "tracker.log.2024-01-01.10",
+                     "tracker.log.2024-01-02", "tracker.log.notes"):
+            (tmp_path / name).write_text("")
+        doomed = sorted(os.path.basename(path) for path in handler.getFilesToDelete())
+    finally:
+        handler.close()
+    assert doomed == ["tracker.log.2024-01-01", "tracker.log.2024-01-01.10", "tracker.log.2024-01-01.9"]
+
+
+def test_rate_limiter_counts_suppressed_messages(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+    limiter = RateLimiter(rate=1.0, burst=2)
+
+    assert [limiter.allow("poll") for _ in range(4)] == [(True, 0), (True, 0), (False, 0), (False, 0)]
+    # Other kinds have their own bucket
+    assert limiter.allow("save") == (True, 0)
+
+    clock[0] += 1.5
+    assert limiter.allow("poll") == (True, 2)
+    assert limiter.allow("poll") == (False, 0)
+
+
+def test_rate_limiter_without_a_rate_allows_everything():
+    limiter = RateLimiter(rate=0, burst=1)
+    assert all(limiter.allow("poll") == (True, 0) for _ in range(50))
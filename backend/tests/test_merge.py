@@ -0,0 +1,96 @@
+import json
+
+import pytest
+
+from backend.merge import LogMerger, iter_log_records
+from backend.tests.sessions import Session, make_session
+
+
+def write_v2(path, sessions):
+    applications = {}
+    for session in sessions:
+        applications.setdefault(session.app_name, {"sessions": []})["sessions"].append(session.to_dict())
+    path.write_text(json.dumps({"metadata": {"version": "2.0"}, "applications": applications}))
+    return path
+
+
+def write_v1(path, sessions):
+    data = {}
+    for session in sessions:
+        data.setdefault(session.app_name, []).append(session.to_dict())
+    path.write_text(json.dumps(data))
+    return path
+
+
+def merge(sources, workers=1):
+    merger = LogMerger(Session.from_dict, workers=workers)
+    return merger.merge_to_data(sources), merger.stats
+
+
+def test_iter_log_records_reads_both_formats(tmp_path):
+    sessions = [make_session("code.exe", 0, 60), make_session("chrome.exe", 5, 60)]
+    for write in (write_v1, write_v2):
+        raw = json.loads(write(tmp_path / "log.json", sessions).read_text())
+        assert sorted(app for app, _ in iter_log_records(raw)) == ["chrome.exe", "code.exe"]
+
+
+def test_duplicates_keep_the_longest_copy(tmp_path):
+    short = make_session("code.exe", 0, 60)
+    longer = make_session("code.exe", 0, 90)
+    other = make_session("chrome.exe", 10, 30)
+    data, stats = merge([write_v2(tmp_path / "a.json", [short, other]), write_v1(tmp_path / "b.json", [longer])])
+
+    assert [s.duration_seconds for s in data["code.exe"]] == [90]
+    assert len(data["chrome.exe"]) == 1
+    assert stats["duplicates"] == 1
+    assert stats["sessions"] == 2
+
+
+def test_overlaps_are_trimmed_or_dropped(tmp_path):
+    first = make_session("code.exe", 0, 600)          # 9:00-9:10
+    overlapping = make_session("code.exe", 5, 600)    # 9:05-9:15, trimmed to 9:10
+    inside = make_session("code.exe", 6, 60)          # 9:06-9:07, dropped
+    data, stats = merge([write_v2(tmp_path / "a.json", [first]),
+                         write_v2(tmp_path / "b.json", [overlapping, inside])])
+
+    kept = data["code.exe"]
+    assert [(s.start_time, s.duration_seconds) for s in kept] == [
+        (first.start_time, 600), (first.end_time, 300)
+    ]
+    # The trimmed session's id follows its new start
+    assert kept[1].session_id == f"code.exe_{int(first.end_time.timestamp())}"
+    assert (stats["trimmed"], stats["dropped"]) == (1, 1)
+
+
+def test_overlaps_of_different_apps_are_kept(tmp_path):
+    data, stats = merge([write_v2(tmp_path / "a.json", [make_session("code.exe", 0, 600),
+                                                       make_session("chrome.exe", 5, 600)])])
+    assert stats["trimmed"] == stats["dropped"] == 0
+    assert stats["sessions"] == 2
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_remerging_output_with_sources_is_stable(tmp_path, workers):
+    sources = [
+        write_v2(tmp_path / "a.json", [make_session("code.exe", 0, 600), make_session("chrome.exe", 1, 60)]),
+        write_v2(tmp_path / "b.json", [make_session("code.exe", 5, 600), make_session("code.exe", 6, 60)])
+    ]
+    merged, first_stats = merge(sources, workers)
+    output = write_v2(tmp_path / "merged.json", [s for sessions in merged.values() for s in sessions])
+
+    remerged, stats = merge(sources + [output], workers)
+
+    assert {app: [s.to_dict() for s in sessions] for app, sessions in remerged.items()} == \
+        {app: [s.to_dict() for s in sessions] for app, sessions in merged.items()}
+    assert (stats["trimmed"], stats["dropped"]) == (first_stats["trimmed"], first_stats["dropped"])
+    # Every session of the output is found again as a duplicate
+    assert stats["duplicates"] == first_stats["duplicates"] + first_stats["sessions"]
+
+
+def test_in_memory_sources_merge_with_files(tmp_path):
+    recorded = make_session("code.exe", 30, 60)
+    logged = make_session("code.exe", 0, 60)
+    data, stats = merge([{"code.exe": [recorded]}, write_v2(tmp_path / "a.json", [logged, recorded])])
+
+    assert [s.start_time for s in data["code.exe"]] == [logged.start_time, recorded.start_time]
+    assert stats["duplicates"] == 1
@@ -0,0 +1,63 @@
+import pytest
+
+pytest.importorskip("psutil")
+
+from backend.metrics import LatencyHistogram, TrackerMetrics  # noqa: E402
+
+
+def test_small_values_are_exact():
+    histogram = LatencyHistogram(precision=5)
+    for value in range(1, 11):
+        histogram.record_us(value)
+    assert [histogram.percentile(p) for p in (10, 50, 90, 100)] == [1, 5, 9, 10]
+    assert histogram.percentile(0) == 1
+
+
+@pytest.mark.parametrize("value", [100, 1_000, 12_345, 1_000_000, 987_654_321])
+def test_large_values_stay_within_the_relative_error(value):
+    histogram = LatencyHistogram(precision=5)
+    histogram.record_us(value)
+    histogram.record_us(value * 4)
+    # Upper bucket edges never under-report; each octave has 16 buckets above its base
+    assert value <= histogram.percentile(50) <= value * (1 + 1 / 16)
+    assert histogram.percentile(100) == value * 4
+
+
+def test_percentiles_follow_the_distribution():
+    histogram = LatencyHistogram()
+    for _ in range(990):
+        histogram.record_us(200)
+    for _ in range(10):
+        histogram.record_us(50_000)
+    assert histogram.percentile(99) < 210
+    assert histogram.percentile(99.9) >= 50_000
+    summary = histogram.summary()
+    assert (summary["count"], summary["min_us"], summary["max_us"]) == (1000, 200, 50_000)
+
+
+def test_empty_histograms_report_zero():
+    assert LatencyHistogram().percentile(99) == 0
+    assert LatencyHistogram().summary()["mean_us"] == 0
+
+
+def test_disabled_metrics_record_nothing():
+    metrics = TrackerMetrics(enabled=False)
+    with metrics.timer("detection"):
+        pass
+    metrics.inc("samples")
+    assert metrics.histograms["detection"].count == 0
+    assert metrics.counters["samples"] == 0
+
+
+def test_timers_and_counters_reach_the_prometheus_dump():
+    metrics = TrackerMetrics()
+    with metrics.timer("detection"):
+        pass
+    with metrics.timer("custom_stage"):
+        pass
+    metrics.inc("switches", 2)
+
+    text = metrics.to_prometheus()
+    assert "tracker_switches_total 2" in text
+    assert 'tracker_stage_latency_seconds_count{stage="detection"} 1' in text
+    assert 'tracker_stage_latency_seconds_count{stage="custom_stage"} 1' in text
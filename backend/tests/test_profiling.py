@@ -0,0 +1,75 @@
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import pytest
+
+from backend.profiling import LoopProfiler
+
+
+def run_iterations(profiler, count=1, seconds=0.0):
+    for _ in range(count):
+        with profiler.iteration():
+            time.sleep(seconds)
+
+
+def test_off_records_nothing(tmp_path):
+    profiler = LoopProfiler("loop", output_dir=str(tmp_path))
+    run_iterations(profiler, 3)
+    assert not profiler.enabled and profiler.reports == []
+
+
+def test_cprofile_writes_reports_into_a_new_directory(tmp_path):
+    output = tmp_path / "logs" / "profiles"
+    profiler = LoopProfiler("loop", mode="cprofile", output_dir=str(output), duration=0)
+    run_iterations(profiler)
+
+    assert sorted(path.suffix for path in profiler.reports) == [".prof", ".txt"]
+    assert all(path.exists() for path in profiler.reports)
+    assert profiler.mode == "off"
+
+
+def test_report_write_failures_do_not_reach_the_loop(tmp_path, capsys):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    profiler = LoopProfiler("loop", mode="cprofile", output_dir=str(blocker / "profiles"), duration=0)
+    run_iterations(profiler)
+
+    assert profiler.reports == [] and profiler.mode == "off"
+    assert "Error writing profile report" in capsys.readouterr().out
+
+
+def test_slow_iterations_are_logged_with_stacks(tmp_path):
+    output = tmp_path / "profiles"
+    profiler = LoopProfiler("loop", mode="slow_iterations", output_dir=str(output), slow_threshold_ms=20)
+    try:
+        run_iterations(profiler, seconds=0.001)
+        assert profiler.reports == []
+        run_iterations(profiler, seconds=0.1)
+    finally:
+        profiler.mode = "off"
+
+    text = (output / "loop_slow_iterations.log").read_text()
+    assert text.count("iteration took") == 1
+    assert "sample 1:" in text and "run_iterations" in text
+
+
+def test_tracemalloc_is_shared_between_profilers(tmp_path):
+    assert not tracemalloc.is_tracing()
+    first = LoopProfiler("first", mode="tracemalloc", output_dir=str(tmp_path), duration=0.05)
+    second = LoopProfiler("second", mode="tracemalloc", output_dir=str(tmp_path), duration=0)
+    run_iterations(first)
+    run_iterations(second)
+
+    # The second profiler finishing leaves tracing on for the first
+    assert second.mode == "off" and tracemalloc.is_tracing()
+    time.sleep(0.05)
+    run_iterations(first)
+    assert first.mode == "off" and not tracemalloc.is_tracing()
+    assert "Top 25 allocations in first" in first.reports[0].read_text()
+
+
+@pytest.mark.parametrize("mode, expected", [("CProfile", "cprofile"), ("sampling", "off")])
+def test_from_config_normalizes_the_mode(tmp_path, mode, expected):
+    config = SimpleNamespace(profiling_mode=mode)
+    assert LoopProfiler.from_config("loop", config, str(tmp_path)).mode == expected
@@ -0,0 +1,127 @@
+import json
+import urllib.error
+import urllib.request
+from types import SimpleNamespace
+
+import pytest
+
+from backend.history import SessionIndex
+from backend.query_api import TrackerQueryAPI
+from backend.tests.sessions import make_session
+
+
+class FakeTracker:
+    """The attributes the query API reads from EnhancedAppUsageTracker."""
+
+    def __init__(self, data):
+        self.history_index = SessionIndex(data)
+        self.app_stats = {
+            app_name: {"category": sessions[0].category,
+                       "total_time": sum(s.active_seconds for s in sessions),
+                       "session_count": len(sessions)}
+            for app_name, sessions in data.items()
+        }
+        self.data_version = 1
+        self.store = SimpleNamespace(epoch="e1")
+        self.is_running = False
+        self.current_session = None
+        self.renders = 0
+
+    def changes_since(self, cursor, limit):
+        return {"cursor": cursor, "limit": limit}
+
+
+@pytest.fixture
+def api():
+    tracker = FakeTracker({
+        "code.exe": [make_session("code.exe", minute, 600, category="development") for minute in (0, 20, 40)],
+        "chrome.exe": [make_session("chrome.exe", 10, 300, idle_time=100, category="browser")]
+    })
+    api = TrackerQueryAPI(tracker)
+    sessions = api.routes["/sessions"]
+
+    def counting(params):
+        tracker.renders += 1
+        return sessions(params)
+
+    api.routes["/sessions"] = counting
+    return api
+
+
+def body(response):
+    status, version, payload = response
+    return status, json.loads(payload)
+
+
+def test_top_apps_and_sessions_pages(api):
+    status, result = body(api.handle("/top-apps?limit=1"))
+    assert status == 200
+    assert result["apps"] == [{"app_name": "code.exe", "category": "development", "total_time": 1800, "sessions": 3}]
+
+    _, page = body(api.handle("/sessions?offset=1&limit=2"))
+    assert (page["offset"], page["total"]) == (1, 4)
+    assert [(s["app_name"], s["start"][-8:]) for s in page["sessions"]] == \
+        [("code.exe", "09:20:00"), ("chrome.exe", "09:10:00")]
+
+    _, page = body(api.handle("/sessions?app=chrome.exe"))
+    assert [s["app_name"] for s in page["sessions"]] == ["chrome.exe"]
+
+
+def test_range_counts_active_time(api):
+    _, result = body(api.handle("/range?start=2024-01-01"))
+    assert (result["total_time"], result["sessions"]) == (2000, 4)
+    assert result["apps"][1] == {"app_name": "chrome.exe", "category": "browser", "total_time": 200, "sessions": 1}
+
+
+def test_bodies_are_cached_until_the_version_changes(api):
+    first = api.handle("/sessions?limit=2")
+    assert api.handle("/sessions?limit=2") == first
+    assert api.tracker.renders == 1
+
+    api.tracker.data_version = 2
+    status, version, _ = api.handle("/sessions?limit=2")
+    assert (status, version, api.tracker.renders) == (200, 2, 2)
+
+    # The summary reports the current session, so it is rendered every time
+    assert not api.is_cacheable("/summary") and not api.is_cacheable("/changes?cursor=x")
+    assert api.is_cacheable("/sessions?limit=2")
+
+
+@pytest.mark.parametrize("path, message", [
+    ("/range", "start is required"),
+    ("/range?start=2024-01-02&end=2024-01-01", "end is before start"),
+    ("/sessions?date=yesterday", "date must be YYYY-MM-DD"),
+    ("/top-apps?limit=ten", "limit must be an integer"),
+])
+def test_malformed_queries_are_bad_requests(api, path, message):
+    assert body(api.handle(path)) == (400, {"error": message})
+
+
+def test_unknown_routes_are_not_found(api):
+    assert api.handle("/nope")[0] == 404
+
+
+def test_etag_carries_the_store_epoch(api):
+    assert api.etag(3) == '"e1:3"'
+    api.tracker.store.epoch = "e2"
+    assert api.etag(3) == '"e2:3"'
+
+
+def test_http_revalidation(api):
+    server = api.serve(0)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with urllib.request.urlopen(f"{url}/sessions?limit=1") as response:
+            etag = response.headers["ETag"]
+            assert (etag, json.load(response)["total"]) == ('"e1:1"', 4)
+
+        request = urllib.request.Request(f"{url}/sessions?limit=1", headers={"If-None-Match": etag})
+        with pytest.raises(urllib.error.HTTPError) as not_modified:
+            urllib.request.urlopen(request)
+        assert not_modified.value.code == 304
+
+        api.tracker.data_version = 2
+        with urllib.request.urlopen(request) as response:
+            assert response.headers["ETag"] == '"e1:2"'
+    finally:
+        api.shutdown()
@@ -0,0 +1,54 @@
+from backend.resources import ResourceSampler, RingBuffer
+
+
+def test_ring_buffer_keeps_the_newest_values_in_order():
+    buffer = RingBuffer(3)
+    assert buffer.last() is None
+    for value in range(5):
+        buffer.append(value)
+    assert buffer.values() == [2, 3, 4]
+    assert (len(buffer), buffer.last()) == (3, 4)
+
+
+def test_samples_roll_up_into_minute_buckets():
+    sampler = ResourceSampler()
+    for timestamp, cpu, memory in [(0, 10, 100), (30, 30, 300), (59, 20, 200), (60, 5, 50)]:
+        sampler.record("code.exe", cpu, memory, timestamp=timestamp)
+
+    rows = sampler.get_series("code.exe")
+    assert rows[0] == {"timestamp": 0, "cpu_min": 10, "cpu_avg": 20, "cpu_max": 30,
+                       "memory_min": 100, "memory_avg": 200, "memory_max": 300}
+    # The bucket still being filled comes last
+    assert rows[1]["partial"] and (rows[1]["timestamp"], rows[1]["cpu_avg"]) == (60, 5)
+
+    hours = sampler.get_series("code.exe", resolution="hour")
+    assert len(hours) == 1 and hours[0]["cpu_avg"] == 16.25
+
+
+def test_rollups_are_bounded_by_their_capacity():
+    sampler = ResourceSampler(raw_capacity=5, minute_capacity=3)
+    for minute in range(10):
+        sampler.record("code.exe", minute, 1, timestamp=minute * 60)
+
+    closed = [row for row in sampler.get_series("code.exe") if not row.get("partial")]
+    assert [row["timestamp"] for row in closed] == [360, 420, 480]
+    assert sampler.get_raw_series("code.exe")["cpu_percent"] == [5, 6, 7, 8, 9]
+
+
+def test_least_recently_seen_apps_are_forgotten():
+    sampler = ResourceSampler(max_apps=2)
+    for app_name in ("a.exe", "b.exe", "a.exe", "c.exe"):
+        sampler.record(app_name, 1, 1, timestamp=0)
+    assert sampler.tracked_apps() == ["a.exe", "c.exe"]
+    assert sampler.get_series("b.exe") == []
+
+
+def test_session_summary_covers_samples_since_the_session_started():
+    sampler = ResourceSampler()
+    sampler.record("code.exe", 50, 500, timestamp=0)
+    sampler.start_session()
+    assert sampler.session_summary() == {}
+    for cpu in (10, 30):
+        sampler.record("chrome.exe", cpu, 200, timestamp=1)
+    assert sampler.session_summary() == {"samples": 2, "cpu_avg": 20, "cpu_max": 30,
+                                         "memory_avg_mb": 200, "memory_max_mb": 200}
@@ -0,0 +1,113 @@
+import asyncio
+import contextlib
+from types import SimpleNamespace
+
+from backend.runtime import AsyncTrackerRuntime, put_drop_oldest
+
+
+class FakeTracker:
+    """The parts of EnhancedAppUsageTracker the runtime drives.
+
+    Every poll ends a session; ending the open session on stop does too.
+    """
+
+    def __init__(self):
+        self.listeners = []
+        self.is_running = False
+        self.polls = 0
+        self.written = []
+        self.stats = []
+        self.published = []
+        self.scheduler = SimpleNamespace(reset=lambda: None)
+        self.logger = SimpleNamespace(info=lambda message: None, error=self.fail)
+        self.profiler = SimpleNamespace(iteration=contextlib.nullcontext)
+        self.store = SimpleNamespace(snapshot=lambda: {"polls": self.polls})
+        self.data_manager = SimpleNamespace(
+            build_enhanced_data=dict,
+            write_log=self.written.append,
+            _save_statistics=self.stats.append
+        )
+
+    @staticmethod
+    def fail(message):
+        raise AssertionError(message)
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self.listeners.remove(listener)
+
+    def start_servers(self):
+        pass
+
+    def poll_once(self, save=True):
+        self.polls += 1
+        self._notify("session_ended", {"poll": self.polls})
+        return 0.001
+
+    def _end_current_session(self, save=True):
+        self._notify("session_ended", {"poll": "final"})
+
+    def _notify(self, event_type, payload):
+        for listener in self.listeners:
+            listener(event_type, payload)
+
+    def dashboard_snapshot(self):
+        return {"polls": self.polls}
+
+    def publish_dashboard(self, snapshot):
+        self.published.append(snapshot)
+
+
+async def run_until(runtime, condition, subscriber_size=None):
+    task = asyncio.create_task(runtime.run())
+    while runtime._stopping is None:
+        await asyncio.sleep(0)
+    events = runtime.subscribe(subscriber_size)
+    while not condition():
+        await asyncio.sleep(0.001)
+    runtime.request_stop()
+    await task
+    received = []
+    while not events.empty():
+        received.append(events.get_nowait())
+    return received
+
+
+def test_stop_drains_saves_stats_and_events():
+    tracker = FakeTracker()
+    runtime = AsyncTrackerRuntime(tracker)
+    events = asyncio.run(run_until(runtime, lambda: tracker.polls >= 3))
+
+    # The last write holds the session closed while stopping
+    assert tracker.written[-1] == {"polls": tracker.polls}
+    assert tracker.stats[-1] == tracker.written[-1]
+    assert tracker.published[-1] == {"polls": tracker.polls}
+    assert runtime.saves_completed == len(tracker.written)
+    # One save per ended session, coalesced while one is pending, plus the final save
+    assert runtime.saves_completed + runtime.coalesced_saves == tracker.polls + 2
+    assert events[-2] == ("session_ended", {"poll": "final"})
+    assert events[-1][0] == "stop"
+    assert not tracker.listeners and not tracker.is_running
+
+
+def test_slow_subscribers_lose_their_oldest_events():
+    tracker = FakeTracker()
+    runtime = AsyncTrackerRuntime(tracker)
+    events = asyncio.run(run_until(runtime, lambda: tracker.polls >= 10, subscriber_size=3))
+
+    assert len(events) == 3
+    assert events[-1][0] == "stop"
+    assert runtime.dropped_events >= tracker.polls + 2 - 3
+
+
+def test_put_drop_oldest_discards_the_head():
+    async def fill():
+        queue = asyncio.Queue(maxsize=2)
+        drops = []
+        for item in range(4):
+            put_drop_oldest(queue, item, lambda: drops.append(True))
+        return [queue.get_nowait() for _ in range(queue.qsize())], len(drops)
+
+    assert asyncio.run(fill()) == ([2, 3], 2)
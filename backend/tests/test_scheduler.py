@@ -0,0 +1,57 @@
+from types import SimpleNamespace
+
+from backend.scheduler import AdaptivePollingScheduler
+
+
+def make_scheduler(**options):
+    return AdaptivePollingScheduler(**{"base_interval": 4, "min_interval": 1, "max_interval": 32,
+                                       "backoff_factor": 2, "switch_window": 60, **options})
+
+
+def test_switches_poll_at_the_minimum_interval():
+    scheduler = make_scheduler()
+    assert scheduler.record_sample(switched=True, now=0) == 1
+    assert scheduler.estimated_error_seconds == 2  # half of the interval before the switch
+
+
+def test_recent_switches_relax_only_to_the_base_interval():
+    scheduler = make_scheduler()
+    scheduler.record_sample(switched=True, now=0)
+    intervals = [scheduler.record_sample(switched=False, now=t) for t in (1, 3, 7, 11)]
+    assert intervals == [2, 4, 4, 4]
+
+
+def test_stable_sessions_back_off_to_the_maximum_once_switches_age_out():
+    scheduler = make_scheduler()
+    scheduler.record_sample(switched=True, now=0)
+    assert scheduler.record_sample(switched=False, now=30) == 2
+    intervals = [scheduler.record_sample(switched=False, now=t) for t in (61, 62, 63, 64, 65)]
+    assert intervals == [4, 8, 16, 32, 32]
+
+
+def test_idleness_backs_off_twice_as_fast():
+    scheduler = make_scheduler()
+    assert [scheduler.record_sample(switched=False, idle=True, now=t) for t in range(3)] == [16, 32, 32]
+    assert scheduler.idle_samples == 3
+
+
+def test_bounds_always_include_the_base_interval():
+    scheduler = AdaptivePollingScheduler(base_interval=5, min_interval=10, max_interval=2, backoff_factor=0.5)
+    assert (scheduler.min_interval, scheduler.max_interval, scheduler.backoff_factor) == (5, 5, 1)
+
+
+def test_reconfigure_clamps_the_current_interval():
+    scheduler = make_scheduler()
+    scheduler.record_sample(switched=False, idle=True, now=0)
+    scheduler.reconfigure(SimpleNamespace(check_interval=4, min_check_interval=1, max_check_interval=8))
+    assert scheduler.interval == 8
+    assert scheduler.total_samples == 1
+
+
+def test_stats_report_the_error_per_switch():
+    scheduler = make_scheduler()
+    for now in (0, 1, 2):
+        scheduler.record_sample(switched=True, now=now)
+    stats = scheduler.get_stats()
+    assert (stats["total_switches"], stats["estimated_error_seconds"]) == (3, 3)
+    assert stats["average_error_per_switch"] == 1
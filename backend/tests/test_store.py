@@ -0,0 +1,103 @@
+import pytest
+
+from backend.store import SessionStore
+from backend.tests.sessions import make_session
+
+
+def session_ids(data):
+    return sorted(session.session_id for sessions in data.values() for session in sessions)
+
+
+def test_rebase_replays_sessions_appended_since_the_base():
+    store = SessionStore({"code.exe": [make_session("code.exe", 0, 60)]})
+    base = store.snapshot()
+    recorded = [make_session("code.exe", 10, 60), make_session("chrome.exe", 12, 60)]
+    for session in recorded:
+        store.append(session)
+
+    merged = {app: list(sessions) for app, sessions in base.items()}
+    merged.setdefault("slack.exe", []).append(make_session("slack.exe", 5, 60))
+    store.rebase(merged, base)
+
+    assert session_ids(store.snapshot()) == session_ids(
+        {"a": merged["code.exe"] + merged["slack.exe"] + recorded}
+    )
+
+
+def test_rebase_does_not_replay_sessions_the_data_holds():
+    store = SessionStore()
+    base = store.snapshot()
+    recorded = make_session("code.exe", 10, 60)
+    store.append(recorded)
+
+    store.rebase({"code.exe": [make_session("code.exe", 10, 60)]}, base)
+
+    assert len(store.snapshot()["code.exe"]) == 1
+
+
+def test_rebase_survives_a_wrapped_journal():
+    store = SessionStore(journal_size=2)
+    base = store.snapshot()
+    recorded = [make_session("code.exe", minute, 30) for minute in range(10)]
+    for session in recorded:
+        store.append(session)
+
+    store.rebase({}, base)
+
+    assert session_ids(store.snapshot()) == session_ids({"a": recorded})
+
+
+def test_rebase_refuses_data_replaced_after_the_base():
+    store = SessionStore()
+    base = store.snapshot()
+    store.replace({"code.exe": [make_session("code.exe", 0, 60)]})
+
+    with pytest.raises(ValueError):
+        store.rebase({}, base)
+
+
+def test_changes_since_pages_through_appends():
+    store = SessionStore()
+    recorded = [make_session("code.exe", minute, 30) for minute in range(5)]
+    for session in recorded:
+        store.append(session)
+
+    cursor, sessions = store.changes_since(0, limit=3)
+    assert (cursor, sessions) == (3, recorded[:3])
+    cursor, sessions = store.changes_since(cursor)
+    assert (cursor, sessions) == (5, recorded[3:])
+    assert store.changes_since(cursor) == (5, [])
+
+
+def test_changes_since_needs_a_reload_after_compaction():
+    store = SessionStore(journal_size=2)
+    recorded = [make_session("code.exe", minute, 30) for minute in range(5)]
+    for session in recorded:
+        store.append(session)
+
+    # The journal was compacted to the newest two appends before the fifth
+    assert store.changes_since(0) == (5, None)
+    assert store.changes_since(2) == (5, recorded[2:])
+
+
+def test_changes_since_needs_a_reload_after_replace():
+    store = SessionStore()
+    store.append(make_session("code.exe", 0, 30))
+    version = store.replace({"chrome.exe": [make_session("chrome.exe", 1, 30)]})
+    recorded = make_session("code.exe", 2, 30)
+    store.append(recorded)
+
+    assert store.changes_since(1) == (version + 1, None)
+    assert store.changes_since(version) == (version + 1, [recorded])
+
+
+def test_snapshots_do_not_see_later_writes():
+    store = SessionStore({"code.exe": [make_session("code.exe", 0, 30)]})
+    snapshot = store.snapshot()
+    store.append(make_session("code.exe", 1, 30))
+    store.append(make_session("chrome.exe", 2, 30))
+
+    assert list(snapshot) == ["code.exe"]
+    assert len(snapshot["code.exe"]) == 1
+    assert snapshot.appended_since(snapshot.version) == []
+    assert len(store.snapshot()["code.exe"]) == 2
@@ -0,0 +1,225 @@
+import contextlib
+import json
+import socket
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# The tracker module needs pywin32 and psutil
+psutil = pytest.importorskip("psutil")
+pytest.importorskip("win32gui")
+pytest.importorskip("win32process")
+
+from backend.enhanced_tracker import (  # noqa: E402
+    AppUsageConfig, EnhancedAppUsageTracker, EnhancedDataManager, EnhancedWindowsAppDetector, ProcessCache
+)
+from backend.tests.sessions import make_session  # noqa: E402
+
+
+class FakeProcess:
+    """psutil.Process stand-in; PIDs in `exited` raise NoSuchProcess."""
+
+    exited = set()
+    calls = []
+
+    def __init__(self, pid):
+        if pid in self.exited:
+            raise psutil.NoSuchProcess(pid)
+        self.pid = pid
+        self.alive = True
+
+    def oneshot(self):
+        return contextlib.nullcontext()
+
+    def name(self):
+        return f"app{self.pid}.exe"
+
+    def create_time(self):
+        return 1000.0
+
+    def cpu_percent(self, interval=None):
+        self.calls.append("cpu_percent")
+        return 12.5
+
+    def memory_info(self):
+        if not self.alive:
+            raise psutil.NoSuchProcess(self.pid)
+        return SimpleNamespace(rss=64 * 1024 * 1024)
+
+    def is_running(self):
+        self.calls.append("is_running")
+        return self.alive
+
+
+@pytest.fixture
+def processes(monkeypatch):
+    FakeProcess.exited = set()
+    FakeProcess.calls = []
+    monkeypatch.setattr(psutil, "Process", FakeProcess)
+    return FakeProcess
+
+
+def test_cache_hits_make_no_liveness_checks(processes):
+    cache = ProcessCache()
+    first = cache.get(7)
+    assert cache.get(7) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert "is_running" not in processes.calls
+
+
+def test_cache_evicts_the_least_recently_used(processes):
+    cache = ProcessCache(max_size=2)
+    for pid in (1, 2, 1, 3):
+        cache.get(pid)
+    cache.get(2)
+    assert cache.misses == 4
+    assert len(cache) == 2
+
+
+def test_first_sample_of_a_process_has_no_cpu_reading(processes):
+    detector = EnhancedWindowsAppDetector()
+    samples = [detector._sample_process(7)[1:] for _ in range(3)]
+    assert samples == [(None, 64.0), (12.5, 64.0), (12.5, 64.0)]
+    # One priming call, then one per later poll
+    assert processes.calls.count("cpu_percent") == 3
+
+
+def test_an_exited_cached_process_is_looked_up_again(processes):
+    detector = EnhancedWindowsAppDetector()
+    entry, _, _ = detector._sample_process(7)
+    entry["process"].alive = False
+
+    fresh, cpu_percent, _ = detector._sample_process(7)
+    assert fresh is not entry and cpu_percent is None
+
+    processes.exited.add(7)
+    fresh["process"].alive = False
+    with pytest.raises(psutil.NoSuchProcess):
+        detector._sample_process(7)
+    assert len(detector.process_cache) == 0
+
+
+def test_usage_patterns_count_active_time(tmp_path):
+    manager = EnhancedDataManager(str(tmp_path / "log.json"))
+    sessions = [make_session("code.exe", 0, 600, idle_time=200), make_session("code.exe", 60 * 24, 300)]
+
+    assert manager._calculate_daily_usage(sessions) == {"2024-01-01": 400, "2024-01-02": 300}
+    assert manager._calculate_hourly_pattern(sessions)["9"] == 700
+
+
+@pytest.fixture
+def tracker(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    tracker = EnhancedAppUsageTracker(str(tmp_path / "config.json"), load_history=False)
+    yield tracker
+    tracker.close()
+
+
+def test_recorded_sessions_publish_new_stats(tracker):
+    before = tracker.app_stats
+    version = tracker.data_version
+    tracker._record_session(make_session("code.exe", 0, 600, idle_time=100))
+    tracker._record_session(make_session("code.exe", 20, 60))
+
+    assert before == {}
+    assert tracker.app_stats["code.exe"]["total_time"] == 560
+    assert tracker.app_stats["code.exe"]["session_count"] == 2
+    assert tracker.data_version == version + 2
+    assert tracker.history_index.count() == 2
+
+
+def test_replaced_data_rebuilds_the_aggregates_and_notifies(tracker):
+    events = []
+    tracker.add_listener(lambda event_type, payload: events.append((event_type, payload)))
+    tracker._record_session(make_session("code.exe", 0, 600))
+
+    tracker.data = {"chrome.exe": [make_session("chrome.exe", 0, 120)]}
+    tracker.mark_data_changed()
+
+    assert list(tracker.app_stats) == ["chrome.exe"]
+    assert [s.app_name for s in tracker.history_index.page(0, 10)] == ["chrome.exe"]
+    assert events == [("data_changed", {"version": tracker.data_version})]
+
+
+def test_replace_data_swaps_in_new_history(tracker):
+    tracker._record_session(make_session("code.exe", 0, 600))
+    tracker.replace_data({"chrome.exe": [make_session("chrome.exe", 0, 120)]})
+
+    assert list(tracker.data) == ["chrome.exe"]
+    assert list(tracker.app_stats) == ["chrome.exe"]
+    tracker.replace_data({})
+    assert tracker.app_stats == {} and tracker.history_index.count() == 0
+
+
+def test_a_taken_query_port_does_not_stop_the_tracker(tracker):
+    with socket.socket() as taken:
+        taken.bind(("127.0.0.1", 0))
+        taken.listen()
+        tracker.config.query_api_port = taken.getsockname()[1]
+        tracker.start_servers()
+    assert tracker.query_api._server is None
+
+
+def test_optional_subsystems_are_imported_on_first_use():
+    modules = ["backend.events", "backend.ingest", "backend.merge", "backend.query_api"]
+    code = f"import sys, backend.enhanced_tracker; print([m for m in {modules!r} if m in sys.modules])"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+def write_config(path, **values):
+    path.write_text(json.dumps({"config_check_interval": 0, **values}))
+
+
+def test_config_validation():
+    config = AppUsageConfig("missing.json")
+    assert config.validate({"check_interval": 2, "log_level": "debug", "unknown": object()}) == {}
+    assert config.validate({"check_interval": "5"}) == {"check_interval": "check_interval: expected int, got str"}
+    assert config.validate({"idle_threshold": True}) == {"idle_threshold": "idle_threshold: expected int, got bool"}
+    assert config.validate({"check_interval": 0}) == {"check_interval": "check_interval: must be at least 0.1"}
+    assert "log_level" in config.validate({"log_level": "verbose"})
+    assert "max_check_interval" in config.validate({"min_check_interval": 10, "max_check_interval": 5})
+
+
+def test_invalid_settings_in_the_file_use_their_defaults(tmp_path):
+    path = tmp_path / "config.json"
+    write_config(path, check_interval=-1, idle_threshold=60)
+    config = AppUsageConfig(str(path))
+    assert (config.check_interval, config.idle_threshold) == (5, 60)
+
+
+def test_reload_applies_changed_live_settings(tmp_path):
+    path = tmp_path / "config.json"
+    write_config(path, idle_threshold=60)
+    config = AppUsageConfig(str(path))
+    assert not config.reload_if_changed()
+
+    write_config(path, idle_threshold=120, check_interval=2)
+    assert config.reload_if_changed()
+    assert (config.idle_threshold, config.check_interval, config.version) == (120, 2, 1)
+
+    # A file that fails validation keeps the current settings
+    write_config(path, idle_threshold="often")
+    assert not config.reload_if_changed()
+    assert config.idle_threshold == 120
+
+
+def test_restart_settings_are_saved_but_not_applied(tmp_path):
+    path = tmp_path / "config.json"
+    write_config(path)
+    config = AppUsageConfig(str(path))
+
+    write_config(path, metrics_port=9100, idle_threshold=60)
+    assert config.reload_if_changed()
+    assert (config.metrics_port, config.idle_threshold) == (0, 60)
+    assert config._pending_restart == {"metrics_port": 9100}
+
+    config.update({"heartbeat_interval": 10})
+    saved = json.loads(path.read_text())
+    assert (saved["metrics_port"], saved["heartbeat_interval"]) == (9100, 10)
+    assert not config.reload_if_changed()  # Its own save is not a change
+
+    with pytest.raises(ValueError):
+        config.update({"heartbeat_interval": -1})
@@ -0,0 +1,114 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+# The GUI module needs Tk, pywin32 and psutil
+pytest.importorskip("tkinter")
+pytest.importorskip("psutil")
+pytest.importorskip("win32gui")
+pytest.importorskip("win32process")
+
+from backend.enhanced_tracker import EnhancedUsageAnalyzer  # noqa: E402
+from backend.tests.sessions import make_session  # noqa: E402
+from backend import ui  # noqa: E402
+from backend.ui import AppUsageTrackerGUI, TreeviewModel  # noqa: E402
+
+
+def test_applications_rows_rank_apps_by_total_time():
+    app_stats = {
+        "code.exe": {"category": "development", "total_time": 600, "session_count": 3, "last_used": None},
+        "chrome.exe": {"category": "browser", "total_time": 900, "session_count": 0, "last_used": None},
+        "slack.exe": {"category": "communication", "total_time": 60, "session_count": 1, "last_used": None}
+    }
+    categories, rows = AppUsageTrackerGUI.compute_applications_rows(app_stats, limit=2)
+
+    assert categories == ["browser", "communication", "development"]
+    assert [(row["app_name"], row["avg_session"]) for row in rows] == [("chrome.exe", 0), ("code.exe", 200)]
+
+
+def test_hourly_pattern_counts_active_hours():
+    analyzer = EnhancedUsageAnalyzer({"code.exe": [make_session("code.exe", 0, 7200, idle_time=3600)]})
+    hours, times = AppUsageTrackerGUI.compute_hourly_pattern(analyzer)
+
+    assert hours == list(range(24))
+    assert times[9] == 1 and sum(times) == 1
+
+
+def test_daily_usage_covers_the_last_week():
+    today = datetime.now().replace(hour=9, minute=0, second=0, microsecond=0)
+    session = make_session("code.exe", 0, 3600)
+    session.start_time, session.end_time = today, today.replace(hour=10)
+    dates, times = AppUsageTrackerGUI.compute_daily_usage(EnhancedUsageAnalyzer({"code.exe": [session]}))
+
+    assert len(dates) == 7 and dates[0] == today.strftime("%Y-%m-%d")
+    assert times[0] > 0 and sum(times[1:]) == 0
+
+
+class FakeTree:
+    """ttk.Treeview stand-in recording the calls that change it."""
+
+    def __init__(self):
+        self.items = []
+        self.calls = []
+
+    def yview(self):
+        return (0.25, 0.5)
+
+    def yview_moveto(self, fraction):
+        self.calls.append(("yview_moveto", fraction))
+
+    def insert(self, parent, index, iid, values):
+        self.items.insert(index, iid)
+        self.calls.append(("insert", iid))
+
+    def item(self, iid, values):
+        self.calls.append(("item", iid))
+
+    def delete(self, *iids):
+        self.items = [iid for iid in self.items if iid not in iids]
+        self.calls.append(("delete",) + iids)
+
+    def move(self, iid, parent, index):
+        self.items.remove(iid)
+        self.items.insert(index, iid)
+        self.calls.append(("move", iid))
+
+
+def test_treeview_model_applies_only_the_differences():
+    tree = FakeTree()
+    model = TreeviewModel(tree)
+    model.apply([("a", (1,)), ("b", (2,)), ("c", (3,))])
+    tree.calls.clear()
+
+    model.apply([("a", (1,)), ("b", (20,)), ("c", (3,))])
+    assert tree.calls == [("item", "b"), ("yview_moveto", 0.25)]
+
+    tree.calls.clear()
+    model.apply([("c", (3,)), ("a", (1,)), ("d", (4,)), ("d", (5,))])
+    assert ("delete", "b") in tree.calls and ("insert", "d") in tree.calls
+    assert tree.items == ["c", "a", "d"]
+    assert model.values["d"] == (4,)
+
+
+def test_treeview_model_keeps_the_order_when_unchanged():
+    tree = FakeTree()
+    model = TreeviewModel(tree)
+    model.apply([("a", (1,)), ("b", (2,))])
+    tree.calls.clear()
+    model.apply([("a", (1,)), ("b", (2,))])
+    assert tree.calls == [("yview_moveto", 0.25)]
+
+
+@pytest.mark.parametrize("action", ["new_session", "load_data", "merge_logs", "save_data"])
+def test_data_actions_wait_for_the_history(monkeypatch, action):
+    prompts = []
+    monkeypatch.setattr(ui.messagebox, "showinfo", lambda title, message: prompts.append(title))
+    monkeypatch.setattr(ui.messagebox, "askyesno", lambda *args: pytest.fail("asked to confirm"))
+    monkeypatch.setattr(ui.filedialog, "askopenfilename", lambda **options: pytest.fail("asked for a file"))
+    monkeypatch.setattr(ui.filedialog, "askopenfilenames", lambda **options: pytest.fail("asked for files"))
+    gui = SimpleNamespace(history_loaded=False, run_in_background=lambda *args, **kwargs: pytest.fail("ran"))
+    gui._history_ready = lambda: AppUsageTrackerGUI._history_ready(gui)
+
+    getattr(AppUsageTrackerGUI, action)(gui)
+    assert prompts == ["Please Wait"]
@@ -1,41 +1,183 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.dates as mdates
 from datetime import datetime, timedelta
 import json
-import threading
 import queue
+from concurrent.futures import ThreadPoolExecutor
 import os
+import time
 from pathlib import Path
 
 # Import your enhanced tracker classes
-from backend.enhanced_tracker import EnhancedAppUsageTracker, EnhancedUsageAnalyzer
+from backend.dashboard import PRODUCTIVE_CATEGORIES
+from backend.enhanced_tracker import EnhancedAppUsageTracker, EnhancedUsageAnalyzer, SafeLogger
+from backend.profiling import LoopProfiler
+
+# matplotlib is slow to import, so the chart layer loads on first use
+_chart_panel_class = None
+
+def load_chart_panel():
+    """Import matplotlib and the chart layer on first use."""
+    global _chart_panel_class
+    if _chart_panel_class is None:
+        import matplotlib.pyplot as plt
+        from backend.charts import ChartPanel
+        
+        # Setup chart styling
+        plt.style.use('seaborn-v0_8')
+        plt.rcParams['figure.facecolor'] = 'white'
+        plt.rcParams['axes.facecolor'] = 'white'
+        _chart_panel_class = ChartPanel
+    return _chart_panel_class
+
+# Widgets refreshed for each tracker event
+EVENT_WIDGETS = {
+    "session_started": set(),
+    "session_ended": {"dashboard", "apps", "activity", "history"},
+    "data_changed": {"dashboard", "apps", "activity", "history"}
+}
+
+# Notebook tab that owns each refreshable widget
+WIDGET_TABS = {
+    "dashboard": "Dashboard",
+    "activity": "Dashboard",
+    "apps": "Applications",
+    "history": "History"
+}
+
+class TreeviewModel:
+    """Keyed row model that applies minimal diffs to a ttk.Treeview.
+    
+    Rows are identified by a stable key used as the item id, so updates
+    touch only inserted, changed, moved or removed rows, and selection
+    and scroll position survive refreshes.
+    """
+    
+    def __init__(self, tree):
+        self.tree = tree
+        self.order = []
+        self.values = {}
+    
+    def apply(self, rows):
+        """Make the tree show rows, a list of (key, values) tuples in order."""
+        wanted = []
+        wanted_values = {}
+        for key, values in rows:
+            if key not in wanted_values:  # Item ids must be unique
+                wanted.append(key)
+                wanted_values[key] = tuple(values)
+        
+        first_visible = self.tree.yview()[0]
+        
+        # Delete rows that went away
+        removed = [key for key in self.order if key not in wanted_values]
+        if removed:
+            self.tree.delete(*removed)
+            for key in removed:
+                del self.values[key]
+        
+        # Insert new rows and update changed ones
+        for index, key in enumerate(wanted):
+            values = wanted_values[key]
+            if key not in self.values:
+                self.tree.insert("", index, iid=key, values=values)
+            elif self.values[key] != values:
+                self.tree.item(key, values=values)
+            self.values[key] = values
+        
+        # Reorder only if the order actually changed
+        current = [key for key in self.order if key in wanted_values]
+        current += [key for key in wanted if key not in current]
+        if current != wanted:
+            for index, key in enumerate(wanted):
+                self.tree.move(key, "", index)
+        
+        self.order = wanted
+        self.tree.yview_moveto(first_visible)
+    
+    def clear(self):
+        self.apply([])
 
 class AppUsageTrackerGUI:
     """Main GUI class for the Application Usage Tracker."""
     
+    # Status tick, and the minimum gap between expensive widget refreshes
+    REFRESH_INTERVAL_MS = 1000
+    HEAVY_REFRESH_MIN_GAP = 2.0
+    RESULT_POLL_MS = 50
+    HISTORY_PAGE_SIZE = 50
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Application Usage Tracker")
         self.root.geometry("1200x800")
         self.root.configure(bg='#f0f0f0')
         
-        # Initialize tracker
-        self.tracker = EnhancedAppUsageTracker()
+        # Initialize tracker; history loads in the background after first paint
+        self.tracker = EnhancedAppUsageTracker(load_history=False)
+        self.history_loaded = False
         self.is_tracking = False
-        self.tracking_thread = None
         self.update_queue = queue.Queue()
         
+        # Widgets whose inputs changed since their last refresh
+        self._dirty = set()
+        self._last_heavy_refresh = 0.0
+        self.tracker.add_listener(self._on_tracker_event)
+        
+        # Analytics run on a worker pool; results come back via update_queue
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="gui-worker")
+        self._pending = {}
+        self._request_tokens = {}
+        self._result_poll_scheduled = False
+        
+        # Opt-in profiling of the refresh loop (off by default)
+        self.gui_profiler = LoopProfiler.from_config(
+            "update_gui", self.tracker.config, output_dir=str(Path(SafeLogger.LOG_FILE).resolve().parent)
+        )
+        
+        # Tabs are built on first activation
+        self._tab_builders = {}
+        self._built_tabs = set()
+        
         # Create GUI elements
         self.create_widgets()
         self.create_menu()
-        self.setup_charts()
         
-        # Start periodic updates
+        # Let the window paint before doing any heavy work
+        self.root.after_idle(lambda: self.root.after(0, self._finish_startup))
+    
+    def _finish_startup(self):
+        """Build the visible tab, start loading history and begin periodic updates."""
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        self._on_tab_changed()
+        self.load_history()
         self.update_gui()
     
+    def load_history(self):
+        """Load the usage history in the background behind a placeholder."""
+        self.status_label.config(text="Status: Loading history...")
+        self.run_in_background(
+            "history",
+            self._load_and_attach_history,
+            self._on_history_loaded,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to load history: {e}")
+        )
+    
+    def _load_and_attach_history(self):
+        """Read the log and install it in the tracker; runs on the worker pool.
+        
+        attach_history rebuilds the stats and history index off to the side
+        and swaps them in at the end, so the Tk thread never waits on it.
+        """
+        self.tracker.attach_history(self.tracker.data_manager.load_data())
+    
+    def _on_history_loaded(self, _result):
+        """Enable tracking once the history is installed."""
+        self.history_loaded = True
+        self.start_stop_btn.state(["!disabled"])
+        if not self.is_tracking:
+            self.status_label.config(text="Status: Not tracking")
+    
     def create_widgets(self):
         """Create all GUI widgets."""
         # Main container
@@ -62,7 +204,7 @@ class AppUsageTrackerGUI:
         control_frame = ttk.LabelFrame(parent, text="Control Panel", padding="10")
         control_frame.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
         
-        # Start/Stop button
+        # Start/Stop button (enabled once history has loaded)
         self.start_stop_btn = ttk.Button(
             control_frame, 
             text="Start Tracking", 
@@ -70,6 +212,7 @@ class AppUsageTrackerGUI:
             style="Success.TButton"
         )
         self.start_stop_btn.grid(row=0, column=0, padx=(0, 10))
+        self.start_stop_btn.state(["disabled"])
         
         # Backup button
         backup_btn = ttk.Button(
@@ -121,22 +264,34 @@ class AppUsageTrackerGUI:
         self.notebook = ttk.Notebook(parent)
         self.notebook.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
         
-        # Dashboard Tab
-        self.create_dashboard_tab()
-        
-        # Applications Tab
-        self.create_applications_tab()
-        
-        # Analytics Tab
-        self.create_analytics_tab()
-        
-        # Reports Tab
-        self.create_reports_tab()
+        # Add empty tabs; each is filled in on first activation
+        for name, builder in (
+            ("Dashboard", self.create_dashboard_tab),
+            ("Applications", self.create_applications_tab),
+            ("History", self.create_history_tab),
+            ("Analytics", self.create_analytics_tab),
+            ("Reports", self.create_reports_tab)
+        ):
+            frame = ttk.Frame(self.notebook)
+            self.notebook.add(frame, text=name)
+            self._tab_builders[name] = (frame, builder)
     
-    def create_dashboard_tab(self):
+    def _on_tab_changed(self, event=None):
+        """Build the selected tab the first time it is shown."""
+        name = self.notebook.tab(self.notebook.select(), "text")
+        if name in self._built_tabs:
+            return
+        
+        frame, builder = self._tab_builders[name]
+        builder(frame)
+        self._built_tabs.add(name)
+        
+        # Fill the new tab's widgets
+        self._dirty |= {widget for widget, tab in WIDGET_TABS.items() if tab == name}
+        self._refresh_dirty_widgets()
+    
+    def create_dashboard_tab(self, dashboard_frame):
         """Create the dashboard tab with overview."""
-        dashboard_frame = ttk.Frame(self.notebook)
-        self.notebook.add(dashboard_frame, text="Dashboard")
         
         # Configure grid
         dashboard_frame.columnconfigure(0, weight=1)
@@ -159,10 +314,8 @@ class AppUsageTrackerGUI:
         self.create_dashboard_charts(chart_frame, category_frame)
         self.create_activity_list(activity_frame)
     
-    def create_applications_tab(self):
+    def create_applications_tab(self, apps_frame):
         """Create the applications tab with detailed app info."""
-        apps_frame = ttk.Frame(self.notebook)
-        self.notebook.add(apps_frame, text="Applications")
         
         # Configure grid
         apps_frame.columnconfigure(0, weight=1)
@@ -188,10 +341,65 @@ class AppUsageTrackerGUI:
         # Applications tree
         self.create_applications_tree(apps_frame)
     
-    def create_analytics_tab(self):
+    def create_history_tab(self, history_frame):
+        """Create the history tab, a paged view over every recorded session."""
+        
+        # Configure grid
+        history_frame.columnconfigure(0, weight=1)
+        history_frame.rowconfigure(1, weight=1)
+        
+        # Filters, date jump and paging
+        history_control_frame = ttk.Frame(history_frame)
+        history_control_frame.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
+        
+        ttk.Label(history_control_frame, text="App:").grid(row=0, column=0, padx=(0, 5))
+        self.history_app_var = tk.StringVar(value="All")
+        self.history_app_combo = ttk.Combobox(history_control_frame, textvariable=self.history_app_var, state="readonly")
+        self.history_app_combo.grid(row=0, column=1, padx=(0, 10))
+        self.history_app_combo.bind('<<ComboboxSelected>>', self.filter_history)
+        
+        ttk.Label(history_control_frame, text="Category:").grid(row=0, column=2, padx=(0, 5))
+        self.history_category_var = tk.StringVar(value="All")
+        self.history_category_combo = ttk.Combobox(history_control_frame, textvariable=self.history_category_var, state="readonly")
+        self.history_category_combo.grid(row=0, column=3, padx=(0, 10))
+        self.history_category_combo.bind('<<ComboboxSelected>>', self.filter_history)
+        
+        ttk.Label(history_control_frame, text="Go to date:").grid(row=0, column=4, padx=(0, 5))
+        self.history_date_var = tk.StringVar(value=datetime.now().strftime("%Y-%m-%d"))
+        history_date_entry = ttk.Entry(history_control_frame, textvariable=self.history_date_var, width=12)
+        history_date_entry.grid(row=0, column=5, padx=(0, 5))
+        history_date_entry.bind('<Return>', self.go_to_history_date)
+        ttk.Button(history_control_frame, text="Go", command=self.go_to_history_date).grid(row=0, column=6, padx=(0, 10))
+        
+        ttk.Button(history_control_frame, text="◀ Newer", command=lambda: self.page_history(-1)).grid(row=0, column=7)
+        ttk.Button(history_control_frame, text="Older ▶", command=lambda: self.page_history(1)).grid(row=0, column=8, padx=(5, 10))
+        self.history_page_label = ttk.Label(history_control_frame, text="")
+        self.history_page_label.grid(row=0, column=9)
+        
+        # Only one page of sessions is ever inserted into the tree
+        columns = ("Date", "Start", "End", "Application", "Category", "Duration", "Window Title")
+        self.history_tree = ttk.Treeview(history_frame, columns=columns, show="headings", height=20)
+        column_widths = {"Date": 90, "Start": 70, "End": 70, "Application": 160,
+                        "Category": 100, "Duration": 90, "Window Title": 300}
+        for col in columns:
+            self.history_tree.heading(col, text=col)
+            self.history_tree.column(col, width=column_widths.get(col, 100))
+        
+        history_scrollbar = ttk.Scrollbar(history_frame, orient=tk.VERTICAL, command=self.history_tree.yview)
+        self.history_tree.configure(yscrollcommand=history_scrollbar.set)
+        self.history_tree.bind('<Next>', lambda e: self.page_history(1))
+        self.history_tree.bind('<Prior>', lambda e: self.page_history(-1))
+        self.history_model = TreeviewModel(self.history_tree)
+        
+        self.history_tree.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        history_scrollbar.grid(row=1, column=1, sticky=(tk.N, tk.S))
+        
+        # Offset of the first shown session, counted from the newest
+        self.history_offset = 0
+        self.history_count = 0
+    
+    def create_analytics_tab(self, analytics_frame):
         """Create the analytics tab with charts and graphs."""
-        analytics_frame = ttk.Frame(self.notebook)
-        self.notebook.add(analytics_frame, text="Analytics")
         
         # Configure grid
         analytics_frame.columnconfigure(0, weight=1)
@@ -217,11 +425,16 @@ class AppUsageTrackerGUI:
         self.analytics_chart_frame.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         self.analytics_chart_frame.columnconfigure(0, weight=1)
         self.analytics_chart_frame.rowconfigure(0, weight=1)
+        
+        # One reusable figure for every chart type, created on first use
+        self.analytics_chart = None
+        self.analytics_loading_label = ttk.Label(self.analytics_chart_frame, text="Loading...")
+        
+        # Show the default chart
+        self.update_analytics_chart()
     
-    def create_reports_tab(self):
+    def create_reports_tab(self, reports_frame):
         """Create the reports tab with text reports."""
-        reports_frame = ttk.Frame(self.notebook)
-        self.notebook.add(reports_frame, text="Reports")
         
         # Configure grid
         reports_frame.columnconfigure(0, weight=1)
@@ -254,18 +467,13 @@ class AppUsageTrackerGUI:
     
     def create_dashboard_charts(self, chart_frame, category_frame):
         """Create charts for the dashboard."""
+        ChartPanel = load_chart_panel()
+        
         # Today's usage pie chart
-        self.today_fig, self.today_ax = plt.subplots(figsize=(6, 4))
-        self.today_canvas = FigureCanvasTkAgg(self.today_fig, chart_frame)
-        self.today_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.today_chart = ChartPanel(chart_frame, figsize=(6, 4))
         
         # Category breakdown pie chart
-        self.category_fig, self.category_ax = plt.subplots(figsize=(6, 4))
-        self.category_canvas = FigureCanvasTkAgg(self.category_fig, category_frame)
-        self.category_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        
-        # Initial chart update
-        self.update_dashboard_charts()
+        self.category_chart = ChartPanel(category_frame, figsize=(6, 4))
     
     def create_activity_list(self, activity_frame):
         """Create recent activity list."""
@@ -282,6 +490,8 @@ class AppUsageTrackerGUI:
         activity_scrollbar = ttk.Scrollbar(activity_frame, orient=tk.VERTICAL, command=self.activity_tree.yview)
         self.activity_tree.configure(yscrollcommand=activity_scrollbar.set)
         
+        self.activity_model = TreeviewModel(self.activity_tree)
+        
         # Pack
         self.activity_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         activity_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
@@ -305,6 +515,7 @@ class AppUsageTrackerGUI:
         apps_h_scrollbar = ttk.Scrollbar(apps_frame, orient=tk.HORIZONTAL, command=self.apps_tree.xview)
         
         self.apps_tree.configure(yscrollcommand=apps_v_scrollbar.set, xscrollcommand=apps_h_scrollbar.set)
+        self.apps_model = TreeviewModel(self.apps_tree)
         
         # Grid
         self.apps_tree.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
@@ -321,9 +532,11 @@ class AppUsageTrackerGUI:
         menubar.add_cascade(label="File", menu=file_menu)
         file_menu.add_command(label="New Session", command=self.new_session)
         file_menu.add_command(label="Load Data", command=self.load_data)
+        file_menu.add_command(label="Merge Logs...", command=self.merge_logs)
         file_menu.add_command(label="Save Data", command=self.save_data)
         file_menu.add_separator()
         file_menu.add_command(label="Export...", command=self.export_data)
+        file_menu.add_command(label="Export for Analysis...", command=self.export_columnar)
         file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.root.quit)
         
@@ -338,12 +551,6 @@ class AppUsageTrackerGUI:
         menubar.add_cascade(label="Help", menu=help_menu)
         help_menu.add_command(label="About", command=self.show_about)
     
-    def setup_charts(self):
-        """Setup chart styling."""
-        plt.style.use('seaborn-v0_8')
-        plt.rcParams['figure.facecolor'] = 'white'
-        plt.rcParams['axes.facecolor'] = 'white'
-    
     def toggle_tracking(self):
         """Toggle tracking on/off."""
         if not self.is_tracking:
@@ -357,9 +564,9 @@ class AppUsageTrackerGUI:
         self.start_stop_btn.config(text="Stop Tracking", style="Danger.TButton")
         self.status_label.config(text="Status: Tracking active")
         
-        # Start tracking thread
-        self.tracking_thread = threading.Thread(target=self.tracking_worker, daemon=True)
-        self.tracking_thread.start()
+        # Start the async tracker runtime in its own thread
+        runtime = self.tracker.start_tracking_async()
+        runtime.on_error = lambda e: self.update_queue.put(("error", str(e)))
         
         messagebox.showinfo("Tracking Started", "Application usage tracking has started!")
     
@@ -374,23 +581,37 @@ class AppUsageTrackerGUI:
         
         messagebox.showinfo("Tracking Stopped", "Application usage tracking has stopped!")
     
-    def tracking_worker(self):
-        """Worker thread for tracking."""
-        try:
-            self.tracker.start_tracking()
-        except Exception as e:
-            self.update_queue.put(("error", str(e)))
-    
     def update_gui(self):
         """Update GUI elements periodically."""
-        # Process queue messages
+        with self.gui_profiler.iteration():
+            self._refresh_gui()
+        
+        # Schedule next update
+        self.root.after(self.REFRESH_INTERVAL_MS, self.update_gui)
+    
+    def _on_tracker_event(self, event_type, payload):
+        """Tracker listener; runs on the tracking thread, so only enqueue."""
+        widgets = EVENT_WIDGETS.get(event_type)
+        if widgets:
+            self.update_queue.put(("dirty", widgets))
+    
+    def _process_queue(self):
+        """Handle messages posted by the tracking thread and worker pool."""
         try:
             while True:
                 message_type, data = self.update_queue.get_nowait()
                 if message_type == "error":
                     messagebox.showerror("Tracking Error", data)
+                elif message_type == "dirty":
+                    self._dirty |= data
+                elif message_type == "result":
+                    self._handle_result(*data)
         except queue.Empty:
             pass
+    
+    def _refresh_gui(self):
+        """Process queued messages, update the status and refresh changed widgets."""
+        self._process_queue()
         
         # Update status if tracking
         if self.is_tracking and self.tracker.current_session:
@@ -401,125 +622,261 @@ class AppUsageTrackerGUI:
             self.current_app_label.config(text=f"Current App: {session.app_name}")
             self.session_time_label.config(text=f"Session Time: {self.format_duration(session_duration)}")
         
-        # Update charts and data
-        self.update_dashboard_charts()
-        self.update_applications_tree()
-        self.update_activity_list()
+        # Refresh only what changed, coalescing bursts of events
+        if self._dirty and time.monotonic() - self._last_heavy_refresh >= self.HEAVY_REFRESH_MIN_GAP:
+            self._refresh_dirty_widgets()
+    
+    def _refresh_dirty_widgets(self):
+        """Redraw widgets marked dirty and clear their flags."""
+        # Widgets on tabs that have not been built yet stay dirty
+        dirty = {widget for widget in self._dirty if WIDGET_TABS[widget] in self._built_tabs}
+        self._dirty -= dirty
+        self._last_heavy_refresh = time.monotonic()
+        
+        if "dashboard" in dirty:
+            self.update_dashboard_charts()
+        if "apps" in dirty:
+            self.update_applications_tree()
+        if "activity" in dirty:
+            self.update_activity_list()
+        if "history" in dirty:
+            self.update_history_view()
+    
+    def run_in_background(self, kind, compute, render, *args, on_error=None):
+        """Run compute(*args) on the worker pool and render the result on the Tk thread.
         
-        # Schedule next update
-        self.root.after(5000, self.update_gui)  # Update every 5 seconds
+        Only the latest request of each kind is rendered; an older request
+        is cancelled if it has not started yet and dropped otherwise.
+        """
+        token = self._request_tokens.get(kind, 0) + 1
+        self._request_tokens[kind] = token
+        
+        previous = self._pending.pop(kind, None)
+        if previous is not None:
+            previous.cancel()
+        
+        future = self.executor.submit(compute, *args)
+        self._pending[kind] = future
+        future.add_done_callback(
+            lambda f: self.update_queue.put(("result", (kind, token, render, on_error, f)))
+        )
+        self._schedule_result_poll()
+    
+    def _handle_result(self, kind, token, render, on_error, future):
+        """Render a finished background computation unless it is stale."""
+        if token != self._request_tokens.get(kind) or future.cancelled():
+            return
+        self._pending.pop(kind, None)
+        
+        error = future.exception()
+        if error is not None:
+            if on_error:
+                on_error(error)
+            else:
+                print(f"Error computing {kind}: {error}")
+            return
+        
+        render(future.result())
+    
+    def _schedule_result_poll(self):
+        """Poll the queue quickly while background work is pending."""
+        if not self._result_poll_scheduled:
+            self._result_poll_scheduled = True
+            self.root.after(self.RESULT_POLL_MS, self._poll_results)
+    
+    def _poll_results(self):
+        self._result_poll_scheduled = False
+        self._process_queue()
+        if self._pending:
+            self._schedule_result_poll()
+    
+    def _snapshot_analyzer(self):
+        """Analyzer over an immutable data snapshot, safe to use from a worker."""
+        return EnhancedUsageAnalyzer(self.tracker.store.snapshot())
     
     def update_dashboard_charts(self):
         """Update dashboard charts."""
+        self.run_in_background("dashboard", self.compute_dashboard_data,
+                               self.render_dashboard_charts, self._snapshot_analyzer())
+    
+    @staticmethod
+    def compute_dashboard_data(analyzer):
+        """Compute today's usage and the category breakdown (worker thread)."""
+        return analyzer.get_daily_usage(), analyzer.get_category_analysis()
+    
+    def render_dashboard_charts(self, result):
+        """Draw the dashboard pies from computed data."""
+        today_usage, category_data = result
         try:
-            analyzer = self.tracker.get_analyzer()
-            
             # Today's usage chart
-            today_usage = analyzer.get_daily_usage()
             if today_usage:
-                self.today_ax.clear()
                 apps = list(today_usage.keys())[:5]  # Top 5 apps
                 times = [today_usage[app] for app in apps]
-                
-                self.today_ax.pie(times, labels=apps, autopct='%1.1f%%', startangle=90)
-                self.today_ax.set_title("Today's Top 5 Applications")
+                self.today_chart.pie(apps, times, "Today's Top 5 Applications")
             else:
-                self.today_ax.clear()
-                self.today_ax.text(0.5, 0.5, "No data available", ha='center', va='center')
-                self.today_ax.set_title("Today's Usage")
+                self.today_chart.show_message("No data available", "Today's Usage")
             
             # Category breakdown chart
-            category_data = analyzer.get_category_analysis()
             if category_data:
-                self.category_ax.clear()
                 categories = list(category_data.keys())
                 times = [category_data[cat]["total_time"] for cat in categories]
-                
-                self.category_ax.pie(times, labels=categories, autopct='%1.1f%%', startangle=90)
-                self.category_ax.set_title("Usage by Category")
+                self.category_chart.pie(categories, times, "Usage by Category")
             else:
-                self.category_ax.clear()
-                self.category_ax.text(0.5, 0.5, "No data available", ha='center', va='center')
-                self.category_ax.set_title("Category Breakdown")
-            
-            # Refresh canvases
-            self.today_canvas.draw()
-            self.category_canvas.draw()
+                self.category_chart.show_message("No data available", "Category Breakdown")
             
         except Exception as e:
             print(f"Error updating charts: {e}")
     
     def update_applications_tree(self):
         """Update applications tree view."""
+        app_stats = {app: dict(stats) for app, stats in list(self.tracker.app_stats.items())}
+        self.run_in_background("apps", self.compute_applications_rows,
+                               self.render_applications_tree, app_stats)
+    
+    @staticmethod
+    def compute_applications_rows(app_stats, limit=20):
+        """Pick the top apps from the tracker's per-app stats (worker thread)."""
+        categories = sorted({stats["category"] for stats in app_stats.values()})
+        top_apps = sorted(app_stats.items(), key=lambda x: x[1]["total_time"], reverse=True)[:limit]
+        
+        rows = []
+        for app_name, stats in top_apps:
+            session_count = stats["session_count"]
+            rows.append({
+                "app_name": app_name,
+                "category": stats["category"],
+                "total_time": stats["total_time"],
+                "session_count": session_count,
+                "avg_session": stats["total_time"] / session_count if session_count > 0 else 0,
+                "last_used": stats["last_used"]
+            })
+        
+        return categories, rows
+    
+    def render_applications_tree(self, result):
+        """Apply computed rows to the applications tree."""
+        categories, rows = result
         try:
-            # Clear existing items
-            for item in self.apps_tree.get_children():
-                self.apps_tree.delete(item)
-            
-            # Get data
-            analyzer = self.tracker.get_analyzer()
-            top_apps = analyzer.get_top_apps(20)
-            
             # Update category combobox
-            categories = set()
-            for app_name, sessions in self.tracker.data.items():
-                if sessions:
-                    categories.add(sessions[0].category)
-            
-            self.category_combo['values'] = ["All"] + sorted(categories)
+            self.category_combo['values'] = ["All"] + categories
             if not self.category_var.get():
                 self.category_var.set("All")
             
-            # Populate tree
-            for app_name, total_time in top_apps:
-                sessions = self.tracker.data.get(app_name, [])
-                if sessions:
-                    category = sessions[0].category
-                    session_count = len(sessions)
-                    avg_session = total_time / session_count if session_count > 0 else 0
-                    last_used = max(s.end_time for s in sessions if s.end_time)
-                    
-                    # Apply filters
-                    if self.should_show_app(app_name, category):
-                        self.apps_tree.insert("", "end", values=(
-                            app_name,
-                            category.title(),
-                            self.format_duration(total_time),
-                            session_count,
-                            self.format_duration(int(avg_session)),
-                            last_used.strftime("%Y-%m-%d %H:%M") if last_used else "Never"
-                        ))
+            # Apply filters and diff against what is shown
+            tree_rows = []
+            for row in rows:
+                if self.should_show_app(row["app_name"], row["category"]):
+                    last_used = row["last_used"]
+                    tree_rows.append((row["app_name"], (
+                        row["app_name"],
+                        row["category"].title(),
+                        self.format_duration(row["total_time"]),
+                        row["session_count"],
+                        self.format_duration(int(row["avg_session"])),
+                        last_used.strftime("%Y-%m-%d %H:%M") if last_used else "Never"
+                    )))
+            
+            self.apps_model.apply(tree_rows)
         
         except Exception as e:
             print(f"Error updating applications tree: {e}")
     
     def update_activity_list(self):
         """Update recent activity list."""
+        # The history index is time-ordered, so this reads just 20 sessions
+        self.render_activity_list(self.tracker.history_index.page(0, 20))
+    
+    def render_activity_list(self, sessions):
+        """Apply the recent sessions to the activity list."""
         try:
-            # Clear existing items
-            for item in self.activity_tree.get_children():
-                self.activity_tree.delete(item)
+            self.activity_model.apply([
+                (session.session_id, (
+                    session.start_time.strftime("%H:%M:%S"),
+                    session.app_name,
+                    session.category.title(),
+                    self.format_duration(session.duration_seconds)
+                ))
+                for session in sessions
+            ])
+        
+        except Exception as e:
+            print(f"Error updating activity list: {e}")
+    
+    def _history_filters(self):
+        """Current (app, category) filters of the history tab, None for All."""
+        app = self.history_app_var.get()
+        category = self.history_category_var.get()
+        return (
+            None if app in ("", "All") else app,
+            None if category in ("", "All") else category.lower()
+        )
+    
+    def update_history_view(self):
+        """Show the current page of the history tab."""
+        try:
+            index = self.tracker.history_index
+            self.history_app_combo['values'] = ["All"] + index.apps()
+            self.history_category_combo['values'] = ["All"] + [c.title() for c in index.categories()]
+            
+            app, category = self._history_filters()
+            count = index.count(app, category)
             
-            # Get recent sessions (last 20)
-            all_sessions = []
-            for sessions in self.tracker.data.values():
-                all_sessions.extend(sessions)
+            # Keep the same sessions in view while new ones arrive at the top
+            if self.history_offset > 0 and count > self.history_count:
+                self.history_offset += count - self.history_count
+            self.history_count = count
+            self.history_offset = min(self.history_offset, max(count - 1, 0))
             
-            # Sort by start time (most recent first)
-            all_sessions.sort(key=lambda x: x.start_time, reverse=True)
+            sessions = index.page(self.history_offset, self.HISTORY_PAGE_SIZE, app, category)
+            self.history_model.apply([
+                (session.session_id, (
+                    session.start_time.strftime("%Y-%m-%d"),
+                    session.start_time.strftime("%H:%M:%S"),
+                    session.end_time.strftime("%H:%M:%S"),
+                    session.app_name,
+                    session.category.title(),
+                    self.format_duration(session.duration_seconds),
+                    session.window_title
+                ))
+                for session in sessions
+            ])
             
-            # Add to tree
-            for session in all_sessions[:20]:
-                if session.end_time:
-                    self.activity_tree.insert("", "end", values=(
-                        session.start_time.strftime("%H:%M:%S"),
-                        session.app_name,
-                        session.category.title(),
-                        self.format_duration(session.duration_seconds)
-                    ))
+            if sessions:
+                first = self.history_offset + 1
+                self.history_page_label.config(text=f"Sessions {first}-{first + len(sessions) - 1} of {count}")
+            else:
+                self.history_page_label.config(text="No sessions")
         
         except Exception as e:
-            print(f"Error updating activity list: {e}")
+            print(f"Error updating history view: {e}")
+    
+    def filter_history(self, event=None):
+        """Apply the history filters from the newest session."""
+        self.history_offset = 0
+        self.history_count = 0
+        self.update_history_view()
+    
+    def page_history(self, direction):
+        """Move one page older (1) or newer (-1) in the history tab."""
+        offset = self.history_offset + direction * self.HISTORY_PAGE_SIZE
+        if direction > 0 and offset >= self.history_count:
+            return
+        self.history_offset = max(offset, 0)
+        self.update_history_view()
+    
+    def go_to_history_date(self, event=None):
+        """Jump the history tab to the newest session on or before a date."""
+        try:
+            date = datetime.strptime(self.history_date_var.get().strip(), "%Y-%m-%d")
+        except ValueError:
+            messagebox.showerror("Error", "Enter a date as YYYY-MM-DD")
+            return
+        
+        app, category = self._history_filters()
+        index = self.tracker.history_index
+        self.history_offset = index.offset_for(date, app, category)
+        self.history_count = index.count(app, category)
+        self.update_history_view()
     
     def should_show_app(self, app_name, category):
         """Check if app should be shown based on filters."""
@@ -542,27 +899,36 @@ class AppUsageTrackerGUI:
     def update_analytics_chart(self, event=None):
         """Update analytics chart based on selection."""
         chart_type = self.chart_type_var.get()
+        analyzer = self._snapshot_analyzer()
         
-        # Clear existing chart
-        for widget in self.analytics_chart_frame.winfo_children():
-            widget.destroy()
+        # Show a loading state until the worker finishes
+        self.show_analytics_loading()
         
-        # Create new chart based on type
+        # Compute in the background; switching type again cancels this request
         if chart_type == "Daily Usage":
-            self.create_daily_usage_chart()
+            self.run_in_background("analytics", self.compute_daily_usage, self.create_daily_usage_chart, analyzer)
         elif chart_type == "Hourly Pattern":
-            self.create_hourly_pattern_chart()
+            self.run_in_background("analytics", self.compute_hourly_pattern, self.create_hourly_pattern_chart, analyzer)
         elif chart_type == "Category Analysis":
-            self.create_category_analysis_chart()
+            self.run_in_background("analytics", self.compute_category_analysis, self.create_category_analysis_chart, analyzer)
         elif chart_type == "Productivity Trend":
-            self.create_productivity_trend_chart()
+            self.run_in_background("analytics", self.compute_productivity_trend, self.create_productivity_trend_chart, analyzer)
     
-    def create_daily_usage_chart(self):
-        """Create daily usage chart."""
-        fig, ax = plt.subplots(figsize=(10, 6))
-        
-        # Get last 7 days of data
-        analyzer = self.tracker.get_analyzer()
+    def show_analytics_loading(self):
+        """Overlay a lightweight loading label on the analytics area."""
+        self.analytics_loading_label.place(relx=0.5, rely=0.5, anchor=tk.CENTER)
+        self.analytics_loading_label.lift()
+    
+    def get_analytics_chart(self):
+        """Get the reusable analytics chart, hiding the loading label."""
+        if self.analytics_chart is None:
+            self.analytics_chart = load_chart_panel()(self.analytics_chart_frame, figsize=(10, 6))
+        self.analytics_loading_label.place_forget()
+        return self.analytics_chart
+    
+    @staticmethod
+    def compute_daily_usage(analyzer):
+        """Total hours per day for the last 7 days (worker thread)."""
         daily_data = {}
         
         for i in range(7):
@@ -573,80 +939,59 @@ class AppUsageTrackerGUI:
         
         dates = list(daily_data.keys())
         times = [daily_data[date] / 3600 for date in dates]  # Convert to hours
-        
-        ax.bar(dates, times, color='skyblue')
-        ax.set_title("Daily Usage (Last 7 Days)")
-        ax.set_ylabel("Hours")
-        ax.tick_params(axis='x', rotation=45)
-        
-        plt.tight_layout()
-        
-        canvas = FigureCanvasTkAgg(fig, self.analytics_chart_frame)
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        canvas.draw()
+        return dates, times
     
-    def create_hourly_pattern_chart(self):
-        """Create hourly pattern chart."""
-        fig, ax = plt.subplots(figsize=(10, 6))
-        
-        # Get hourly data
+    def create_daily_usage_chart(self, result):
+        """Create daily usage chart."""
+        dates, times = result
+        self.get_analytics_chart().bar(
+            dates, times, "Daily Usage (Last 7 Days)", "Hours", 'skyblue', rotation=45
+        )
+    
+    @staticmethod
+    def compute_hourly_pattern(analyzer):
+        """Total hours per hour of day (worker thread)."""
         hourly_data = {str(hour): 0 for hour in range(24)}
         
-        for sessions in self.tracker.data.values():
+        for sessions in analyzer.data.values():
             for session in sessions:
                 hour = str(session.start_time.hour)
-                hourly_data[hour] += session.duration_seconds
+                hourly_data[hour] += session.active_seconds
         
         hours = list(range(24))
         times = [hourly_data[str(hour)] / 3600 for hour in hours]  # Convert to hours
-        
-        ax.bar(hours, times, color='lightcoral')
-        ax.set_title("Hourly Usage Pattern")
-        ax.set_xlabel("Hour of Day")
-        ax.set_ylabel("Hours")
-        ax.set_xticks(hours)
-        
-        plt.tight_layout()
-        
-        canvas = FigureCanvasTkAgg(fig, self.analytics_chart_frame)
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        canvas.draw()
+        return hours, times
     
-    def create_category_analysis_chart(self):
-        """Create category analysis chart."""
-        fig, ax = plt.subplots(figsize=(10, 6))
-        
-        analyzer = self.tracker.get_analyzer()
+    def create_hourly_pattern_chart(self, result):
+        """Create hourly pattern chart."""
+        hours, times = result
+        self.get_analytics_chart().bar(
+            hours, times, "Hourly Usage Pattern", "Hours", 'lightcoral', xlabel="Hour of Day", xticks=hours
+        )
+    
+    @staticmethod
+    def compute_category_analysis(analyzer):
+        """Total hours per category (worker thread)."""
         category_data = analyzer.get_category_analysis()
+        categories = list(category_data.keys())
+        times = [category_data[cat]["total_time"] / 3600 for cat in categories]  # Convert to hours
+        return categories, times
+    
+    def create_category_analysis_chart(self, result):
+        """Create category analysis chart."""
+        categories, times = result
+        chart = self.get_analytics_chart()
         
-        if category_data:
-            categories = list(category_data.keys())
-            times = [category_data[cat]["total_time"] / 3600 for cat in categories]  # Convert to hours
-            
-            ax.bar(categories, times, color='lightgreen')
-            ax.set_title("Usage by Category")
-            ax.set_ylabel("Hours")
-            ax.tick_params(axis='x', rotation=45)
+        if categories:
+            chart.bar(categories, times, "Usage by Category", "Hours", 'lightgreen', rotation=45)
         else:
-            ax.text(0.5, 0.5, "No data available", ha='center', va='center')
-            ax.set_title("Category Analysis")
-        
-        plt.tight_layout()
-        
-        canvas = FigureCanvasTkAgg(fig, self.analytics_chart_frame)
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        canvas.draw()
+            chart.show_message("No data available", "Category Analysis")
     
-    def create_productivity_trend_chart(self):
-        """Create productivity trend chart."""
-        fig, ax = plt.subplots(figsize=(10, 6))
-        
-        # Calculate productivity for last 7 days
-        productive_categories = ['development', 'office', 'utilities']
+    @staticmethod
+    def compute_productivity_trend(analyzer):
+        """Productivity percentage for the last 7 days (worker thread)."""
         productivity_data = {}
         
-        analyzer = self.tracker.get_analyzer()
-        
         for i in range(7):
             date = datetime.now() - timedelta(days=i)
             usage = analyzer.get_daily_usage(date)
@@ -655,39 +1000,40 @@ class AppUsageTrackerGUI:
             productive_time = 0
             
             for app_name, time_spent in usage.items():
-                sessions = self.tracker.data.get(app_name, [])
-                if sessions and sessions[0].category in productive_categories:
+                sessions = analyzer.data.get(app_name, [])
+                if sessions and sessions[0].category in PRODUCTIVE_CATEGORIES:
                     productive_time += time_spent
             
             productivity_pct = (productive_time / total_time * 100) if total_time > 0 else 0
             productivity_data[date.strftime("%Y-%m-%d")] = productivity_pct
         
-        dates = list(productivity_data.keys())
-        productivity = list(productivity_data.values())
-        
-        ax.plot(dates, productivity, marker='o', color='purple', linewidth=2)
-        ax.set_title("Productivity Trend (Last 7 Days)")
-        ax.set_ylabel("Productivity %")
-        ax.tick_params(axis='x', rotation=45)
-        ax.set_ylim(0, 100)
-        
-        plt.tight_layout()
-        
-        canvas = FigureCanvasTkAgg(fig, self.analytics_chart_frame)
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        canvas.draw()
+        return list(productivity_data.keys()), list(productivity_data.values())
+    
+    def create_productivity_trend_chart(self, result):
+        """Create productivity trend chart."""
+        dates, productivity = result
+        self.get_analytics_chart().line(
+            dates, productivity, "Productivity Trend (Last 7 Days)", "Productivity %", 'purple',
+            ylim=(0, 100), rotation=45
+        )
     
     def generate_report(self):
         """Generate and display report."""
-        try:
-            analyzer = self.tracker.get_analyzer()
-            report = analyzer.generate_enhanced_report()
-            
-            self.report_text.delete(1.0, tk.END)
-            self.report_text.insert(1.0, report)
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to generate report: {e}")
+        self.report_text.delete(1.0, tk.END)
+        self.report_text.insert(1.0, "Generating report...")
+        
+        self.run_in_background(
+            "report",
+            lambda analyzer: analyzer.generate_enhanced_report(),
+            self.show_report,
+            self._snapshot_analyzer(),
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to generate report: {e}")
+        )
+    
+    def show_report(self, report):
+        """Display a generated report."""
+        self.report_text.delete(1.0, tk.END)
+        self.report_text.insert(1.0, report)
     
     def save_report(self):
         """Save report to file."""
@@ -719,48 +1065,128 @@ class AppUsageTrackerGUI:
         try:
             filename = filedialog.asksaveasfilename(
                 defaultextension=".json",
-                filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+                filetypes=[("JSON files", "*.json"), ("CSV files", "*.csv"),
+                           ("NDJSON files", "*.ndjson"), ("All files", "*.*")]
             )
             
             if filename:
-                data = self.tracker.export_data()
-                with open(filename, 'w') as f:
-                    f.write(data)
-                
-                messagebox.showinfo("Success", f"Data exported to {filename}")
+                # Format follows the extension; the export streams on the worker pool
+                format_type = Path(filename).suffix.lstrip(".").lower()
+                if format_type not in ("json", "csv", "ndjson"):
+                    format_type = "json"
+                self.run_in_background(
+                    "export",
+                    self.tracker.export_data,
+                    lambda count: messagebox.showinfo("Success", f"Exported {count} sessions to {filename}"),
+                    format_type,
+                    filename,
+                    on_error=lambda e: messagebox.showerror("Error", f"Failed to export data: {e}")
+                )
         
         except Exception as e:
             messagebox.showerror("Error", f"Failed to export data: {e}")
     
+    def export_columnar(self):
+        """Export columnar session and rollup tables to a folder."""
+        directory = filedialog.askdirectory(title="Export for Analysis")
+        if directory:
+            self.run_in_background(
+                "export_columnar",
+                self.tracker.export_columnar,
+                lambda paths: messagebox.showinfo(
+                    "Success", "Exported:\n" + "\n".join(str(path) for path in paths.values())
+                ),
+                directory,
+                on_error=lambda e: messagebox.showerror("Error", f"Failed to export data: {e}")
+            )
+    
     def open_settings(self):
         """Open settings dialog."""
         SettingsDialog(self.root, self.tracker.config)
     
+    def _history_ready(self) -> bool:
+        """Whether the history is installed; tells the user to wait if not.
+        
+        Replacing or merging the data before then would be undone or mixed
+        up by the pending attach_history().
+        """
+        if not self.history_loaded:
+            messagebox.showinfo("Please Wait", "History is still loading.")
+        return self.history_loaded
+    
     def new_session(self):
         """Start a new tracking session."""
+        if not self._history_ready():
+            return
         result = messagebox.askyesno("New Session", "This will clear all current data. Continue?")
         if result:
-            self.tracker.data = {}
-            self.refresh_data()
+            self.run_in_background(
+                "replace_data",
+                self.tracker.replace_data,
+                lambda _result: self.refresh_data(),
+                {},
+                on_error=lambda e: messagebox.showerror("Error", f"Failed to clear data: {e}")
+            )
     
     def load_data(self):
         """Load data from file."""
-        try:
-            filename = filedialog.askopenfilename(
-                filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+        if not self._history_ready():
+            return
+        filename = filedialog.askopenfilename(
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+        )
+        if not filename:
+            return
+        
+        def on_loaded(_result):
+            self.refresh_data()
+            messagebox.showinfo("Success", "Data loaded successfully!")
+        
+        self.run_in_background(
+            "replace_data",
+            self._load_log_file,
+            on_loaded,
+            filename,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to load data: {e}")
+        )
+    
+    def _load_log_file(self, filename):
+        """Make a log file the tracker's log and data; runs on the worker pool."""
+        self.tracker.data_manager.log_file = Path(filename)
+        self.tracker.replace_data(self.tracker.data_manager.load_data())
+    
+    def merge_logs(self):
+        """Merge log files and backups into the current data."""
+        if not self._history_ready():
+            return
+        filenames = filedialog.askopenfilenames(
+            title="Merge Logs",
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+        )
+        if not filenames:
+            return
+        
+        def on_merged(stats):
+            self.refresh_data()
+            messagebox.showinfo(
+                "Success",
+                f"Merged {stats['sources'] - 1} files: {stats['sessions']} sessions, "
+                f"{stats['duplicates']} duplicates removed, "
+                f"{stats['trimmed'] + stats['dropped']} overlaps resolved."
             )
-            
-            if filename:
-                self.tracker.data_manager.log_file = Path(filename)
-                self.tracker.data = self.tracker.data_manager.load_data()
-                self.refresh_data()
-                messagebox.showinfo("Success", "Data loaded successfully!")
         
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load data: {e}")
+        self.run_in_background(
+            "merge",
+            self.tracker.merge_logs,
+            on_merged,
+            list(filenames),
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to merge logs: {e}")
+        )
     
     def save_data(self):
         """Save current data."""
+        if not self._history_ready():
+            return
         try:
             self.tracker.data_manager.save_data(self.tracker.data)
             messagebox.showinfo("Success", "Data saved successfully!")
@@ -769,10 +1195,10 @@ class AppUsageTrackerGUI:
     
     def refresh_data(self):
         """Refresh all data displays."""
-        self.update_dashboard_charts()
-        self.update_applications_tree()
-        self.update_activity_list()
-        self.update_analytics_chart()
+        self._dirty = {"dashboard", "apps", "activity", "history"}
+        self._refresh_dirty_widgets()
+        if "Analytics" in self._built_tabs:
+            self.update_analytics_chart()
     
     def toggle_fullscreen(self):
         """Toggle fullscreen mode."""
@@ -865,18 +1291,20 @@ class SettingsDialog:
     def save_settings(self):
         """Save settings."""
         try:
-            self.config.check_interval = int(self.check_interval_var.get())
-            self.config.min_session_duration = int(self.min_duration_var.get())
-            self.config.enable_productivity_tracking = self.productivity_var.get()
-            self.config.enable_detailed_tracking = self.detailed_var.get()
-            self.config.excluded_apps = [app.strip() for app in self.excluded_text.get(1.0, tk.END).split('\n') if app.strip()]
+            # Validated and swapped in as a whole; the tracker applies it before its next sample
+            self.config.update({
+                "check_interval": int(self.check_interval_var.get()),
+                "min_session_duration": int(self.min_duration_var.get()),
+                "enable_productivity_tracking": self.productivity_var.get(),
+                "enable_detailed_tracking": self.detailed_var.get(),
+                "excluded_apps": [app.strip() for app in self.excluded_text.get(1.0, tk.END).split('\n') if app.strip()]
+            })
             
-            self.config.save_config()
-            messagebox.showinfo("Success", "Settings saved successfully!")
+            messagebox.showinfo("Success", "Settings saved and applied.")
             self.dialog.destroy()
             
-        except ValueError:
-            messagebox.showerror("Error", "Please enter valid numeric values.")
+        except ValueError as e:
+            messagebox.showerror("Error", f"Please enter valid values: {e}")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save settings: {e}")
 
@@ -895,6 +1323,10 @@ def main():
     # Create and run the application
     app = AppUsageTrackerGUI(root)
     root.mainloop()
+    
+    # Drop queued analytics work, then record the open session and send pending uploads
+    app.executor.shutdown(wait=False, cancel_futures=True)
+    app.tracker.close()
 
 if __name__ == "__main__":
     main()
@@ -1,4 +1,4 @@
-import { useState, useEffect, useCallback } from "react";
+import { useState, useEffect, useCallback, useRef } from "react";
 
 interface AppSession {
   session_id: string;
@@ -64,6 +64,63 @@ interface RealtimeData {
   lastUpdate: Date | null;
 }
 
+interface AppTotals {
+  [appName: string]: {
+    category: string;
+    total_time: number;
+    session_count: number;
+    last_used: string | null;
+  };
+}
+
+interface TrackerChanges {
+  cursor: string;
+  reset: boolean;
+  more: boolean;
+  sessions: AppSession[];
+  aggregates: AppTotals;
+  current_session: AppSession | null;
+}
+
+// YYYY-MM-DD of the local day; session start times are local too
+function localDate(date: Date): string {
+  const pad = (value: number) => String(value).padStart(2, "0");
+  return `${date.getFullYear()}-${pad(date.getMonth() + 1)}-${pad(date.getDate())}`;
+}
+
+// Fold a delta from /api/tracker/query/changes into the dashboard state
+function applyChanges(
+  prev: RealtimeData,
+  changes: TrackerChanges,
+  totals: AppTotals,
+): RealtimeData {
+  // Sessions kept from earlier syncs drop out once their day is over
+  const today = localDate(new Date());
+  const todays = [
+    ...(changes.reset ? [] : prev.todaysSessions),
+    ...changes.sessions,
+  ].filter((session) => session.start.startsWith(today));
+
+  const topApps = Object.entries(totals)
+    .sort(([, a], [, b]) => b.total_time - a.total_time)
+    .slice(0, 5)
+    .map(([name, stats]) => ({
+      name,
+      duration: stats.total_time,
+      category: stats.category,
+      sessions: stats.session_count,
+    }));
+
+  return {
+    ...prev,
+    currentSession: changes.current_session,
+    todaysSessions: todays,
+    topApps,
+    isTracking: prev.isTracking || changes.current_session !== null,
+    lastUpdate: new Date(),
+  };
+}
+
 export function useRealtimeData() {
   const [data, setData] = useState<RealtimeData>({
     currentSession: null,
@@ -208,20 +265,82 @@ export function useRealtimeData() {
     };
   }, []);
 
-  // Simulate WebSocket connection and real-time updates
+  // Cursor and app totals for incremental sync with the tracker
+  const cursorRef = useRef<string | null>(null);
+  const totalsRef = useRef<AppTotals>({});
+
+  // Fetch only what changed since the last sync; false if the tracker is unreachable
+  const syncChanges = useCallback(async (): Promise<boolean> => {
+    try {
+      for (let page = 0; page < 10; page++) {
+        const query = cursorRef.current
+          ? `?cursor=${encodeURIComponent(cursorRef.current)}`
+          : "";
+        const response = await fetch(`/api/tracker/query/changes${query}`);
+        if (!response.ok) return false;
+
+        const changes: TrackerChanges = await response.json();
+        const aggregates = Object.fromEntries(
+          Object.entries(changes.aggregates).filter(([, stats]) => stats),
+        );
+        cursorRef.current = changes.cursor;
+        totalsRef.current = changes.reset
+          ? aggregates
+          : { ...totalsRef.current, ...aggregates };
+        setData((prev) => applyChanges(prev, changes, totalsRef.current));
+        if (!changes.more) break;
+      }
+      return true;
+    } catch (error) {
+      return false;
+    }
+  }, []);
+
+  // Precomputed productivity and category payloads written by the tracker
+  const loadDashboardPayloads = useCallback(async () => {
+    try {
+      const [productivity, categories] = await Promise.all(
+        ["productivity", "categories"].map((name) =>
+          fetch(`/api/tracker/dashboard/${name}`).then((response) =>
+            response.ok ? response.json() : null,
+          ),
+        ),
+      );
+      setData((prev) => ({
+        ...prev,
+        productivityMetrics: productivity ?? prev.productivityMetrics,
+        categoryBreakdown: categories ?? prev.categoryBreakdown,
+      }));
+    } catch (error) {
+      // Keep the values we have
+    }
+  }, []);
+
+  // Sync with the tracker, falling back to simulated data when it is unavailable
+  const refresh = useCallback(async () => {
+    if (await syncChanges()) {
+      await loadDashboardPayloads();
+    } else {
+      // Start over with a full reset so no mock sessions are kept once the tracker is back
+      cursorRef.current = null;
+      totalsRef.current = {};
+      setData(generateMockData());
+    }
+  }, [syncChanges, loadDashboardPayloads, generateMockData]);
+
   useEffect(() => {
     setConnectionStatus("connecting");
 
     // Simulate connection delay
     const connectTimer = setTimeout(() => {
       setConnectionStatus("connected");
-      setData(generateMockData());
+      refresh();
     }, 1000);
 
     // Update data every 5 seconds
     const updateInterval = setInterval(() => {
       if (connectionStatus === "connected") {
-        setData(generateMockData());
+        refresh();
       }
     }, 5000);
 
@@ -229,7 +348,7 @@ export function useRealtimeData() {
       clearTimeout(connectTimer);
       clearInterval(updateInterval);
     };
-  }, [generateMockData, connectionStatus]);
+  }, [refresh, connectionStatus]);
 
   // API methods that connect to Python backend
   const startTracking = useCallback(async () => {
@@ -10,6 +10,8 @@ import {
   exportTrackerData,
   createTrackerBackup,
   getTrackerStream,
+  queryTracker,
+  getDashboardPayload,
 } from "./routes/tracker";
 
 export function createServer() {
@@ -36,6 +38,8 @@ export function createServer() {
   app.get("/api/tracker/export", exportTrackerData);
   app.post("/api/tracker/backup", createTrackerBackup);
   app.get("/api/tracker/stream", getTrackerStream);
+  app.get("/api/tracker/query/:endpoint", queryTracker);
+  app.get("/api/tracker/dashboard/:name", getDashboardPayload);
 
   return app;
 }
@@ -3,6 +3,7 @@ import { spawn, ChildProcess } from "child_process";
 import { EventEmitter } from "events";
 import path from "path";
 import fs from "fs";
+import net from "net";
 
 interface TrackerStatus {
   isRunning: boolean;
@@ -15,6 +16,7 @@ interface TrackerData {
   applications: any;
   metadata: any;
   stats: any;
+  recent_sessions?: any[];
 }
 
 class PythonTrackerManager extends EventEmitter {
@@ -27,10 +29,86 @@ class PythonTrackerManager extends EventEmitter {
   };
   private dataFile = path.join(process.cwd(), "app_usage_log.json");
   private statsFile = path.join(process.cwd(), "app_usage_log.stats.json");
+  // Precompressed payloads written by the tracker's DashboardPublisher
+  readonly dashboardDir = path.join(process.cwd(), "dashboard");
+  // Query API served by the Python tracker process (query_api_port in config.json);
+  // an empty TRACKER_QUERY_API_URL reads the saved log only
+  private queryApiUrl =
+    process.env.TRACKER_QUERY_API_URL ?? "http://127.0.0.1:8731";
+  private queryCache = new Map<string, { etag: string; body: any }>();
+  // Push event stream from the Python tracker (event_stream_port or event_stream_path)
+  private eventStreamAddress = process.env.TRACKER_EVENT_STREAM || "";
+  private eventSocket: net.Socket | null = null;
 
   constructor() {
     super();
     this.setupFileWatchers();
+    if (this.eventStreamAddress) {
+      this.connectEventStream();
+    }
+  }
+
+  isStreaming(): boolean {
+    return this.eventSocket !== null;
+  }
+
+  private connectEventStream() {
+    // "host:port" for TCP, anything else is a Unix socket path
+    const match = this.eventStreamAddress.match(/^(.*):(\d+)$/);
+    const socket = match
+      ? net.createConnection({ host: match[1], port: Number(match[2]) })
+      : net.createConnection({ path: this.eventStreamAddress });
+
+    let buffer = "";
+    socket.setEncoding("utf8");
+    socket.on("connect", () => {
+      this.eventSocket = socket;
+    });
+    socket.on("data", (chunk: string) => {
+      buffer += chunk;
+      let newline = buffer.indexOf("\n");
+      while (newline >= 0) {
+        const line = buffer.slice(0, newline);
+        buffer = buffer.slice(newline + 1);
+        try {
+          if (line) this.handleTrackerEvent(JSON.parse(line));
+        } catch (error) {
+          console.error("Bad tracker event:", error);
+        }
+        newline = buffer.indexOf("\n");
+      }
+    });
+    socket.on("error", () => {
+      // Reconnect from the close handler
+    });
+    socket.on("close", () => {
+      this.eventSocket = null;
+      setTimeout(() => this.connectEventStream(), 2000);
+    });
+  }
+
+  private handleTrackerEvent(event: { type: string; seq: number; ts: number; data: any }) {
+    const { type, data } = event;
+    if (type === "hello") {
+      this.status.isRunning = data.is_running;
+      this.status.currentSession = data.current_session;
+    } else if (type === "session_started") {
+      this.status.isRunning = true;
+      this.status.currentSession = data;
+    } else if (type === "heartbeat") {
+      this.status.systemMetrics = {
+        // Null until the tracker has a reading for a newly seen process
+        cpu_percent: data.cpu_percent ?? this.status.systemMetrics?.cpu_percent ?? 0,
+        memory_mb: data.memory_mb,
+        active_app: data.app_name,
+        window_title: data.window_title,
+        idle: data.idle,
+        elapsed_seconds: data.elapsed_seconds,
+      };
+    }
+    this.status.lastUpdate = new Date(event.ts * 1000).toISOString();
+    this.emit("trackerEvent", event);
+    this.emit("dataUpdated");
   }
 
   private setupFileWatchers() {
@@ -97,34 +175,120 @@ class PythonTrackerManager extends EventEmitter {
   }
 
   async getTrackerData(): Promise<TrackerData | null> {
+    // Live aggregates from the tracker; the saved log only when its query API is down
+    const live = await this.queryAll({
+      summary: "/summary",
+      apps: "/top-apps?limit=1000",
+      sessions: "/sessions?limit=50",
+    });
+    if (!live) {
+      return this.readJsonFile(this.dataFile, "tracker data");
+    }
+
+    return {
+      metadata: live.summary,
+      applications: Object.fromEntries(
+        live.apps.apps.map((app: any) => [
+          app.app_name,
+          {
+            category: app.category,
+            total_duration: app.total_time,
+            total_sessions: app.sessions,
+          },
+        ]),
+      ),
+      stats: { top_apps: live.apps.apps.slice(0, 10) },
+      recent_sessions: live.sessions.sessions,
+    };
+  }
+
+  async getStats(): Promise<any> {
+    const live = await this.queryAll({
+      summary: "/summary",
+      apps: "/top-apps?limit=1000",
+    });
+    if (!live) {
+      return this.readJsonFile(this.statsFile, "tracker stats");
+    }
+
+    const categoryBreakdown: Record<string, any> = {};
+    for (const app of live.apps.apps) {
+      const category = (categoryBreakdown[app.category] ??= {
+        total_duration: 0,
+        total_sessions: 0,
+        app_count: 0,
+      });
+      category.total_duration += app.total_time;
+      category.total_sessions += app.sessions;
+      category.app_count += 1;
+    }
+    return {
+      summary: live.summary,
+      top_apps: live.apps.apps.slice(0, 10),
+      category_breakdown: categoryBreakdown,
+    };
+  }
+
+  private readJsonFile(file: string, description: string): any {
     try {
-      if (fs.existsSync(this.dataFile)) {
-        const data = JSON.parse(fs.readFileSync(this.dataFile, "utf8"));
-        return data;
+      if (fs.existsSync(file)) {
+        return JSON.parse(fs.readFileSync(file, "utf8"));
       }
       return null;
     } catch (error) {
-      console.error("Failed to read tracker data:", error);
+      console.error(`Failed to read ${description}:`, error);
       return null;
     }
   }
 
-  async getStats(): Promise<any> {
+  // Bodies of several queries, or null unless every one of them succeeded
+  private async queryAll<K extends string>(
+    paths: Record<K, string>,
+  ): Promise<Record<K, any> | null> {
+    const names = Object.keys(paths) as K[];
+    const results = await Promise.all(
+      names.map((name) => this.query(paths[name])),
+    );
+    if (results.some((result) => !result || result.status !== 200)) {
+      return null;
+    }
+    return Object.fromEntries(
+      names.map((name, i) => [name, results[i]!.body]),
+    ) as Record<K, any>;
+  }
+
+  async query(
+    pathAndQuery: string,
+  ): Promise<{ status: number; body: any } | null> {
+    if (!this.queryApiUrl) return null;
+
+    // Revalidate with the ETag (store epoch and data version) instead of re-reading the log
+    const cached = this.queryCache.get(pathAndQuery);
     try {
-      if (fs.existsSync(this.statsFile)) {
-        const stats = JSON.parse(fs.readFileSync(this.statsFile, "utf8"));
-        return stats;
+      const response = await fetch(`${this.queryApiUrl}${pathAndQuery}`, {
+        headers: cached ? { "If-None-Match": cached.etag } : {},
+      });
+      if (response.status === 304 && cached) {
+        return { status: 200, body: cached.body };
       }
-      return null;
+
+      const body = await response.json();
+      const etag = response.headers.get("etag");
+      if (response.ok && etag) {
+        if (this.queryCache.size >= 200) this.queryCache.clear();
+        this.queryCache.set(pathAndQuery, { etag, body });
+      }
+      return { status: response.status, body };
     } catch (error) {
-      console.error("Failed to read tracker stats:", error);
+      console.error("Failed to query tracker:", error);
       return null;
     }
   }
 
   async exportData(format: "json" | "csv" = "json"): Promise<string | null> {
     try {
-      const data = await this.getTrackerData();
+      // The saved log holds every session; live queries only carry totals
+      const data = this.readJsonFile(this.dataFile, "tracker data");
       if (!data) return null;
 
       if (format === "json") {
@@ -235,9 +399,9 @@ class PythonTrackerManager extends EventEmitter {
 // Global tracker manager instance
 const trackerManager = new PythonTrackerManager();
 
-// Start generating mock data every 5 seconds for demo
+// Start generating mock data every 5 seconds for demo, unless live events are streaming
 setInterval(() => {
-  if (trackerManager.getStatus().isRunning) {
+  if (trackerManager.getStatus().isRunning && !trackerManager.isStreaming()) {
     trackerManager.generateMockData();
   }
 }, 5000);
@@ -306,6 +470,76 @@ export const getTrackerStats: RequestHandler = async (req, res) => {
   }
 };
 
+// Live queries answered by the Python tracker's in-memory index
+export const queryTracker: RequestHandler = async (req, res) => {
+  const endpoint = req.params.endpoint;
+  if (
+    !["summary", "range", "top-apps", "sessions", "changes"].includes(endpoint)
+  ) {
+    res.status(404).json({ message: "Unknown query" });
+    return;
+  }
+
+  try {
+    const search = new URLSearchParams(
+      req.query as Record<string, string>,
+    ).toString();
+    const result = await trackerManager.query(
+      `/${endpoint}${search ? `?${search}` : ""}`,
+    );
+    if (result) {
+      res.status(result.status).json(result.body);
+    } else {
+      res.status(503).json({ message: "Tracker query API not available" });
+    }
+  } catch (error) {
+    res.status(500).json({ message: "Failed to query tracker" });
+  }
+};
+
+// Static dashboard payloads, served as written (brotli or gzip when the client accepts it)
+const DASHBOARD_PAYLOADS = [
+  "manifest",
+  "today",
+  "week",
+  "top_apps",
+  "categories",
+  "productivity",
+];
+
+export const getDashboardPayload: RequestHandler = (req, res) => {
+  const name = req.params.name;
+  if (!DASHBOARD_PAYLOADS.includes(name)) {
+    res.status(404).json({ message: "Unknown dashboard payload" });
+    return;
+  }
+
+  const file = path.join(trackerManager.dashboardDir, `${name}.json`);
+  if (!fs.existsSync(file)) {
+    res.status(404).json({ message: "Dashboard payload not available" });
+    return;
+  }
+
+  // Brotli siblings are only written when the tracker has brotli installed
+  const accepted = (req.headers["accept-encoding"] || "")
+    .split(",")
+    .map((token) => token.split(";")[0].trim());
+  const encoding = [
+    { name: "br", file: `${file}.br` },
+    { name: "gzip", file: `${file}.gz` },
+  ].find(
+    (candidate) =>
+      accepted.includes(candidate.name) && fs.existsSync(candidate.file),
+  );
+
+  res.setHeader("Content-Type", "application/json");
+  res.setHeader("Vary", "Accept-Encoding");
+  if (encoding) {
+    res.setHeader("Content-Encoding", encoding.name);
+  }
+  res.sendFile(encoding ? encoding.file : file);
+};
+
 export const exportTrackerData: RequestHandler = async (req, res) => {
   try {
     const format = (req.query.format as string) || "json";
@@ -362,6 +596,13 @@ export const getTrackerStream: RequestHandler = (req, res) => {
     res.write(`data: ${JSON.stringify(status)}\n\n`);
   };
 
+  // Forward the tracker's own events as named SSE events
+  const sendEvent = (event: { type: string; seq: number; data: any }) => {
+    res.write(
+      `event: ${event.type}\nid: ${event.seq}\ndata: ${JSON.stringify(event.data)}\n\n`,
+    );
+  };
+
   // Send initial data
   sendData();
 
@@ -370,12 +611,14 @@ export const getTrackerStream: RequestHandler = (req, res) => {
   trackerManager.on("dataUpdated", handleUpdate);
   trackerManager.on("trackingStarted", handleUpdate);
   trackerManager.on("trackingStopped", handleUpdate);
+  trackerManager.on("trackerEvent", sendEvent);
 
   // Clean up on client disconnect
   req.on("close", () => {
     trackerManager.off("dataUpdated", handleUpdate);
     trackerManager.off("trackingStarted", handleUpdate);
     trackerManager.off("trackingStopped", handleUpdate);
+    trackerManager.off("trackerEvent", sendEvent);
   });
 };
 